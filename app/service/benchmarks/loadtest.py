@@ -0,0 +1,553 @@
+"""
+End-to-end API latency under a mixed workload.
+
+Starts a throwaway Postgres cluster (initdb/pg_ctl found on PATH, in $PG_BIN or
+through pg_config), builds the schema with the Alembic migrations and seeds
+--users users with --entries budget entries each. The FastAPI app is then
+driven in-process over ASGI, lifespan and background jobs included, by
+--concurrency virtual users for --duration seconds. Every request goes through
+the real middleware, dependencies and database; no external service is used
+(mail goes to the file transport).
+
+Reports p50/p95/p99 latency, throughput and error count per route.
+
+    python -m benchmarks.loadtest [--users 50] [--entries 2000] [--concurrency 16] [--duration 30]
+                                  [--mix summary=40,details=35,import=5,signin=5,refresh=10,passwordless=5]
+                                  [--database-url URL] [--output results.json] [--compare baseline.json]
+
+--database-url skips the temporary cluster and migrates/seeds the given
+database instead; point it only at a disposable database. initdb refuses to
+run as root, use --database-url in that case.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import nullcontext
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from benchmarks.common import compare_results, load_results, print_table, setup_environment, write_results
+from benchmarks.statements import DESCRIPTIONS, icbc
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+
+PASSWORD = "LoadTest-2024"
+SEED_START_DATE = date(2024, 1, 1)
+SEED_DAYS = 365
+
+DEFAULT_MIX = "summary=40,details=35,import=5,signin=5,refresh=10,passwordless=5"
+
+
+# region Temporary Postgres
+
+
+def _find_postgres_bindir() -> str:
+    candidates = [os.environ.get("PG_BIN")]
+    if shutil.which("initdb"):
+        candidates.append(os.path.dirname(shutil.which("initdb")))
+    if shutil.which("pg_config"):
+        candidates.append(subprocess.check_output(["pg_config", "--bindir"], text=True).strip())
+    candidates += sorted(str(p) for p in Path("/usr/lib/postgresql").glob("*/bin"))[::-1]
+
+    for bindir in filter(None, candidates):
+        if os.path.exists(os.path.join(bindir, "initdb")):
+            return bindir
+
+    raise RuntimeError("Postgres binaries not found: install postgres, set PG_BIN or pass --database-url")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TemporaryPostgres:
+    """A private Postgres cluster in a temp directory, removed on exit."""
+
+    def __enter__(self) -> str:
+        bindir = _find_postgres_bindir()
+        self.pg_ctl = os.path.join(bindir, "pg_ctl")
+        self.data_dir = tempfile.mkdtemp(prefix="mynab-loadtest-pg-")
+        port = _free_port()
+
+        subprocess.run(
+            [os.path.join(bindir, "initdb"), "-D", self.data_dir, "-U", "postgres",
+             "-A", "trust", "-E", "UTF8", "--no-sync"],
+            check=True, stdout=subprocess.DEVNULL,
+        )
+        # Durability is irrelevant for a throwaway cluster
+        options = f"-p {port} -k {self.data_dir} -c listen_addresses=127.0.0.1 -c fsync=off -c synchronous_commit=off"
+        subprocess.run(
+            [self.pg_ctl, "-D", self.data_dir, "-l", os.path.join(self.data_dir, "server.log"),
+             "-o", options, "-w", "start"],
+            check=True, stdout=subprocess.DEVNULL,
+        )
+        return f"postgresql+asyncpg://postgres@127.0.0.1:{port}/postgres"
+
+    def __exit__(self, *exc) -> None:
+        subprocess.run([self.pg_ctl, "-D", self.data_dir, "-m", "immediate", "stop"],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+
+# endregion Temporary Postgres
+
+# region Schema and seed data
+
+
+def _sync_url(database_url: str) -> str:
+    scheme, rest = database_url.split("://", 1)
+    return f"{scheme.split('+')[0]}://{rest}"
+
+
+def migrate(database_url: str) -> None:
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine(_sync_url(database_url))
+    with engine.begin() as conn:
+        conn.execute(text("CREATE SCHEMA IF NOT EXISTS mynab"))
+    engine.dispose()
+
+    # Separate process: env.py configures logging from alembic.ini
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"],
+                   cwd=SERVICE_DIR, env=os.environ.copy(), check=True)
+
+
+def seed(database_url: str, users: int, entries: int, passwordless_users: int, seed_value: int) -> Dict[str, list]:
+    """Insert users, categories, refresh tokens and budget entries. Returns the seeded accounts."""
+    from sqlalchemy import create_engine, insert, text
+
+    from src.auth_user.security import hash_password, hash_refresh_token
+    from src.auth_user.utils import generate_random_alphanum
+    from src.budget_transaction_category.constants import CATEGORY_IDS
+    from src.constants import ROLES
+    from src.database import (
+        auth_refresh_token, auth_user, auth_user_role, budget_entry, budget_transaction_category,
+    )
+
+    rng = random.Random(seed_value)
+    password_hash = hash_password(PASSWORD)
+    engine = create_engine(_sync_url(database_url))
+    accounts: Dict[str, list] = {"password": [], "passwordless": []}
+
+    with engine.begin() as conn:
+        role_id = conn.execute(
+            insert(auth_user_role).values(name=ROLES.USER.value).returning(auth_user_role.c.id)
+        ).scalar_one()
+        conn.execute(insert(budget_transaction_category), [
+            {"id": category_id, "category_key": key, "category_name": key.replace("_", " ").title()}
+            for key, category_id in CATEGORY_IDS.items()
+        ])
+
+        def create_users(count: int, prefix: str, auth_method: str) -> List[Dict[str, Any]]:
+            rows = [{
+                "name": "Load",
+                "last_name": f"Test {i}",
+                "email": f"{prefix}{i}@example.com",
+                "password": password_hash if auth_method == "password" else None,
+                "auth_method": auth_method,
+                "email_verified": True,
+                "id_role": role_id,
+            } for i in range(count)]
+            result = conn.execute(insert(auth_user).returning(auth_user.c.id, auth_user.c.email), rows)
+            return [{"id": row.id, "email": row.email, "name": "Load", "last_name": "Test"} for row in result]
+
+        accounts["password"] = create_users(users, "loadtest", "password")
+        accounts["passwordless"] = create_users(passwordless_users, "loadtest-passwordless", "passwordless")
+
+        for user in accounts["password"]:
+            user["refresh_token"] = generate_random_alphanum(64)
+        conn.execute(insert(auth_refresh_token), [{
+            "uuid": uuid.uuid4(),
+            "id_user": user["id"],
+            "token_hash": hash_refresh_token(user["refresh_token"]),
+            "expires_at": datetime.now() + timedelta(days=1),
+        } for user in accounts["password"]])
+
+        category_ids = list(CATEGORY_IDS.values()) + [None]
+        batch: List[Dict[str, Any]] = []
+        for user in accounts["password"]:
+            for i in range(entries):
+                amount = round(rng.uniform(1, 50_000), 2)
+                batch.append({
+                    "user_id": user["id"],
+                    "reference_id": f"seed_{user['id']}_{i}",
+                    "amount": amount,
+                    "currency": "ARS" if rng.random() < 0.8 else "USD",
+                    "source": "seed",
+                    "type": "income" if rng.random() < 0.2 else "outcome",
+                    "description": rng.choice(DESCRIPTIONS),
+                    "category_id": rng.choice(category_ids),
+                    "date": SEED_START_DATE + timedelta(days=rng.randrange(SEED_DAYS)),
+                })
+                if len(batch) >= 5000:
+                    conn.execute(insert(budget_entry), batch)
+                    batch = []
+        if batch:
+            conn.execute(insert(budget_entry), batch)
+
+    with engine.connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT").execute(text("ANALYZE"))
+    engine.dispose()
+
+    return accounts
+
+
+# endregion Schema and seed data
+
+# region ASGI client
+
+
+class ASGIClient:
+    """Minimal in-process HTTP client for an ASGI app, enough for JSON APIs and cookies."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json_body: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        cookies: Optional[Dict[str, str]] = None,
+    ) -> Tuple[int, Dict[str, List[str]], bytes]:
+        body = json.dumps(json_body).encode() if json_body is not None else b""
+        raw_headers = [(b"host", b"loadtest")]
+        if json_body is not None:
+            raw_headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        if cookies:
+            raw_headers.append((b"cookie", "; ".join(f"{k}={v}" for k, v in cookies.items()).encode()))
+        for key, value in (headers or {}).items():
+            raw_headers.append((key.lower().encode(), value.encode()))
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": urlencode(params or {}).encode(),
+            "root_path": "",
+            "headers": raw_headers,
+            "client": ("127.0.0.1", 50000),
+            "server": ("loadtest", 80),
+        }
+
+        response_complete = asyncio.Event()
+        request_sent = False
+        status_code = 500
+        response_headers: Dict[str, List[str]] = {}
+        chunks: List[bytes] = []
+
+        async def receive() -> Dict[str, Any]:
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await response_complete.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for key, value in message.get("headers", []):
+                    response_headers.setdefault(key.decode().lower(), []).append(value.decode())
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response_complete.set()
+
+        await self.app(scope, receive, send)
+        response_complete.set()
+        return status_code, response_headers, b"".join(chunks)
+
+
+def _cookie(headers: Dict[str, List[str]], name: str) -> Optional[str]:
+    for value in headers.get("set-cookie", []):
+        key, _, rest = value.partition("=")
+        if key.strip() == name:
+            return rest.split(";", 1)[0]
+    return None
+
+
+class Lifespan:
+    """Run the app's ASGI lifespan (startup jobs included) around the load test."""
+
+    def __init__(self, app):
+        self.app = app
+        self.messages: asyncio.Queue = asyncio.Queue()
+        self.completed = {"startup": asyncio.Event(), "shutdown": asyncio.Event()}
+        self.task: Optional[asyncio.Task] = None
+
+    async def _receive(self) -> Dict[str, Any]:
+        return await self.messages.get()
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        event = message["type"].split(".")[1]
+        if event in self.completed:
+            self.completed[event].set()
+
+    async def _event(self, event: str) -> None:
+        await self.messages.put({"type": f"lifespan.{event}"})
+        await self.completed[event].wait()
+
+    async def __aenter__(self) -> "Lifespan":
+        scope = {"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}
+        self.task = asyncio.create_task(self.app(scope, self._receive, self._send))
+        await self._event("startup")
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self._event("shutdown")
+        await self.task
+
+
+# endregion ASGI client
+
+# region Workload
+
+
+class VirtualUser:
+    def __init__(self, index: int, client: ASGIClient, user: Dict[str, Any], passwordless_user: Dict[str, Any],
+                 rng: random.Random, import_rows: int):
+        from src.auth_user.jwt import create_access_token
+
+        self.index = index
+        self.client = client
+        self.user = user
+        self.passwordless_user = passwordless_user
+        self.rng = rng
+        self.import_rows = import_rows
+        self.refresh_token = user["refresh_token"]
+        self.auth = {"Authorization": f"Bearer {create_access_token(user=user, expires_delta=timedelta(hours=6))}"}
+        self.imports = 0
+
+    def _date_range(self) -> Dict[str, str]:
+        start = SEED_START_DATE + timedelta(days=self.rng.randrange(SEED_DAYS - 31))
+        end = start + timedelta(days=self.rng.choice([7, 30, 90]))
+        return {"start_date": start.isoformat(), "end_date": end.isoformat()}
+
+    async def summary(self, record) -> None:
+        params = {"currency": "ARS", **self._date_range()}
+        await record("GET /budget/summary", self.client.request(
+            "GET", "/budget/summary", params=params, headers=self.auth))
+
+    async def details(self, record) -> None:
+        params = {"currency": "ARS", "limit": 100, "offset": self.rng.choice([0, 0, 0, 100, 200]), **self._date_range()}
+        await record("GET /budget/details", self.client.request(
+            "GET", "/budget/details", params=params, headers=self.auth))
+
+    async def import_file(self, record) -> None:
+        self.imports += 1
+        content = icbc(self.import_rows, seed=self.index * 100_000 + self.imports)
+        body = {
+            "bank_name": "icbc",
+            "file_content": base64.b64encode(content).decode(),
+            "file_name": f"loadtest_{self.index}_{self.imports}.csv",
+            "currency": "ARS",
+        }
+        await record("POST /budget/import-file", self.client.request(
+            "POST", "/budget/import-file", json_body=body, headers=self.auth))
+
+    async def signin(self, record) -> None:
+        status_code, headers, _ = await record("POST /auth/signin", self.client.request(
+            "POST", "/auth/signin", json_body={"email": self.user["email"], "password": PASSWORD}))
+        self.refresh_token = _cookie(headers, "refreshToken") or self.refresh_token
+
+    async def refresh(self, record) -> None:
+        status_code, headers, _ = await record("POST /auth/refresh", self.client.request(
+            "POST", "/auth/refresh", cookies={"refreshToken": self.refresh_token}))
+        self.refresh_token = _cookie(headers, "refreshToken") or self.refresh_token
+
+    async def passwordless(self, record) -> None:
+        from sqlalchemy import select
+
+        from src.database import auth_email_verification, fetch_one
+
+        email = self.passwordless_user["email"]
+        status_code, _, _ = await record("POST /auth/passwordless/send-code", self.client.request(
+            "POST", "/auth/passwordless/send-code", json_body={"email": email, "code_type": "login"}))
+        if status_code != 200:
+            return
+
+        # The code normally arrives by mail; read it back from the database (not timed)
+        row = await fetch_one(select(auth_email_verification.c.verification_code).where(
+            auth_email_verification.c.email == email,
+            auth_email_verification.c.code_type == "login",
+        ))
+        await record("POST /auth/passwordless/login", self.client.request(
+            "POST", "/auth/passwordless/login",
+            json_body={"email": email, "verification_code": row["verification_code"]}))
+
+
+SCENARIOS: Dict[str, Callable[[VirtualUser], Callable]] = {
+    "summary": lambda vu: vu.summary,
+    "details": lambda vu: vu.details,
+    "import": lambda vu: vu.import_file,
+    "signin": lambda vu: vu.signin,
+    "refresh": lambda vu: vu.refresh,
+    "passwordless": lambda vu: vu.passwordless,
+}
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"Unknown scenario {name!r}, expected one of {', '.join(SCENARIOS)}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+async def drive(
+    accounts: Dict[str, list],
+    mix: Dict[str, float],
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    import_rows: int,
+    seed_value: int,
+) -> Tuple[Dict[str, List[float]], Dict[str, int], float]:
+    from src.main import app
+
+    client = ASGIClient(app)
+
+    latencies: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    recording = False
+
+    async def record(route: str, request: Awaitable) -> Tuple[int, Dict[str, List[str]], bytes]:
+        start = time.perf_counter()
+        status_code, headers, body = await request
+        elapsed = time.perf_counter() - start
+        if recording:
+            latencies.setdefault(route, []).append(elapsed)
+            if status_code >= 400:
+                errors[route] = errors.get(route, 0) + 1
+        return status_code, headers, body
+
+    names, weights = list(mix), list(mix.values())
+    users = [
+        VirtualUser(i, client, accounts["password"][i % len(accounts["password"])],
+                    accounts["passwordless"][i], random.Random(seed_value + i), import_rows)
+        for i in range(concurrency)
+    ]
+
+    async def run_user(vu: VirtualUser, deadline: float) -> None:
+        while time.perf_counter() < deadline:
+            scenario = vu.rng.choices(names, weights)[0]
+            await SCENARIOS[scenario](vu)(record)
+
+    async with Lifespan(app):
+        if warmup > 0:
+            await asyncio.gather(*(run_user(vu, time.perf_counter() + warmup) for vu in users))
+
+        recording = True
+        start = time.perf_counter()
+        await asyncio.gather(*(run_user(vu, start + duration) for vu in users))
+        elapsed = time.perf_counter() - start
+
+    return latencies, errors, elapsed
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """Nearest-rank percentile."""
+    rank = max(1, round(percent / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies: Dict[str, List[float]], errors: Dict[str, int], elapsed: float) -> List[Dict[str, Any]]:
+    results = []
+    all_latencies = [value for values in latencies.values() for value in values]
+    for route, values in sorted(latencies.items()) + [("ALL", all_latencies)]:
+        if not values:
+            continue
+        values = sorted(values)
+        results.append({
+            "route": route,
+            "requests": len(values),
+            "errors": sum(errors.values()) if route == "ALL" else errors.get(route, 0),
+            "rps": len(values) / elapsed,
+            "p50_ms": _percentile(values, 50) * 1000,
+            "p95_ms": _percentile(values, 95) * 1000,
+            "p99_ms": _percentile(values, 99) * 1000,
+            "max_ms": values[-1] * 1000,
+        })
+    return results
+
+
+# endregion Workload
+
+
+def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    with nullcontext(args.database_url) if args.database_url else TemporaryPostgres() as database_url:
+        # src reads its settings at import time, so only import it once the database is known
+        os.environ["ENV_DATABASE_URL"] = database_url
+        # The harness hammers send-code from one client address on purpose
+        os.environ.setdefault("SEND_CODE_IP_BURST", "1000000")
+        os.environ.setdefault("SEND_CODE_EMAIL_BURST", "1000000")
+        setup_environment()
+
+        print("Migrating...", flush=True)
+        migrate(database_url)
+        print(f"Seeding {args.users} users x {args.entries} entries...", flush=True)
+        accounts = seed(database_url, args.users, args.entries, args.concurrency, args.seed)
+
+        print(f"Running {args.concurrency} virtual users for {args.duration}s...", flush=True)
+        latencies, errors, elapsed = asyncio.run(drive(
+            accounts, args.mix, args.concurrency, args.duration, args.warmup, args.import_rows, args.seed))
+
+    return summarize(latencies, errors, elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--entries", type=int, default=2000, help="budget entries per user")
+    parser.add_argument("--concurrency", type=int, default=16, help="virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=3, help="unmeasured seconds before the run")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"default: {DEFAULT_MIX}")
+    parser.add_argument("--import-rows", type=int, default=200, help="rows per imported ICBC statement")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--database-url", help="disposable postgresql+asyncpg:// database to use instead of a temporary cluster")
+    parser.add_argument("--output", help="write JSON results to this path")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare p95 latency against")
+    args = parser.parse_args()
+
+    results = run(args)
+    columns = ["route", "requests", "errors", "rps", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+
+    if args.compare:
+        baseline = load_results(args.compare)["results"]
+        print_table(compare_results(baseline, results, ["route"], "p95_ms"), columns + ["baseline_p95_ms", "ratio"])
+    else:
+        print_table(results, columns)
+
+    write_results("loadtest", [{**row, "users": args.users, "entries": args.entries,
+                                "concurrency": args.concurrency} for row in results], args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Per-email template render cost.
+
+Compares the previous path (template lookup on every send, then a regex pass
+over the rendered HTML to build the text body) with the precompiled HTML
+template plus cached plain-text skeleton used by `MailService`.
+
+    python -m benchmarks.mail_render [--iterations 2000] [--output results.json]
+"""
+import argparse
+import re
+import shutil
+import tempfile
+import time
+
+from benchmarks.common import print_table, setup_environment, time_per_call, write_results
+
+setup_environment()
+
+from jinja2 import Environment, FileSystemLoader  # noqa: E402
+
+from src.mail.config import MailConfig  # noqa: E402
+from src.mail.service import MailService  # noqa: E402
+
+TEMPLATE_DIR = MailConfig.from_env().template_dir
+
+CONTEXTS = {
+    "login_verification": {
+        "verification_code": "493817",
+        "expiry_minutes": 5,
+        "user_email": "jane.doe@example.com",
+        "ip_address": "203.0.113.7",
+        "login_url": "https://mynab.up.railway.app/login",
+    },
+    "registration_verification": {
+        "verification_code": "120944",
+        "expiry_minutes": 5,
+        "user_email": "jane.doe@example.com",
+        "user_name": "Jane",
+        "registration_url": "https://mynab.up.railway.app/verify",
+    },
+}
+
+
+def _legacy_render(env: Environment, template_name: str, context: dict) -> tuple[str, str]:
+    html = env.get_template(f"{template_name}.html").render(context)
+    text = re.sub(r'<[^>]+>', '', html)
+    return html, text
+
+
+def _mail_service(cache_dir: str) -> MailService:
+    config = MailConfig.from_env().model_copy(update={"template_cache_dir": cache_dir})
+    return MailService(config)
+
+
+def run(iterations: int) -> list[dict]:
+    results = []
+    cache_dir = tempfile.mkdtemp(prefix="mynab-mail-bench-")
+
+    try:
+        # Startup: compile everything from source, then again from a warm bytecode cache
+        start = time.perf_counter()
+        _mail_service(cache_dir)
+        cold_startup = time.perf_counter() - start
+
+        start = time.perf_counter()
+        mail_service = _mail_service(cache_dir)
+        warm_startup = time.perf_counter() - start
+
+        results.append({"case": "startup_precompile_cold", "template": "*", "us_per_email": None,
+                        "ms": cold_startup * 1000})
+        results.append({"case": "startup_precompile_bytecode_cache", "template": "*", "us_per_email": None,
+                        "ms": warm_startup * 1000})
+
+        legacy_env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=True)
+
+        for template_name, context in CONTEXTS.items():
+            legacy = time_per_call(lambda: _legacy_render(legacy_env, template_name, context), iterations)
+            current = time_per_call(
+                lambda: (
+                    mail_service._render_template(f"{template_name}.html", context),
+                    mail_service._render_text_template(f"{template_name}.html", context),
+                ),
+                iterations,
+            )
+
+            results.append({"case": "legacy_lookup_and_regex", "template": template_name,
+                            "us_per_email": legacy * 1e6, "ms": None})
+            results.append({"case": "precompiled_with_text_skeleton", "template": template_name,
+                            "us_per_email": current * 1e6, "ms": None})
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--output", help="write JSON results to this path")
+    args = parser.parse_args()
+
+    results = run(args.iterations)
+    print_table(results, ["case", "template", "us_per_email", "ms"])
+    write_results("mail_render", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
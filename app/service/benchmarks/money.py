@@ -0,0 +1,81 @@
+"""
+Cost of amount conversion on imports and list pages.
+
+Imports: a statement column of "$ 1.234,56" style amounts parsed per row with
+float() or pd.to_numeric (the previous parsers) vs. `parse_amounts` over the
+whole column.
+Pages: Decimal amounts as asyncpg returns them (DECIMAL(38, 12)) encoded as
+floats vs. as exact JSON number literals.
+
+    python -m benchmarks.money [--sizes 1000 10000 100000] [--output results.json]
+"""
+import argparse
+import random
+from decimal import Decimal
+from typing import Any, Dict, List
+
+from benchmarks.common import print_table, setup_environment, time_per_call, write_results
+
+
+def _ar_amounts(size: int) -> List[str]:
+    rng = random.Random(size)
+    values = [rng.randint(-5_000_000, 5_000_000) / 100 for _ in range(size)]
+    return [f"$ {value:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".") for value in values]
+
+
+def run(sizes: List[int]) -> List[Dict[str, Any]]:
+    setup_environment()
+    import orjson
+    import pandas as pd
+
+    from src.budget.parsers import parse_amounts
+    from src.money import json_number
+
+    def per_row_float(column):
+        amounts = []
+        for value in column:
+            try:
+                amounts.append(float(str(value).replace("$", "").replace(".", "").strip().replace(",", ".")))
+            except ValueError:
+                amounts.append(None)
+        return amounts
+
+    results = []
+    for size in sizes:
+        column = pd.Series(_ar_amounts(size))
+        cleaned = [value.replace("$ ", "").replace(".", "").replace(",", ".") for value in column]
+        stored = [Decimal(f"{value:.12f}") for value in (random.Random(size).uniform(-1e5, 1e5) for _ in range(size))]
+        iterations = max(1, 100_000 // size)
+
+        cases = {
+            ("import", "per_row_float"): lambda: per_row_float(column),
+            ("import", "per_row_to_numeric"): lambda: [pd.to_numeric(value, errors="coerce") for value in cleaned],
+            ("import", "parse_amounts"): lambda: parse_amounts(column, decimal_comma=True),
+            ("page", "float"): lambda: orjson.dumps([float(value) for value in stored]),
+            ("page", "json_number"): lambda: orjson.dumps([json_number(value) for value in stored]),
+        }
+        for (step, path), func in cases.items():
+            seconds = time_per_call(func, iterations)
+            results.append({
+                "step": step,
+                "path": path,
+                "rows": size,
+                "ms": seconds * 1000,
+                "us_per_row": seconds / size * 1e6,
+            })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--output", help="write JSON results to this path")
+    args = parser.parse_args()
+
+    results = run(args.sizes)
+    print_table(results, ["step", "path", "rows", "ms", "us_per_row"])
+    write_results("money", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
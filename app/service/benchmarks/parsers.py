@@ -0,0 +1,132 @@
+"""
+Bank statement parser throughput.
+
+For every bank and size a synthetic statement is generated (see
+`benchmarks.statements`), then a fresh process decodes it from Base64, reads
+it into batches with the bank parser's `batches` (a DataFrame, or csv rows for
+the CSV banks) and runs its `parse` on each. Each step reports rows/sec; peak RSS above the
+interpreter baseline is reported per case, which is why every case runs in
+its own process. PDF extraction dominates Mercado Pago, so its 100k case alone
+takes several minutes; narrow the run with --banks/--sizes while iterating.
+
+    python -m benchmarks.parsers [--sizes 1000 10000 100000] [--banks icbc revolut]
+                                 [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import base64
+import multiprocessing
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks.common import compare_results, load_results, print_table, setup_environment, write_results
+from benchmarks.statements import GENERATORS
+
+setup_environment()
+
+try:
+    import resource
+except ImportError:  # Windows: peak RSS is not reported
+    resource = None
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run_case(bank_name: str, path: str, currency: str, queue: multiprocessing.Queue) -> None:
+    """Child process body: time decode, read and process for one statement file."""
+    from src.budget import parsers
+
+    parser = parsers.get_parser(bank_name)
+    with open(path, "rb") as f:
+        file_content = f.read().decode("ascii")
+
+    baseline_rss = _peak_rss_mb()
+
+    start = time.perf_counter()
+    file_bytes = base64.b64decode(file_content)
+    decoded = time.perf_counter()
+    # Batches are materialized here only to time reading and parsing separately
+    batches = list(parser.batches(file_bytes))
+    read = time.perf_counter()
+    entries = [entry for batch in batches for entry in parser.parse(batch, 1, bank_name, currency)]
+    processed = time.perf_counter()
+
+    peak_rss = _peak_rss_mb()
+    queue.put({
+        "decode_seconds": decoded - start,
+        "read_seconds": read - decoded,
+        "process_seconds": processed - read,
+        "entries": len(entries),
+        "peak_rss_mb": peak_rss - baseline_rss if peak_rss is not None else None,
+    })
+
+
+def run(banks: List[str], sizes: List[int], seed: int = 0) -> List[Dict[str, Any]]:
+    context = multiprocessing.get_context("spawn")
+    results = []
+
+    with tempfile.TemporaryDirectory(prefix="mynab-parser-bench-") as tmp:
+        for bank_name in banks:
+            generator, extension, currency = GENERATORS[bank_name]
+            for rows in sizes:
+                path = os.path.join(tmp, f"{bank_name}_{rows}{extension}.b64")
+                file_bytes = generator(rows, seed)
+                with open(path, "wb") as f:
+                    f.write(base64.b64encode(file_bytes))
+
+                queue = context.Queue()
+                child = context.Process(target=_run_case, args=(bank_name, path, currency, queue))
+                child.start()
+                measured = queue.get()
+                child.join()
+
+                total = measured["decode_seconds"] + measured["read_seconds"] + measured["process_seconds"]
+                results.append({
+                    "bank": bank_name,
+                    "rows": rows,
+                    "file_kb": len(file_bytes) / 1024,
+                    "entries": measured["entries"],
+                    "read_rows_per_sec": rows / (measured["decode_seconds"] + measured["read_seconds"]),
+                    "process_rows_per_sec": rows / measured["process_seconds"],
+                    "total_rows_per_sec": rows / total,
+                    "peak_rss_mb": measured["peak_rss_mb"],
+                    **measured,
+                })
+                print(f"{bank_name} {rows}: {rows / total:,.0f} rows/s", flush=True)
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--banks", nargs="+", choices=list(GENERATORS), default=list(GENERATORS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write JSON results to this path")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare total rows/sec against")
+    args = parser.parse_args()
+
+    results = run(args.banks, args.sizes, args.seed)
+    columns = ["bank", "rows", "entries", "read_rows_per_sec", "process_rows_per_sec",
+               "total_rows_per_sec", "peak_rss_mb"]
+
+    if args.compare:
+        baseline = load_results(args.compare)["results"]
+        print_table(compare_results(baseline, results, ["bank", "rows"], "total_rows_per_sec"),
+                    columns + ["baseline_total_rows_per_sec", "ratio"])
+    else:
+        print_table(results, columns)
+
+    write_results("parsers", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
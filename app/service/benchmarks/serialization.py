@@ -0,0 +1,80 @@
+"""
+List endpoint serialization: per-row response models vs. the column-wise orjson path.
+
+Builds synthetic `/budget/details` pages (Decimal amounts, datetime columns, as
+asyncpg returns them) and times turning a page into response bytes both ways.
+
+    python -m benchmarks.serialization [--sizes 100 1000 10000] [--output results.json]
+"""
+import argparse
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List
+
+from benchmarks.common import print_table, setup_environment, time_per_call, write_results
+
+
+def make_rows(size: int) -> List[Dict[str, Any]]:
+    imported_at = datetime(2025, 6, 4, 10, 30)
+    return [
+        {
+            "id": i,
+            "user_id": 1,
+            "reference_id": f"ref-{i}",
+            "amount": Decimal(f"{(i * 7919) % 100000}.{i % 100:02d}"),
+            "currency": "ARS",
+            "source": "icbc",
+            "type": "outcome" if i % 3 else "income",
+            "description": f"COMPRA {i}",
+            "file_id": 1,
+            "date": date(2025, 1, 1) + timedelta(days=i % 180),
+            "created_at": imported_at,
+            "updated_at": imported_at,
+        }
+        for i in range(size)
+    ]
+
+
+def run(sizes: List[int]) -> List[Dict[str, Any]]:
+    setup_environment()
+    from fastapi.responses import JSONResponse
+
+    from src.budget.schemas import BudgetResponse, budget_response_serializer
+    from src.serialization import json_response
+
+    def per_row_models(rows, metadata):
+        content = {"data": [BudgetResponse(**row).model_dump() for row in rows], "metadata": metadata}
+        return JSONResponse(content=content).body
+
+    def column_wise(rows, metadata):
+        return json_response(budget_response_serializer.page(rows, metadata)).body
+
+    results = []
+    for size in sizes:
+        rows = make_rows(size)
+        metadata = {"total_count": size, "limit": size, "offset": 0}
+        iterations = max(1, 20000 // size)
+        for name, func in (("per_row_models", per_row_models), ("column_wise", column_wise)):
+            seconds = time_per_call(lambda: func(rows, metadata), iterations)
+            results.append({
+                "path": name,
+                "rows": size,
+                "ms_per_page": seconds * 1000,
+                "us_per_row": seconds / size * 1e6,
+            })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--output", help="write JSON results to this path")
+    args = parser.parse_args()
+
+    results = run(args.sizes)
+    print_table(results, ["path", "rows", "ms_per_page", "us_per_row"])
+    write_results("serialization", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Application import time and memory.
+
+Each run starts a fresh interpreter that imports `src.main` (what every worker
+does at boot), then loads the statement parsing stack the way the first
+import request or the startup pre-warm does. Reports wall time and RSS for both
+steps and which heavy modules were already loaded by the application import;
+exits with status 1 if any was, so it can guard startup in CI.
+
+    python -m benchmarks.startup [--runs 5] [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+from benchmarks.common import compare_results, load_results, print_table, setup_environment, write_results
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ["pandas", "numpy", "pdfplumber", "openpyxl"]
+
+CHILD = f"""
+import json, resource, sys, time
+
+def rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+start = time.perf_counter()
+import src.main
+app_seconds = time.perf_counter() - start
+app_rss = rss_mb()
+heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]
+
+start = time.perf_counter()
+src.main.load_statement_parsers()
+parsers_seconds = time.perf_counter() - start
+
+print(json.dumps({{"app_seconds": app_seconds, "app_rss_mb": app_rss, "heavy": heavy,
+                  "parsers_seconds": parsers_seconds, "parsers_rss_mb": rss_mb()}}))
+"""
+
+
+def run(runs: int) -> List[Dict[str, Any]]:
+    setup_environment()
+    samples = []
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, "-c", CHILD], cwd=SERVICE_DIR,
+                                         env=os.environ.copy(), text=True)
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    heavy = sorted({module for sample in samples for module in sample["heavy"]})
+    return [
+        {
+            "step": "import src.main",
+            "median_ms": statistics.median(s["app_seconds"] for s in samples) * 1000,
+            "min_ms": min(s["app_seconds"] for s in samples) * 1000,
+            "rss_mb": statistics.median(s["app_rss_mb"] for s in samples),
+            "heavy_modules": ",".join(heavy) or None,
+        },
+        {
+            "step": "load_statement_parsers (first use)",
+            "median_ms": statistics.median(s["parsers_seconds"] for s in samples) * 1000,
+            "min_ms": min(s["parsers_seconds"] for s in samples) * 1000,
+            "rss_mb": statistics.median(s["parsers_rss_mb"] for s in samples),
+            "heavy_modules": None,
+        },
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="write JSON results to this path")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare median import time against")
+    args = parser.parse_args()
+
+    results = run(args.runs)
+    columns = ["step", "median_ms", "min_ms", "rss_mb", "heavy_modules"]
+
+    if args.compare:
+        baseline = load_results(args.compare)["results"]
+        print_table(compare_results(baseline, results, ["step"], "median_ms"), columns + ["baseline_median_ms", "ratio"])
+    else:
+        print_table(results, columns)
+
+    write_results("startup", results, args.output)
+
+    if results[0]["heavy_modules"]:
+        print(f"\nimport src.main loaded {results[0]['heavy_modules']}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
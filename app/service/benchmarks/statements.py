@@ -0,0 +1,208 @@
+"""
+Deterministic synthetic bank statements.
+
+Each generator returns the raw file bytes for `rows` transactions laid out the
+way the matching parser in `src.budget.parsers` expects them (and detects them). The same `seed`
+always yields the same file, so results are comparable between commits.
+"""
+import csv
+import io
+import random
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Tuple
+
+from openpyxl import Workbook
+
+START_DATE = date(2024, 1, 1)
+
+DESCRIPTIONS = [
+    "Compra con tarjeta de debito SUPERMERCADO COTO",
+    "Transferencia recibida de JUAN PEREZ",
+    "Pago de servicios EDENOR",
+    "Debito automatico NETFLIX.COM",
+    "Compra UBER TRIP",
+    "Pago tarjeta de credito VISA",
+    "Extraccion cajero automatico",
+    "Acreditacion de haberes EMPRESA SA",
+    "Compra MERCADOLIBRE",
+    "Pago PEDIDOSYA",
+    "Farmacia DEL PUEBLO",
+    "Estacion de servicio YPF",
+    "WOOLWORTHS METRO SYDNEY",
+    "Transfer to savings account",
+]
+
+
+def _transactions(rows: int, seed: int) -> List[Tuple[date, str, float]]:
+    rng = random.Random(seed)
+    transactions = []
+    for i in range(rows):
+        day = START_DATE + timedelta(days=i * 365 // max(rows, 1))
+        description = f"{rng.choice(DESCRIPTIONS)} {rng.randint(1000, 9999)}"
+        amount = round(rng.uniform(-50_000, 20_000), 2)
+        if amount == 0:
+            amount = 1.0
+        transactions.append((day, description, amount))
+    return transactions
+
+
+def _ar_number(value: float) -> str:
+    """Format with "." thousands and "," decimals, as Argentinian banks export amounts."""
+    return f"{value:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+def _csv_bytes(header: List[str] | None, records: List[List]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(header)
+    writer.writerows(records)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _xlsx_bytes(records: List[List]) -> bytes:
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    for record in records:
+        sheet.append(record)
+    output = io.BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
+
+def santander_rio(rows: int, seed: int = 0) -> bytes:
+    # First row is read as the header and the parser drops the next 12 preamble rows,
+    # the last of which holds the column titles
+    records: List[List] = [["Santander - Movimientos de cuenta", None, None, None, None, None, None, None]]
+    records += [[None, f"Encabezado {i}", None, None, None, None, None, None] for i in range(11)]
+    records.append([None, "Fecha", "Sucursal origen", "Descripción", "Referencia",
+                    "Caja de Ahorro", "Cuenta Corriente", "Saldo"])
+
+    balance = 1_000_000.0
+    for i, (day, description, amount) in enumerate(_transactions(rows, seed)):
+        balance += amount
+        savings, checking = (amount, None) if i % 3 else (None, amount)
+        records.append([None, day.strftime("%d/%m/%Y"), "001", description, str(10_000_000 + i),
+                        savings, checking, round(balance, 2)])
+
+    return _xlsx_bytes(records)
+
+
+def bbva(rows: int, seed: int = 0) -> bytes:
+    # BBVA exports legacy .xls, but no .xls writer ships with the dependencies. The
+    # sheet layout (header on row 3, amounts as "1.234,56" text) is what the parser
+    # depends on, and pd.read_excel picks the engine from the file content.
+    records: List[List] = [["Movimientos"], [None], ["Fecha", "Concepto", "Movimiento", "Importe", "Saldo"]]
+
+    balance = 1_000_000.0
+    for day, description, amount in _transactions(rows, seed):
+        balance += amount
+        concept, _, extra = description.rpartition(" ")
+        records.append([day.strftime("%d/%m/%Y"), concept, extra, _ar_number(amount), _ar_number(balance)])
+
+    return _xlsx_bytes(records)
+
+
+def icbc(rows: int, seed: int = 0) -> bytes:
+    records = []
+    for i, (day, description, amount) in enumerate(_transactions(rows, seed)):
+        debit, credit = (abs(amount), "") if amount < 0 else ("", amount)
+        reference = f"{20_000_000 + i:,}".replace(",", ".")
+        records.append([day.strftime("%m/%d/%y"), description, debit, credit, reference])
+
+    return _csv_bytes(["Fecha", "Descripcion", "Debito", "Credito", "Referencia"], records)
+
+
+def comm_bank(rows: int, seed: int = 0) -> bytes:
+    records = []
+    balance = 10_000.0
+    for day, description, amount in _transactions(rows, seed):
+        amount = round(amount / 100, 2)
+        balance += amount
+        records.append([day.strftime("%d/%m/%Y"), f"{amount:+.2f}", description, f"{balance:+.2f}"])
+
+    return _csv_bytes(None, records)
+
+
+def revolut(rows: int, seed: int = 0) -> bytes:
+    header = ["Tipo", "Producto", "Fecha de inicio", "Fecha de finalización", "Descripción",
+              "Importe", "Comisión", "Divisa", "Estado", "Saldo"]
+    records = []
+    balance = 10_000.0
+    for i, (day, description, amount) in enumerate(_transactions(rows, seed)):
+        amount = round(amount / 100, 2)
+        balance += amount
+        started = datetime.combine(day, datetime.min.time()) + timedelta(seconds=i % 86_400)
+        fee = 0.5 if i % 10 == 0 else 0.0
+        records.append(["PAGO CON TARJETA", "Actual", started.strftime("%Y-%m-%d %H:%M:%S"),
+                        started.strftime("%Y-%m-%d %H:%M:%S"), description, amount, fee,
+                        "EUR", "COMPLETADO", round(balance, 2)])
+
+    return _csv_bytes(header, records)
+
+
+def mercado_pago(rows: int, seed: int = 0) -> bytes:
+    lines = ["RESUMEN DE CUENTA", "DETALLE DE MOVIMIENTOS",
+             "Fecha Descripción ID de la operación Valor Saldo"]
+    balance = 1_000_000.0
+    for i, (day, description, amount) in enumerate(_transactions(rows, seed)):
+        balance += amount
+        lines.append(f"{day.strftime('%d-%m-%Y')} {description} {30_000_000_000 + i} "
+                     f"$ {_ar_number(amount)} $ {_ar_number(balance)}")
+
+    return _text_pdf(lines)
+
+
+def _text_pdf(lines: List[str], lines_per_page: int = 60) -> bytes:
+    """Write a minimal PDF with one line of Helvetica text per entry, enough for pdfplumber."""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    # Object numbers: 1 catalog, 2 page tree, 3 font, then a (page, content) pair per page
+    objects: Dict[int, bytes] = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    }
+    kids = []
+    for index, page_lines in enumerate(pages):
+        page_number, content_number = 4 + index * 2, 5 + index * 2
+        kids.append(f"{page_number} 0 R")
+
+        text = ["BT", "/F1 8 Tf", "10 TL", "30 810 Td"]
+        for line in page_lines:
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            text.append(f"({escaped}) Tj T*")
+        text.append("ET")
+        stream = "\n".join(text).encode("cp1252")
+
+        objects[page_number] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_number} 0 R >>"
+        ).encode()
+        objects[content_number] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>".encode()
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = output.tell()
+        output.write(b"%d 0 obj\n%s\nendobj\n" % (number, objects[number]))
+
+    xref_offset = output.tell()
+    output.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for number in sorted(objects):
+        output.write(b"%010d 00000 n \n" % offsets[number])
+    output.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset))
+    return output.getvalue()
+
+
+# bank name as accepted by /budget/import-file -> (generator, file extension, currency)
+GENERATORS: Dict[str, Tuple[Callable[[int, int], bytes], str, str]] = {
+    "santander_rio": (santander_rio, ".xlsx", "ARS"),
+    "bbva": (bbva, ".xls", "ARS"),
+    "icbc": (icbc, ".csv", "ARS"),
+    "comm_bank": (comm_bank, ".csv", "AUD"),
+    "revolut": (revolut, ".csv", "EUR"),
+    "mercado_pago": (mercado_pago, ".pdf", "ARS"),
+}
@@ -6,5 +6,10 @@ sleep 10
 echo "Running Alembic upgrade..."
 alembic upgrade head
 
+if [ -n "${FX_RATES_CSV}" ]; then
+    echo "Loading exchange rates..."
+    python -m src.fx_rate.seed "${FX_RATES_CSV}"
+fi
+
 echo "Starting Uvicorn..."
 uvicorn src.main:app --host 0.0.0.0 --port ${PORT}
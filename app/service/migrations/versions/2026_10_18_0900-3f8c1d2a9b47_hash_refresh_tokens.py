@@ -0,0 +1,39 @@
+"""hash refresh tokens
+
+Revision ID: 3f8c1d2a9b47
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8c1d2a9b47'
+down_revision: Union[str, None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Expired and rotated tokens are never looked up again, drop them before backfilling
+    op.execute("DELETE FROM mynab.auth_refresh_token WHERE expires_at < now()")
+
+    op.add_column('auth_refresh_token', sa.Column('token_hash', sa.String(length=64), nullable=True), schema='mynab')
+    op.execute("UPDATE mynab.auth_refresh_token SET token_hash = encode(sha256(refresh_token::bytea), 'hex')")
+    op.alter_column('auth_refresh_token', 'token_hash', existing_type=sa.String(length=64), nullable=False, schema='mynab')
+    op.create_unique_constraint(op.f('auth_refresh_token_token_hash_key'), 'auth_refresh_token', ['token_hash'], schema='mynab')
+    op.create_index(op.f('auth_refresh_token_expires_at_idx'), 'auth_refresh_token', ['expires_at'], unique=False, schema='mynab')
+    op.drop_column('auth_refresh_token', 'refresh_token', schema='mynab')
+
+
+def downgrade() -> None:
+    # Raw tokens cannot be recovered from their hashes: existing sessions are dropped
+    op.execute("DELETE FROM mynab.auth_refresh_token")
+    op.add_column('auth_refresh_token', sa.Column('refresh_token', sa.String(), nullable=False), schema='mynab')
+    op.drop_index(op.f('auth_refresh_token_expires_at_idx'), table_name='auth_refresh_token', schema='mynab')
+    op.drop_constraint(op.f('auth_refresh_token_token_hash_key'), 'auth_refresh_token', schema='mynab', type_='unique')
+    op.drop_column('auth_refresh_token', 'token_hash', schema='mynab')
@@ -0,0 +1,42 @@
+"""verification code email type index
+
+Revision ID: 7c2e5b1f4a90
+Revises: 3f8c1d2a9b47
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e5b1f4a90'
+down_revision: Union[str, None] = '3f8c1d2a9b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep only the newest code per email and type so the unique index can be built
+    op.execute(
+        """
+        DELETE FROM mynab.auth_email_verification older
+        USING mynab.auth_email_verification newer
+        WHERE older.email = newer.email
+          AND older.code_type = newer.code_type
+          AND older.id < newer.id
+        """
+    )
+
+    op.create_index('auth_email_verification_email_code_type_idx', 'auth_email_verification', ['email', 'code_type'], unique=True, schema='mynab')
+    # Both are covered by the composite index
+    op.drop_index('ix_auth_email_verification_code_type', table_name='auth_email_verification', schema='mynab')
+    op.drop_index('ix_auth_email_verification_email', table_name='auth_email_verification', schema='mynab')
+
+
+def downgrade() -> None:
+    op.create_index('ix_auth_email_verification_email', 'auth_email_verification', ['email'], schema='mynab')
+    op.create_index('ix_auth_email_verification_code_type', 'auth_email_verification', ['code_type'], schema='mynab')
+    op.drop_index('auth_email_verification_email_code_type_idx', table_name='auth_email_verification', schema='mynab')
@@ -0,0 +1,41 @@
+"""mail outbox
+
+Revision ID: c41d9e07b2a3
+Revises: 7c2e5b1f4a90
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d9e07b2a3'
+down_revision: Union[str, None] = '7c2e5b1f4a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('mail_outbox',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('message', sa.JSON(), nullable=False),
+    sa.Column('status', sa.String(length=20), server_default='pending', nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('max_attempts', sa.Integer(), server_default='5', nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('provider_message_id', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('sent_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id', name=op.f('mail_outbox_pkey')),
+    schema='mynab'
+    )
+    op.create_index('mail_outbox_status_next_attempt_at_idx', 'mail_outbox', ['status', 'next_attempt_at'], unique=False, schema='mynab')
+
+
+def downgrade() -> None:
+    op.drop_index('mail_outbox_status_next_attempt_at_idx', table_name='mail_outbox', schema='mynab')
+    op.drop_table('mail_outbox', schema='mynab')
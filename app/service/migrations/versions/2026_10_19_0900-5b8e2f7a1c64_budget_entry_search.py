@@ -0,0 +1,50 @@
+"""budget entry search
+
+Revision ID: 5b8e2f7a1c64
+Revises: c41d9e07b2a3
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e2f7a1c64'
+down_revision: Union[str, None] = 'c41d9e07b2a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public")
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent WITH SCHEMA public")
+
+    # unaccent() is only STABLE (its dictionary could change), index expressions need
+    # an IMMUTABLE function; naming the dictionary keeps it independent of search_path
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION mynab.f_unaccent(text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+        """
+    )
+
+    op.create_index(
+        'budget_entry_description_trgm_idx',
+        'budget_entry',
+        [sa.text('mynab.f_unaccent(lower(description)) gin_trgm_ops')],
+        unique=False,
+        postgresql_using='gin',
+        schema='mynab',
+    )
+    op.create_index('budget_entry_user_id_date_id_idx', 'budget_entry', ['user_id', 'date', 'id'], unique=False, schema='mynab')
+
+
+def downgrade() -> None:
+    op.drop_index('budget_entry_user_id_date_id_idx', table_name='budget_entry', schema='mynab')
+    op.drop_index('budget_entry_description_trgm_idx', table_name='budget_entry', schema='mynab')
+    op.execute("DROP FUNCTION mynab.f_unaccent(text)")
+    # The extensions are left installed, other database objects may use them
@@ -0,0 +1,84 @@
+"""user data version
+
+Revision ID: 9a4d6c2e8f15
+Revises: 5b8e2f7a1c64
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4d6c2e8f15'
+down_revision: Union[str, None] = '5b8e2f7a1c64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('user_data_version',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['mynab.auth_user.id'], name=op.f('user_data_version_user_id_fkey'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', name=op.f('user_data_version_pkey')),
+    schema='mynab'
+    )
+
+    # One bump per statement and user, whichever code path writes the entries
+    op.execute(
+        """
+        CREATE FUNCTION mynab.bump_user_data_version() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO mynab.user_data_version AS v (user_id, version)
+                SELECT DISTINCT user_id, 1 FROM new_rows
+                ON CONFLICT (user_id) DO UPDATE SET version = v.version + 1, updated_at = now();
+            ELSIF TG_OP = 'UPDATE' THEN
+                INSERT INTO mynab.user_data_version AS v (user_id, version)
+                SELECT user_id, 1 FROM old_rows UNION SELECT user_id, 1 FROM new_rows
+                ON CONFLICT (user_id) DO UPDATE SET version = v.version + 1, updated_at = now();
+            ELSE
+                INSERT INTO mynab.user_data_version AS v (user_id, version)
+                SELECT DISTINCT user_id, 1 FROM old_rows
+                ON CONFLICT (user_id) DO UPDATE SET version = v.version + 1, updated_at = now();
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    # Transition tables allow a single event per trigger
+    op.execute(
+        """
+        CREATE TRIGGER budget_entry_insert_data_version AFTER INSERT ON mynab.budget_entry
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION mynab.bump_user_data_version()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER budget_entry_update_data_version AFTER UPDATE ON mynab.budget_entry
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION mynab.bump_user_data_version()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER budget_entry_delete_data_version AFTER DELETE ON mynab.budget_entry
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION mynab.bump_user_data_version()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER budget_entry_delete_data_version ON mynab.budget_entry")
+    op.execute("DROP TRIGGER budget_entry_update_data_version ON mynab.budget_entry")
+    op.execute("DROP TRIGGER budget_entry_insert_data_version ON mynab.budget_entry")
+    op.execute("DROP FUNCTION mynab.bump_user_data_version()")
+    op.drop_table('user_data_version', schema='mynab')
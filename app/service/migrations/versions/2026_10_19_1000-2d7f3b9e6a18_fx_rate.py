@@ -0,0 +1,39 @@
+"""fx rate
+
+Revision ID: 2d7f3b9e6a18
+Revises: 9a4d6c2e8f15
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d7f3b9e6a18'
+down_revision: Union[str, None] = '9a4d6c2e8f15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('fx_rate',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('base', sa.String(length=3), nullable=False),
+    sa.Column('quote', sa.String(length=3), nullable=False),
+    sa.Column('rate', sa.DECIMAL(precision=38, scale=12), nullable=False),
+    sa.Column('source', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('fx_rate_pkey')),
+    schema='mynab'
+    )
+    op.create_index('fx_rate_base_quote_date_idx', 'fx_rate', ['base', 'quote', 'date'], unique=True, schema='mynab')
+
+
+def downgrade() -> None:
+    op.drop_index('fx_rate_base_quote_date_idx', table_name='fx_rate', schema='mynab')
+    op.drop_table('fx_rate', schema='mynab')
@@ -0,0 +1,36 @@
+"""budget reclassification
+
+Revision ID: 6e1a9c4b7d23
+Revises: 2d7f3b9e6a18
+Create Date: 2026-10-19 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e1a9c4b7d23'
+down_revision: Union[str, None] = '2d7f3b9e6a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('budget_reclassification',
+    sa.Column('scope', sa.String(length=50), nullable=False),
+    sa.Column('matcher_version', sa.String(length=64), nullable=False),
+    sa.Column('last_entry_id', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('updated_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('started_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('scope', name=op.f('budget_reclassification_pkey')),
+    schema='mynab'
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('budget_reclassification', schema='mynab')
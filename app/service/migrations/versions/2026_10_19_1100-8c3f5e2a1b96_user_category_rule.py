@@ -0,0 +1,43 @@
+"""user category rule
+
+Revision ID: 8c3f5e2a1b96
+Revises: 6e1a9c4b7d23
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c3f5e2a1b96'
+down_revision: Union[str, None] = '6e1a9c4b7d23'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('user_category_rule',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('pattern', sa.String(length=255), nullable=False),
+    sa.Column('match_type', sa.String(length=20), server_default='contains', nullable=False),
+    sa.Column('priority', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['mynab.budget_transaction_category.id'], name=op.f('user_category_rule_category_id_fkey')),
+    sa.ForeignKeyConstraint(['user_id'], ['mynab.auth_user.id'], name=op.f('user_category_rule_user_id_fkey'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('user_category_rule_pkey')),
+    schema='mynab'
+    )
+    op.create_index('user_category_rule_user_id_idx', 'user_category_rule', ['user_id'], unique=False, schema='mynab')
+    op.add_column('user_data_version', sa.Column('category_rules_version', sa.BigInteger(), server_default='0', nullable=False), schema='mynab')
+
+
+def downgrade() -> None:
+    op.drop_column('user_data_version', 'category_rules_version', schema='mynab')
+    op.drop_index('user_category_rule_user_id_idx', table_name='user_category_rule', schema='mynab')
+    op.drop_table('user_category_rule', schema='mynab')
@@ -0,0 +1,37 @@
+"""category memo
+
+Revision ID: 3f8b1d6c9e42
+Revises: 8c3f5e2a1b96
+Create Date: 2026-10-19 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8b1d6c9e42'
+down_revision: Union[str, None] = '8c3f5e2a1b96'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('category_memo',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('description_hash', sa.String(length=64), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('source', sa.String(length=20), nullable=False),
+    sa.Column('matcher_version', sa.String(length=64), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['mynab.budget_transaction_category.id'], name=op.f('category_memo_category_id_fkey')),
+    sa.ForeignKeyConstraint(['user_id'], ['mynab.auth_user.id'], name=op.f('category_memo_user_id_fkey'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'description_hash', name=op.f('category_memo_pkey')),
+    schema='mynab'
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('category_memo', schema='mynab')
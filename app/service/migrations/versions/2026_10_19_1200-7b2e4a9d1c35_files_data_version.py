@@ -0,0 +1,48 @@
+"""files data version
+
+Revision ID: 7b2e4a9d1c35
+Revises: 3f8b1d6c9e42
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2e4a9d1c35'
+down_revision: Union[str, None] = '3f8b1d6c9e42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The file list is served with ETags from the user's data version as well
+    op.execute(
+        """
+        CREATE TRIGGER files_insert_data_version AFTER INSERT ON mynab.files
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION mynab.bump_user_data_version()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER files_update_data_version AFTER UPDATE ON mynab.files
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION mynab.bump_user_data_version()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER files_delete_data_version AFTER DELETE ON mynab.files
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION mynab.bump_user_data_version()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER files_delete_data_version ON mynab.files")
+    op.execute("DROP TRIGGER files_update_data_version ON mynab.files")
+    op.execute("DROP TRIGGER files_insert_data_version ON mynab.files")
@@ -0,0 +1,55 @@
+"""fx rate version
+
+Revision ID: 4a9c2e7f1b58
+Revises: 7b2e4a9d1c35
+Create Date: 2026-10-19 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a9c2e7f1b58'
+down_revision: Union[str, None] = '7b2e4a9d1c35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('fx_rate_version',
+    sa.Column('id', sa.Integer(), server_default='1', nullable=False),
+    sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.CheckConstraint('id = 1', name='fx_rate_version_single_row'),
+    sa.PrimaryKeyConstraint('id', name=op.f('fx_rate_version_pkey')),
+    schema='mynab'
+    )
+    op.execute("INSERT INTO mynab.fx_rate_version (id, version) VALUES (1, 0)")
+
+    # One bump per statement, whichever code path writes the rates
+    op.execute(
+        """
+        CREATE FUNCTION mynab.bump_fx_rate_version() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE mynab.fx_rate_version SET version = version + 1, updated_at = now() WHERE id = 1;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER fx_rate_data_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON mynab.fx_rate
+        FOR EACH STATEMENT EXECUTE FUNCTION mynab.bump_fx_rate_version()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER fx_rate_data_version ON mynab.fx_rate")
+    op.execute("DROP FUNCTION mynab.bump_fx_rate_version()")
+    op.drop_table('fx_rate_version', schema='mynab')
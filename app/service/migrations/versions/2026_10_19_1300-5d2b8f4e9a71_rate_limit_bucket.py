@@ -0,0 +1,38 @@
+"""rate limit bucket
+
+Revision ID: 5d2b8f4e9a71
+Revises: 4a9c2e7f1b58
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2b8f4e9a71'
+down_revision: Union[str, None] = '4a9c2e7f1b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Unlogged: rate limit state is disposable, no need to write it to the WAL
+    op.create_table('rate_limit_bucket',
+    sa.Column('key', sa.String(length=255), nullable=False),
+    sa.Column('tokens', sa.Float(), nullable=False),
+    sa.Column('allowed', sa.Boolean(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('refilled_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('key', name=op.f('rate_limit_bucket_pkey')),
+    schema='mynab',
+    prefixes=['UNLOGGED']
+    )
+    op.create_index('rate_limit_bucket_refilled_at_idx', 'rate_limit_bucket', ['refilled_at'], unique=False, schema='mynab')
+
+
+def downgrade() -> None:
+    op.drop_index('rate_limit_bucket_refilled_at_idx', table_name='rate_limit_bucket', schema='mynab')
+    op.drop_table('rate_limit_bucket', schema='mynab')
@@ -9,6 +9,18 @@ class AuthConfig(BaseSettings):
     REFRESH_TOKEN_KEY: str = "refreshToken"
     REFRESH_TOKEN_EXP: int = 60 * 60 * 24 * 21  # 21 days
 
+    REFRESH_TOKEN_SWEEP_INTERVAL: int = 60 * 60  # seconds
+    REFRESH_TOKEN_SWEEP_BATCH_SIZE: int = 1000
+
+    VERIFICATION_CODE_PURGE_INTERVAL: int = 60 * 15  # seconds
+    VERIFICATION_CODE_PURGE_BATCH_SIZE: int = 1000
+
+    # Passwordless code issuance: burst size and seconds to regain one request
+    SEND_CODE_EMAIL_BURST: int = 3
+    SEND_CODE_EMAIL_REFILL_SECONDS: float = 60
+    SEND_CODE_IP_BURST: int = 10
+    SEND_CODE_IP_REFILL_SECONDS: float = 30
+
     SECURE_COOKIES: bool = True
 
 
@@ -1,14 +1,23 @@
 from datetime import datetime
 from typing import Any, List
 
-from fastapi import Cookie, Depends
+from fastapi import Cookie, Depends, Request
 
 from src.auth_user.exceptions import EmailTaken, RefreshTokenNotValid, RoleRequired
-from src.auth_user.schemas import RegisterUser, JWTData
+from src.auth_user.config import auth_config
+from src.auth_user.schemas import RegisterUser, JWTData, SendVerificationCodeRequest
 from src.auth_user import service
 
 from src.auth_user.jwt import parse_jwt_user_data
+from src.config import settings
 from src.constants import ROLES
+from src.rate_limit import RateLimiter, client_ip, parse_networks
+
+send_code_email_limiter = RateLimiter(
+    "send-code:email", auth_config.SEND_CODE_EMAIL_BURST, auth_config.SEND_CODE_EMAIL_REFILL_SECONDS)
+send_code_ip_limiter = RateLimiter(
+    "send-code:ip", auth_config.SEND_CODE_IP_BURST, auth_config.SEND_CODE_IP_REFILL_SECONDS)
+trusted_proxies = parse_networks(settings.ENV_TRUSTED_PROXIES)
 
 
 async def valid_user_create(user: RegisterUser) -> RegisterUser:
@@ -18,6 +27,19 @@ async def valid_user_create(user: RegisterUser) -> RegisterUser:
     return user
 
 
+async def limit_send_code_requests(
+    request: SendVerificationCodeRequest,
+    req: Request,
+) -> SendVerificationCodeRequest:
+    """Throttle verification code issuance per client IP and per email before any DB or mail work."""
+    ip_address = client_ip(req, trusted_proxies)
+
+    await send_code_ip_limiter.hit(ip_address)
+    await send_code_email_limiter.hit(request.email.lower())
+
+    return request
+
+
 async def valid_refresh_token(
     refresh_token: str = Cookie(..., alias="refreshToken"),
 ) -> dict[str, Any]:
@@ -28,7 +50,8 @@ async def valid_refresh_token(
     if not _is_valid_refresh_token(db_refresh_token):
         raise RefreshTokenNotValid()
 
-    return db_refresh_token
+    # Only the hash is persisted; hand the raw value back to the routes
+    return {**db_refresh_token, "refresh_token": refresh_token}
 
 
 def _is_valid_refresh_token(db_refresh_token: dict[str, Any]) -> bool:
@@ -9,6 +9,7 @@ from jwt import PyJWTError
 from src.auth_user.config import auth_config
 from src.auth_user.exceptions import AuthRequired, InvalidToken
 from src.auth_user.schemas import JWTData
+from src.monitoring.timing import timed
 
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl="/auth/users/tokens", auto_error=False)
@@ -37,8 +38,9 @@ async def parse_jwt_user_data_optional(
         return None
 
     try:
-        payload = jwt.decode(token, auth_config.ENV_JWT_SECRET, algorithms=[
-                             auth_config.ENV_JWT_ALG])
+        with timed("jwt"):
+            payload = jwt.decode(token, auth_config.ENV_JWT_SECRET, algorithms=[
+                                 auth_config.ENV_JWT_ALG])
     except PyJWTError as exc:
         raise InvalidToken() from exc
 
@@ -10,11 +10,10 @@ from src.auth_user.schemas import JWTData
 from src.constants import ROLES
 
 # Send email with verification code
-from src.mail.service import MailService
-from src.mail.config import MailConfig
+from src.mail.dependencies import get_mail_service
+from src.mail.exceptions import MailSendError
 
-mail_config = MailConfig.from_env()
-mail_service = MailService(mail_config)
+mail_service = get_mail_service()
 
 router = APIRouter()
 
@@ -51,7 +50,7 @@ async def sign_in_user(
 ) -> JSONResponse:
     user = await service.authenticate_user(sign_in_data)
 
-    refresh_token_value = await service.create_refresh_token(user["id"])
+    refresh_token_value = await service.create_refresh_token(id_user=user["id"])
     access_token = jwt.create_access_token(user=user)
 
     response.set_cookie(
@@ -128,8 +127,9 @@ async def refresh_tokens(
 
 @router.post("/passwordless/send-code", response_model=schemas.VerificationCodeResponse)
 async def send_verification_code(
-    request: schemas.SendVerificationCodeRequest,
-    req: Request
+    req: Request,
+    request: schemas.SendVerificationCodeRequest = Depends(
+        dependencies.limit_send_code_requests)
 ) -> JSONResponse:
     """Send a verification code for passwordless authentication."""
     try:
@@ -176,14 +176,15 @@ async def send_verification_code(
             # For registration, we might need the user's name - for now use email
             context["user_name"] = request.email.split("@")[0].title()
 
-        success = mail_service.send_template_email(
-            to_emails=[request.email],
-            subject=subject,
-            template_name=template_name,
-            context=context
-        )
-
-        if not success:
+        # Delivery happens in the mail outbox worker, the request only stores the message
+        try:
+            await mail_service.queue_template_email(
+                to_emails=[request.email],
+                subject=subject,
+                template_name=template_name,
+                context=context
+            )
+        except MailSendError:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to send verification code"
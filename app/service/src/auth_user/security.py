@@ -1,3 +1,5 @@
+import hashlib
+
 import bcrypt
 
 
@@ -10,3 +12,9 @@ def hash_password(password: str) -> bytes:
 def check_password(password: str, password_in_db: bytes) -> bool:
     password_bytes = bytes(password, "utf-8")
     return bcrypt.checkpw(password_bytes, password_in_db)
+
+
+def hash_refresh_token(refresh_token: str) -> str:
+    # Refresh tokens are long random strings, so a plain digest is enough to
+    # avoid keeping them in clear text while still allowing indexed lookups.
+    return hashlib.sha256(refresh_token.encode("utf-8")).hexdigest()
@@ -5,15 +5,16 @@ from datetime import datetime, timedelta
 from typing import Any, Optional
 
 from pydantic import UUID4
-from sqlalchemy import insert, select, join, update, delete, and_
+from sqlalchemy import insert, select, join, update, delete, and_, or_, case, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from src import utils
 from src.auth_user import jwt
 from src.auth_user.config import auth_config
 from src.auth_user.exceptions import InvalidCredentials
 from src.auth_user.schemas import RegisterUser, SignInUser, UpdateUser, PasswordlessRegisterUser
-from src.auth_user.security import check_password, hash_password
-from src.database import auth_user, auth_user_role, auth_refresh_token, auth_email_verification, execute, fetch_one
+from src.auth_user.security import check_password, hash_password, hash_refresh_token
+from src.database import auth_user, auth_user_role, auth_refresh_token, auth_email_verification, execute, fetch_all, fetch_one
 
 
 async def create_user(user: RegisterUser) -> dict[str, Any] | None:
@@ -130,7 +131,7 @@ async def create_refresh_token(
     insert_query = auth_refresh_token.insert().values(
         uuid=uuid.uuid4(),
         id_user=id_user,
-        refresh_token=refresh_token,
+        token_hash=hash_refresh_token(refresh_token),
         expires_at=datetime.now() + timedelta(seconds=auth_config.REFRESH_TOKEN_EXP),
     )
     await execute(insert_query)
@@ -140,7 +141,7 @@ async def create_refresh_token(
 
 async def get_refresh_token(refresh_token: str) -> dict[str, Any] | None:
     select_query = auth_refresh_token.select().where(
-        auth_refresh_token.c.refresh_token == refresh_token
+        auth_refresh_token.c.token_hash == hash_refresh_token(refresh_token)
     )
 
     return await fetch_one(select_query)
@@ -156,6 +157,24 @@ async def expire_refresh_token(refresh_token_uuid: UUID4) -> None:
     await execute(update_query)
 
 
+async def delete_expired_refresh_tokens(batch_size: int) -> int:
+    """Delete up to `batch_size` expired (or rotated) refresh tokens and return how many were removed."""
+    expired_tokens = (
+        select(auth_refresh_token.c.uuid)
+        .where(auth_refresh_token.c.expires_at < datetime.now())
+        .limit(batch_size)
+        .scalar_subquery()
+    )
+    delete_query = (
+        delete(auth_refresh_token)
+        .where(auth_refresh_token.c.uuid.in_(expired_tokens))
+        .returning(auth_refresh_token.c.uuid)
+    )
+
+    deleted = await fetch_all(delete_query)
+    return len(deleted)
+
+
 async def refresh_access_token(db_refresh_token: dict) -> tuple[str, str]:
     user = await get_user_by_id(db_refresh_token["id_user"])
     if user is None:
@@ -223,29 +242,36 @@ async def create_verification_code(
     Returns:
         Dict containing the verification code and expiry information
     """
-    # Clean up any existing codes for this email and type
-    delete_query = delete(auth_email_verification).where(
-        and_(
-            auth_email_verification.c.email == email,
-            auth_email_verification.c.code_type == code_type
-        )
-    )
-    await execute(delete_query)
-
     # Generate new code
     verification_code = generate_verification_code()
     expires_at = datetime.now() + timedelta(minutes=expiry_minutes)
-    
-    insert_query = insert(auth_email_verification).values(
+
+    # Replace any previous code for this email and type in a single statement
+    insert_query = pg_insert(auth_email_verification).values(
         email=email,
         verification_code=verification_code,
         code_type=code_type,
         expires_at=expires_at,
         ip_address=ip_address,
         user_agent=user_agent
-    ).returning(auth_email_verification)
+    )
+    upsert_query = insert_query.on_conflict_do_update(
+        index_elements=[
+            auth_email_verification.c.email,
+            auth_email_verification.c.code_type
+        ],
+        set_={
+            "verification_code": insert_query.excluded.verification_code,
+            "attempts": 0,
+            "expires_at": insert_query.excluded.expires_at,
+            "used_at": None,
+            "ip_address": insert_query.excluded.ip_address,
+            "user_agent": insert_query.excluded.user_agent,
+            "created_at": func.now(),
+        }
+    )
 
-    await fetch_one(insert_query)
+    await execute(upsert_query)
 
     return {
         "verification_code": verification_code,
@@ -255,36 +281,66 @@ async def create_verification_code(
 
 
 async def verify_code(email: str, code: str, code_type: str) -> dict[str, Any] | None:
-    select_query = select(auth_email_verification).where(
-        and_(
-            auth_email_verification.c.email == email,
-            auth_email_verification.c.code_type == code_type,
-            auth_email_verification.c.used_at.is_(None),
-            auth_email_verification.c.expires_at > datetime.now()
+    """
+    Check and consume a verification code in a single statement.
+
+    The live code row is updated only while it is unused, unexpired and below
+    `max_attempts`: a matching code sets `used_at`, a wrong one bumps `attempts`.
+    Returns the consumed record, or None if the code was wrong or not usable.
+    """
+    now = datetime.now()
+    code_matches = auth_email_verification.c.verification_code == code
+
+    update_query = (
+        update(auth_email_verification)
+        .where(
+            and_(
+                auth_email_verification.c.email == email,
+                auth_email_verification.c.code_type == code_type,
+                auth_email_verification.c.used_at.is_(None),
+                auth_email_verification.c.expires_at > now,
+                auth_email_verification.c.attempts < auth_email_verification.c.max_attempts
+            )
         )
+        .values(
+            attempts=case(
+                (code_matches, auth_email_verification.c.attempts),
+                else_=auth_email_verification.c.attempts + 1
+            ),
+            used_at=case((code_matches, now), else_=None)
+        )
+        .returning(auth_email_verification)
     )
 
-    verification_record = await fetch_one(select_query)
+    verification_record = await fetch_one(update_query)
 
-    if not verification_record:
+    if not verification_record or verification_record["used_at"] is None:
         return None
 
-    if verification_record['attempts'] >= verification_record['max_attempts']:
-        return None
+    return verification_record
 
-    if verification_record['verification_code'] != code:
-        update_query = update(auth_email_verification).where(
-            auth_email_verification.c.id == verification_record['id']
-        ).values(attempts=auth_email_verification.c.attempts + 1)
-        await execute(update_query)
-        return None
 
-    update_query = update(auth_email_verification).where(
-        auth_email_verification.c.id == verification_record['id']
-    ).values(used_at=datetime.now())
-    await execute(update_query)
+async def delete_stale_verification_codes(batch_size: int) -> int:
+    """Delete up to `batch_size` used or expired verification codes and return how many were removed."""
+    stale_codes = (
+        select(auth_email_verification.c.id)
+        .where(
+            or_(
+                auth_email_verification.c.used_at.is_not(None),
+                auth_email_verification.c.expires_at < datetime.now()
+            )
+        )
+        .limit(batch_size)
+        .scalar_subquery()
+    )
+    delete_query = (
+        delete(auth_email_verification)
+        .where(auth_email_verification.c.id.in_(stale_codes))
+        .returning(auth_email_verification.c.id)
+    )
 
-    return verification_record
+    deleted = await fetch_all(delete_query)
+    return len(deleted)
 
 
 async def create_passwordless_user(user: PasswordlessRegisterUser) -> dict[str, Any] | None:
@@ -0,0 +1,53 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+from src.auth_user import service
+from src.auth_user.config import auth_config
+
+
+async def _delete_in_batches(delete_batch: Callable[[int], Awaitable[int]], batch_size: int) -> int:
+    # Each batch runs in its own short transaction to keep locks and WAL bursts small
+    total_deleted = 0
+
+    while True:
+        deleted = await delete_batch(batch_size)
+        total_deleted += deleted
+
+        if deleted < batch_size:
+            return total_deleted
+
+        # Yield to request handlers between batches
+        await asyncio.sleep(0)
+
+
+async def sweep_expired_refresh_tokens() -> int:
+    """
+    Delete expired and rotated refresh tokens in bounded batches.
+
+    Rotated tokens are expired in place by `expire_refresh_token`, so a single
+    `expires_at` predicate covers both.
+    """
+    total_deleted = await _delete_in_batches(
+        service.delete_expired_refresh_tokens,
+        auth_config.REFRESH_TOKEN_SWEEP_BATCH_SIZE,
+    )
+
+    if total_deleted:
+        logger.info(f"Refresh token sweeper removed {total_deleted} tokens")
+
+    return total_deleted
+
+
+async def purge_stale_verification_codes() -> int:
+    """Delete used and expired passwordless verification codes in bounded batches."""
+    total_deleted = await _delete_in_batches(
+        service.delete_stale_verification_codes,
+        auth_config.VERIFICATION_CODE_PURGE_BATCH_SIZE,
+    )
+
+    if total_deleted:
+        logger.info(f"Verification code purge removed {total_deleted} codes")
+
+    return total_deleted
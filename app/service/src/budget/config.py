@@ -0,0 +1,34 @@
+from pydantic_settings import BaseSettings
+
+
+class BudgetConfig(BaseSettings):
+    # Worker processes parsing the statements of a multi-file import in parallel;
+    # 0 parses them one at a time in a thread instead
+    IMPORT_PARSE_WORKERS: int = 2
+
+    # Limits of one multi-file import (zip archive or list of files)
+    IMPORT_MAX_FILES: int = 50
+    IMPORT_MAX_UNCOMPRESSED_BYTES: int = 100 * 1024 * 1024
+
+    # Category reclassification job: entries per transaction, share of the time it may
+    # spend working (it sleeps the rest), and how often it checks for a new pass
+    RECLASSIFY_CHUNK_SIZE: int = 1000
+    RECLASSIFY_DUTY_CYCLE: float = 0.25
+    RECLASSIFY_INTERVAL: int = 60 * 60
+
+    # Entries per transaction when loading stored entries into the category memo
+    MEMO_BUILD_CHUNK_SIZE: int = 5000
+
+    # Rows per part of /budget/details streamed as NDJSON
+    DETAILS_STREAM_BATCH_SIZE: int = 500
+
+    # Transaction search: largest page, and matches counted before reporting "at least N"
+    SEARCH_MAX_LIMIT: int = 500
+    SEARCH_COUNT_LIMIT: int = 1000
+
+    # Time series: most buckets one request may ask for, and results kept per worker
+    TIMESERIES_MAX_BUCKETS: int = 800
+    TIMESERIES_CACHE_SIZE: int = 1024
+
+
+budget_config = BudgetConfig()
@@ -1,2 +1,24 @@
+# First key of the pg_advisory_xact_lock(namespace, user_id) taken while an import
+# dedupes and inserts; keeps these locks apart from any other advisory locks
+IMPORT_LOCK_NAMESPACE = 0x4D594E41  # "MYNA"
+
+# Bucket sizes of /budget/timeseries, as Postgres date_trunc fields
+TIMESERIES_GRANULARITIES = ("day", "week", "month")
+
+# Responses derived from the user's data: cached by the client, revalidated with
+# If-None-Match on every use (see `user_data_version`)
+DATA_CACHE_CONTROL = "private, no-cache"
+
+# Where a category_memo mapping comes from: the patterns at import, or the user.
+# Entries the user added by hand have the manual source too
+MEMO_SOURCE_CLASSIFIER = "classifier"
+MEMO_SOURCE_MANUAL = "manual"
+
+
 class ERRORCODE:
     DUMMY_EXAMPLE = "A file associated with this entry already exists. Please delete the associated file first."
+    INVALID_STATEMENT_ARCHIVE = "The archive could not be read. Please upload a valid .zip file of bank statements."
+    TOO_MANY_STATEMENTS = "Too many or too large statements in one import. Please split them into smaller uploads."
+    NO_STATEMENTS = "No statements to import. Send a .zip archive or a list of files."
+    TOO_MANY_BUCKETS = "The date range is too long for this granularity. Please pick a shorter range or a larger granularity."
+    INVALID_SEARCH_CURSOR = "The search cursor is not valid. Please start the search again from the first page."
@@ -9,3 +9,48 @@ class DummyExample(BadRequest):
     def __init__(self):
         super().__init__(detail=self.DETAIL)
         self.error_code = self.ERROR_CODE
+
+
+class InvalidStatementArchive(BadRequest):
+    DETAIL = ERRORCODE.INVALID_STATEMENT_ARCHIVE
+    ERROR_CODE = "INVALID_STATEMENT_ARCHIVE"
+
+    def __init__(self):
+        super().__init__(detail=self.DETAIL)
+        self.error_code = self.ERROR_CODE
+
+
+class TooManyStatements(BadRequest):
+    DETAIL = ERRORCODE.TOO_MANY_STATEMENTS
+    ERROR_CODE = "TOO_MANY_STATEMENTS"
+
+    def __init__(self):
+        super().__init__(detail=self.DETAIL)
+        self.error_code = self.ERROR_CODE
+
+
+class NoStatements(BadRequest):
+    DETAIL = ERRORCODE.NO_STATEMENTS
+    ERROR_CODE = "NO_STATEMENTS"
+
+    def __init__(self):
+        super().__init__(detail=self.DETAIL)
+        self.error_code = self.ERROR_CODE
+
+
+class InvalidSearchCursor(BadRequest):
+    DETAIL = ERRORCODE.INVALID_SEARCH_CURSOR
+    ERROR_CODE = "INVALID_SEARCH_CURSOR"
+
+    def __init__(self):
+        super().__init__(detail=self.DETAIL)
+        self.error_code = self.ERROR_CODE
+
+
+class TooManyBuckets(BadRequest):
+    DETAIL = ERRORCODE.TOO_MANY_BUCKETS
+    ERROR_CODE = "TOO_MANY_BUCKETS"
+
+    def __init__(self):
+        super().__init__(detail=self.DETAIL)
+        self.error_code = self.ERROR_CODE
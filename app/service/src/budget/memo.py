@@ -0,0 +1,205 @@
+"""
+Category memo.
+
+Most transactions repeat the same merchant month after month; only the dates,
+card suffixes and reference numbers in their descriptions change. The memo
+maps each normalized description of a user (see `normalize_description`) to
+its category, so an import resolves most entries with one bulk lookup and runs
+the patterns only on descriptions it hasn't seen before:
+
+- mappings learned from the patterns ("classifier") are used only while the
+  patterns are at the version they were learned with;
+- the user's corrections ("manual") are always used, and a learned mapping
+  never replaces one.
+
+Imports and corrections keep the memo up to date. Entries stored before it
+existed are loaded into it with
+
+    python -m src.budget.memo [--user-id 42]
+"""
+import argparse
+import asyncio
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from loguru import logger
+from sqlalchemy import func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.budget.config import budget_config
+from src.budget.constants import MEMO_SOURCE_CLASSIFIER, MEMO_SOURCE_MANUAL
+from src.budget.utils import description_hash, matcher_version
+from src.budget_transaction_category.service import load_category_catalogue
+from src.database import budget_entry, category_memo, engine, fetch_all
+
+
+class CategoryMemo:
+    """The memo of one user for the descriptions of an import, and the mappings the import learns"""
+
+    def __init__(self, known: Mapping[str, int] = {}):
+        self.known = dict(known)
+        self.learned: Dict[str, int] = {}
+
+    def get(self, key: Optional[str]) -> Optional[int]:
+        return self.known.get(key) if key else None
+
+    def learn(self, key: Optional[str], category_id: int) -> None:
+        if key and self.known.get(key) != category_id:
+            self.known[key] = category_id
+            self.learned[key] = category_id
+
+
+def _usable(version: str):
+    return or_(category_memo.c.source == MEMO_SOURCE_MANUAL, category_memo.c.matcher_version == version)
+
+
+async def load_category_memo(user_id: int, descriptions: Iterable[Optional[str]]) -> CategoryMemo:
+    """The user's mappings for these descriptions, in one query"""
+    keys = {description_hash(description) for description in descriptions} - {None}
+    if not keys:
+        return CategoryMemo()
+
+    rows = await fetch_all(
+        select(category_memo.c.description_hash, category_memo.c.category_id)
+        .where(
+            category_memo.c.user_id == user_id,
+            category_memo.c.description_hash.in_(keys),
+            _usable(matcher_version()),
+        )
+    )
+    return CategoryMemo({row["description_hash"]: row["category_id"] for row in rows})
+
+
+def _upsert():
+    stmt = pg_insert(category_memo)
+    return stmt.on_conflict_do_update(
+        index_elements=[category_memo.c.user_id, category_memo.c.description_hash],
+        set_={
+            "category_id": stmt.excluded.category_id,
+            "source": stmt.excluded.source,
+            "matcher_version": stmt.excluded.matcher_version,
+            "updated_at": func.now(),
+        },
+        # Corrections are only replaced by newer corrections
+        where=or_(stmt.excluded.source == MEMO_SOURCE_MANUAL, category_memo.c.source != MEMO_SOURCE_MANUAL),
+    )
+
+
+def _memo_row(user_id: int, key: str, category_id: int, source: str, version: str) -> Dict[str, Any]:
+    return {
+        "user_id": user_id,
+        "description_hash": key,
+        "category_id": category_id,
+        "source": source,
+        "matcher_version": version if source == MEMO_SOURCE_CLASSIFIER else None,
+    }
+
+
+async def save_category_memo(conn: AsyncConnection, user_id: int, memo: CategoryMemo) -> None:
+    """Store the mappings the import learned, inside its transaction"""
+    if memo.learned:
+        version = matcher_version()
+        await conn.execute(_upsert(), [
+            _memo_row(user_id, key, category_id, MEMO_SOURCE_CLASSIFIER, version)
+            for key, category_id in memo.learned.items()
+        ])
+        memo.learned.clear()
+
+
+async def record_correction(conn: AsyncConnection, user_id: int, description: Optional[str], category_id: int) -> None:
+    """Remember the category the user chose for this description"""
+    key = description_hash(description)
+    if key:
+        await conn.execute(_upsert(), [_memo_row(user_id, key, category_id, MEMO_SOURCE_MANUAL, None)])
+
+
+async def load_corrections(conn: AsyncConnection, rows: Iterable[Any]) -> Dict[tuple[int, str], int]:
+    """Corrections for the descriptions of these entries (user_id, description), by (user_id, hash)"""
+    keys: Dict[int, set[str]] = {}
+    for row in rows:
+        key = description_hash(row.description)
+        if key:
+            keys.setdefault(row.user_id, set()).add(key)
+
+    corrections = {}
+    for user_id, user_keys in keys.items():
+        result = await conn.execute(
+            select(category_memo.c.description_hash, category_memo.c.category_id).where(
+                category_memo.c.user_id == user_id,
+                category_memo.c.description_hash.in_(user_keys),
+                category_memo.c.source == MEMO_SOURCE_MANUAL,
+            )
+        )
+        corrections.update({(user_id, row.description_hash): row.category_id for row in result})
+    return corrections
+
+
+def memo_rows(entries: Iterable[Any], version: str) -> List[Dict[str, Any]]:
+    """
+    Memo rows of categorized entries (id order), the latest entry of a description
+    winning; manual entries count as corrections and win over imported ones
+    """
+    rows: Dict[tuple[int, str], Dict[str, Any]] = {}
+    for entry in entries:
+        key = description_hash(entry.description)
+        if not key:
+            continue
+        source = MEMO_SOURCE_MANUAL if entry.source == MEMO_SOURCE_MANUAL else MEMO_SOURCE_CLASSIFIER
+        current = rows.get((entry.user_id, key))
+        if current and current["source"] == MEMO_SOURCE_MANUAL and source != MEMO_SOURCE_MANUAL:
+            continue
+        rows[(entry.user_id, key)] = _memo_row(entry.user_id, key, entry.category_id, source, version)
+    return list(rows.values())
+
+
+async def build_category_memo(user_id: Optional[int] = None) -> int:
+    """Load the categorized entries of one user (or everybody's) into the memo; returns the mappings written"""
+    version = matcher_version()
+    last_entry_id, written = 0, 0
+
+    while True:
+        conditions = [budget_entry.c.id > last_entry_id, budget_entry.c.category_id.is_not(None)]
+        if user_id is not None:
+            conditions.append(budget_entry.c.user_id == user_id)
+
+        async with engine.begin() as conn:
+            entries = (await conn.execute(
+                select(
+                    budget_entry.c.id,
+                    budget_entry.c.user_id,
+                    budget_entry.c.description,
+                    budget_entry.c.source,
+                    budget_entry.c.category_id,
+                )
+                .where(*conditions)
+                .order_by(budget_entry.c.id)
+                .limit(budget_config.MEMO_BUILD_CHUNK_SIZE)
+            )).all()
+            if not entries:
+                break
+
+            rows = memo_rows(entries, version)
+            if rows:
+                await conn.execute(_upsert(), rows)
+
+        written += len(rows)
+        last_entry_id = entries[-1].id
+
+    logger.info(f"Category memo: {written} mappings written")
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user-id", type=int, help="only this user's entries (default: everybody's)")
+    args = parser.parse_args()
+
+    async def run() -> None:
+        await load_category_catalogue()
+        await build_category_memo(args.user_id)
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
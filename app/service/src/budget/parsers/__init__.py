@@ -0,0 +1,55 @@
+"""
+Bank statement parsers.
+
+Each supported bank is a `BankParser` in its own module, registered with
+`@register`; supporting a new bank means adding a module and importing it
+below. Parsers declare the file extensions they accept and a cheap content
+sniffer, which lets imports detect the bank from the first few KB of a file.
+
+This package pulls in pandas (and pdfplumber for PDF statements), so it is
+imported on first use through `src.budget.service.load_statement_parsers` or
+by the pre-warm step at startup, never at application import time.
+"""
+import time
+from typing import List, Optional, Tuple
+
+from src.budget.parsers.base import BankParser, StatementSample, parse_amounts
+from src.budget.parsers.registry import detect_bank, detect_sample, get_parser, register, registered_parsers
+from src.budget.schemas import BudgetEntryCreate
+
+# Built-in banks, registered on import
+from src.budget.parsers import santander_rio, mercado_pago, icbc, bbva, comm_bank, revolut  # noqa: E402,F401
+
+
+def parse_bank_statement(bank_name: str, file_bytes: bytes, file_id: int, currency: str) -> List[BudgetEntryCreate]:
+    """Read a decoded bank statement and turn it into budget entries with the bank's parser"""
+    parser = get_parser(bank_name)
+    if parser is None:
+        return []
+    return parser.parse_file(file_bytes, file_id, bank_name, currency)
+
+
+def parse_statement_in_worker(
+    bank_name: str,
+    file_bytes: bytes,
+    file_id: Optional[int],
+    currency: str
+) -> Tuple[List[BudgetEntryCreate], float]:
+    """`parse_bank_statement` for worker processes; also returns the seconds it took, to be recorded by the caller"""
+    start = time.perf_counter()
+    entries = parse_bank_statement(bank_name, file_bytes, file_id, currency)
+    return entries, time.perf_counter() - start
+
+
+__all__ = [
+    "BankParser",
+    "StatementSample",
+    "detect_bank",
+    "detect_sample",
+    "get_parser",
+    "parse_amounts",
+    "parse_bank_statement",
+    "parse_statement_in_worker",
+    "register",
+    "registered_parsers",
+]
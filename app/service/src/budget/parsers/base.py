@@ -0,0 +1,203 @@
+"""
+Interface every bank statement parser implements, and helpers they share.
+"""
+import base64
+import binascii
+import csv
+import io
+from functools import cached_property
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import openpyxl
+import pandas as pd
+
+from src.budget.schemas import BudgetEntryCreate
+from src.money import parse_decimal
+
+# How much of a file sniffers get to look at
+SNIFF_BYTES = 8 * 1024
+# Base64 characters encoding at least SNIFF_BYTES (a multiple of 4, so the prefix decodes on its own)
+SNIFF_BASE64_CHARS = -(-SNIFF_BYTES // 3) * 4
+SNIFF_ROWS = 20
+
+# Rows handed to `BankParser.parse` at a time: bounds import memory for streaming readers
+DEFAULT_BATCH_ROWS = 5_000
+
+PDF_MAGIC = b"%PDF"
+XLSX_MAGIC = b"PK\x03\x04"
+XLS_MAGIC = b"\xd0\xcf\x11\xe0"
+
+
+class StatementSample:
+    """What sniffers see of an uploaded statement: its first bytes, and for spreadsheets its first rows."""
+
+    def __init__(self, file_bytes: bytes, file_name: Optional[str] = None):
+        self._load_file: Callable[[], bytes] = lambda: file_bytes
+        self.file_name = file_name
+        self.head = file_bytes[:SNIFF_BYTES]
+
+    @classmethod
+    def from_base64(cls, file_content: str, file_name: Optional[str] = None) -> "StatementSample":
+        """
+        Sample of a Base64 encoded upload, decoding only the characters behind `head`.
+        The whole file is decoded only if it turns out to be a spreadsheet.
+        """
+        try:
+            head = base64.b64decode(file_content[:SNIFF_BASE64_CHARS])
+        except (binascii.Error, ValueError):
+            # Line breaks or padding inside the prefix, decode it all
+            head = base64.b64decode(file_content)
+        sample = cls(head, file_name)
+        sample._load_file = lambda: base64.b64decode(file_content)
+        return sample
+
+    @property
+    def is_pdf(self) -> bool:
+        return self.head.startswith(PDF_MAGIC)
+
+    @property
+    def is_spreadsheet(self) -> bool:
+        return self.head.startswith(XLSX_MAGIC) or self.head.startswith(XLS_MAGIC)
+
+    @cached_property
+    def lines(self) -> List[str]:
+        """Complete text lines of the head (the last one may be cut off, so it is dropped)."""
+        if self.is_pdf or self.is_spreadsheet:
+            return []
+        text = self.head.decode("utf-8-sig", errors="replace")
+        lines = text.splitlines()
+        if len(self.head) == SNIFF_BYTES and lines:
+            lines = lines[:-1]
+        return [line for line in lines if line.strip()]
+
+    @cached_property
+    def rows(self) -> List[List[str]]:
+        """First rows of the first sheet as text, for spreadsheets (zip/OLE content can't be peeked at otherwise)."""
+        if not self.is_spreadsheet:
+            return []
+        try:
+            if self.head.startswith(XLSX_MAGIC):
+                rows = self._xlsx_rows()
+            else:
+                df = pd.read_excel(io.BytesIO(self._load_file()), header=None, nrows=SNIFF_ROWS, dtype=str)
+                rows = list(df.itertuples(index=False))
+        except Exception:
+            return []
+        return [[cell.strip() for cell in row if isinstance(cell, str) and cell.strip()]
+                for row in rows]
+
+    def _xlsx_rows(self) -> List[List[Optional[str]]]:
+        # Read-only mode streams the sheet XML, stopping after SNIFF_ROWS rows
+        workbook = openpyxl.load_workbook(io.BytesIO(self._load_file()), read_only=True, data_only=True)
+        try:
+            sheet = workbook.worksheets[0]
+            return [[None if cell is None else str(cell) for cell in row]
+                    for row in sheet.iter_rows(max_row=SNIFF_ROWS, values_only=True)]
+        finally:
+            workbook.close()
+
+
+class BankParser:
+    """
+    A bank's statement format.
+
+    `read` loads a file into a DataFrame holding only candidate transaction rows
+    (preambles and header rows removed), `batches` yields it in slices and
+    `parse` turns a slice into budget entries, so rows of one batch never depend
+    on another. `parse` takes whatever `batches` yields: DataFrame slices here,
+    lists of rows for `CsvBankParser`. Register subclasses with
+    `src.budget.parsers.register`.
+    """
+    # Bank name as accepted by /budget/import-file (matched case-insensitively)
+    name: str = ""
+    extensions: Sequence[str] = ()
+    batch_rows = DEFAULT_BATCH_ROWS
+
+    def sniff(self, sample: StatementSample) -> bool:
+        """Whether the file looks like this bank's statement. Must be cheap: detection runs every sniffer."""
+        return False
+
+    def accepts(self, file_name: str) -> bool:
+        return any(file_name.lower().endswith(ext) for ext in self.extensions)
+
+    def read(self, file_bytes: bytes) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def batches(self, file_bytes: bytes) -> Iterator[pd.DataFrame]:
+        df = self.read(file_bytes)
+        for start in range(0, len(df), self.batch_rows):
+            yield df.iloc[start:start + self.batch_rows]
+
+    def parse(self, batch: pd.DataFrame, file_id: int, source: str, currency: str) -> List[BudgetEntryCreate]:
+        raise NotImplementedError
+
+    def parse_file(self, file_bytes: bytes, file_id: int, source: str, currency: str) -> List[BudgetEntryCreate]:
+        entries: List[BudgetEntryCreate] = []
+        for batch in self.batches(file_bytes):
+            entries.extend(self.parse(batch, file_id, source, currency))
+        return entries
+
+
+class CsvBankParser(BankParser):
+    """
+    A CSV export read with the stdlib csv module straight from the upload, one
+    batch of rows at a time, so no DataFrame of the whole file is ever built.
+
+    Batches are lists of dicts keyed by `columns` (positional names) or, when
+    None, by the file's header row. Blank lines are skipped.
+    """
+    columns: Optional[Sequence[str]] = None
+    has_header = True
+    encoding = "utf-8-sig"
+
+    def rows(self, file_bytes: bytes) -> Iterator[Dict[str, str]]:
+        text = io.TextIOWrapper(io.BytesIO(file_bytes), encoding=self.encoding, newline="")
+        reader = csv.reader(text)
+        header = next(reader, None) if self.has_header else None
+        names = list(self.columns or header or [])
+
+        for record in reader:
+            if any(field.strip() for field in record):
+                yield dict(zip(names, record))
+
+    def batches(self, file_bytes: bytes) -> Iterator[List[Dict[str, str]]]:
+        batch: List[Dict[str, str]] = []
+        for row in self.rows(file_bytes):
+            batch.append(row)
+            if len(batch) >= self.batch_rows:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def read(self, file_bytes: bytes) -> pd.DataFrame:
+        # Not used for imports; handy when inspecting a file
+        return pd.DataFrame(list(self.rows(file_bytes)))
+
+
+def parse_amounts(values: pd.Series, decimal_comma: bool = False) -> pd.Series:
+    """
+    Parse a whole column of amounts to Decimal (None where a cell isn't a number).
+
+    Text columns are cleaned with vectorized string operations first; with
+    `decimal_comma` they use the Argentine "$ 1.234,56" notation. Numeric
+    columns (spreadsheet cells) are converted as they are.
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        # str() of a float is its shortest repr: 0.1 becomes Decimal("0.1")
+        text = values.astype(str)
+    else:
+        text = values.astype(str).str.replace("$", "", regex=False).str.strip()
+        if decimal_comma:
+            text = text.str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+    return pd.Series([parse_decimal(value) for value in text.tolist()], index=values.index, dtype=object)
+
+
+def empty_amounts(df: pd.DataFrame, value: Any = None) -> pd.Series:
+    return pd.Series([value] * len(df), index=df.index, dtype=object)
+
+
+def normalize_header(cells: Sequence[Any]) -> List[str]:
+    """Lowercased, accent-free header cells, for sniffers comparing column names."""
+    table = str.maketrans("áéíóúÁÉÍÓÚ", "aeiouAEIOU")
+    return [str(cell).strip().strip('"').translate(table).lower() for cell in cells]
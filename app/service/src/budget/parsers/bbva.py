@@ -0,0 +1,71 @@
+"""BBVA account statement (.xls, header on line 3)."""
+import io
+from typing import List
+
+import pandas as pd
+from loguru import logger
+
+from src.budget.parsers.base import BankParser, StatementSample, normalize_header, parse_amounts
+from src.budget.parsers.registry import register
+from src.budget.schemas import BudgetEntryCreate
+
+
+@register
+class BbvaParser(BankParser):
+    name = "bbva"
+    extensions = (".xls",)
+
+    def sniff(self, sample: StatementSample) -> bool:
+        return any(
+            normalize_header(row)[:2] == ["fecha", "concepto"] and "importe" in normalize_header(row)
+            for row in sample.rows[:5]
+        )
+
+    def read(self, file_bytes: bytes) -> pd.DataFrame:
+        df = pd.read_excel(io.BytesIO(file_bytes), header=2)
+        df.columns = ["Fecha", "Concepto", "Extra", "Importe", "Saldo"]
+        return df.dropna(how="all")
+
+    def parse(self, batch: pd.DataFrame, file_id: int, source: str, currency: str) -> List[BudgetEntryCreate]:
+        entries: List[BudgetEntryCreate] = []
+        try:
+            # Importe uses a comma as decimal separator
+            amounts = parse_amounts(batch["Importe"], decimal_comma=True)
+            for (_, row), amount in zip(batch.iterrows(), amounts):
+                try:
+                    # Parse date (format: d/m/Y)
+                    date_val = pd.to_datetime(
+                        str(row["Fecha"]).strip(), format="%d/%m/%Y", errors="coerce")
+                    if pd.isna(date_val):
+                        continue
+                    # Description: Concepto + Extra (if present)
+                    concepto = str(row["Concepto"]).strip(
+                    ) if pd.notna(row["Concepto"]) else ""
+                    extra = str(row["Extra"]).strip() if pd.notna(
+                        row["Extra"]) else ""
+                    description = f"{concepto} {extra}".strip()
+                    if amount is None or amount == 0:
+                        continue
+                    # Determine type
+                    entry_type = "income" if amount > 0 else "outcome"
+                    # Reference ID: use bank, description, date
+                    reference_id = f"{source}_{description[:30]}_{date_val.strftime('%Y%m%d')}"
+                    # Create entry
+                    entries.append(BudgetEntryCreate(
+                        reference_id=reference_id,
+                        date=date_val,
+                        amount=abs(amount),
+                        currency=currency,
+                        source=source,
+                        description=description,
+                        type=entry_type,
+                        file_id=file_id,
+                        category_id=None  # Will be set in process_bank_statement
+                    ))
+                except Exception as ex:
+                    logger.error(f"Error processing BBVA statement row: {ex}")
+                    continue
+        except Exception as ex:
+            logger.error(f"Error processing BBVA statement: {ex}")
+            return []
+        return entries
@@ -0,0 +1,68 @@
+"""Commonwealth Bank transactions export (.csv without a header row)."""
+import csv
+import re
+from datetime import datetime
+from typing import Dict, List
+
+from loguru import logger
+
+from src.budget.parsers.base import CsvBankParser, StatementSample
+from src.budget.parsers.registry import register
+from src.budget.schemas import BudgetEntryCreate
+from src.money import parse_decimal
+
+DATE_PATTERN = re.compile(r"^\d{2}/\d{2}/\d{4}$")
+AMOUNT_PATTERN = re.compile(r"^[+-]?\d+(\.\d+)?$")
+
+
+@register
+class CommBankParser(CsvBankParser):
+    name = "comm_bank"
+    extensions = (".csv",)
+    columns = ["Date", "Amount", "Description", "Balance"]
+    has_header = False
+
+    def sniff(self, sample: StatementSample) -> bool:
+        # Date, Amount, Description, Balance
+        rows = list(csv.reader(sample.lines[:1]))
+        return bool(
+            rows and len(rows[0]) == 4
+            and DATE_PATTERN.match(rows[0][0].strip())
+            and AMOUNT_PATTERN.match(rows[0][1].strip())
+        )
+
+    def parse(self, batch: List[Dict[str, str]], file_id: int, source: str, currency: str) -> List[BudgetEntryCreate]:
+        """Process CommBank CSV rows into BudgetEntryCreate list"""
+        entries: List[BudgetEntryCreate] = []
+        for row in batch:
+            try:
+                # Parse date (format: d/m/Y)
+                try:
+                    date_val = datetime.strptime(row["Date"].strip(), "%d/%m/%Y").date()
+                except ValueError:
+                    continue
+                amount = parse_decimal(row["Amount"])
+                if amount is None or amount == 0:
+                    continue
+                # Determine type
+                entry_type = "income" if amount > 0 else "outcome"
+                # Description
+                description = row["Description"].strip() or "CommBank Transaction"
+                # Reference ID: can be None or generated
+                reference_id = f"{source}_{description[:30]}_{date_val.strftime('%Y%m%d')}"
+                # Create entry
+                entries.append(BudgetEntryCreate(
+                    reference_id=reference_id,
+                    date=date_val,
+                    amount=abs(amount),
+                    currency=currency,
+                    source=source,
+                    description=description,
+                    type=entry_type,
+                    file_id=file_id,
+                    category_id=None  # Will be set in process_bank_statement
+                ))
+            except Exception as ex:
+                logger.error(f"Error processing CommBank statement row: {ex}")
+                continue
+        return entries
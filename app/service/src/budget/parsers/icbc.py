@@ -0,0 +1,70 @@
+"""ICBC account statement (.csv)."""
+import csv
+import re
+from datetime import datetime
+from typing import Dict, List
+
+from src.budget.parsers.base import CsvBankParser, StatementSample, normalize_header
+from src.budget.parsers.registry import register
+from src.budget.schemas import BudgetEntryCreate
+from src.money import ZERO, parse_decimal
+
+COLUMNS = ["Fecha", "Descripcion", "Debito", "Credito", "Referencia"]
+DATE_PATTERN = re.compile(r"^\d{2}/\d{2}/\d{2}$")
+
+
+@register
+class IcbcParser(CsvBankParser):
+    name = "ICBC"
+    extensions = (".csv",)
+    # Renamed by position for clarity, the export's own titles vary
+    columns = COLUMNS
+
+    def sniff(self, sample: StatementSample) -> bool:
+        rows = list(csv.reader(sample.lines[:2]))
+        if not rows or len(rows[0]) != len(COLUMNS):
+            return False
+        header = normalize_header(rows[0])
+        if header[:4] == ["fecha", "descripcion", "debito", "credito"]:
+            return True
+        # Exports without column titles start with a mm/dd/yy dated movement
+        return bool(DATE_PATTERN.match(rows[0][0].strip()))
+
+    def parse(self, batch: List[Dict[str, str]], file_id: int, source: str, currency: str) -> List[BudgetEntryCreate]:
+        """Process ICBC bank statement CSV rows into BudgetEntryCreate list"""
+        entries: List[BudgetEntryCreate] = []
+
+        for row in batch:
+            try:
+                reference_id = row["Referencia"].replace(
+                    ".", "").strip() or None
+                # Parse date
+                date_val = datetime.strptime(row["Fecha"].strip(), "%m/%d/%y").date()
+                description = row["Descripcion"].strip(
+                ) or "Transacción sin descripción"
+                credito = parse_decimal(row["Credito"]) or ZERO
+                debito = parse_decimal(row["Debito"]) or ZERO
+
+                # Determine amount and type
+                if credito > 0:
+                    amount = credito
+                    entry_type = "income"
+                else:
+                    amount = debito
+                    entry_type = "outcome"
+
+                entries.append(BudgetEntryCreate(
+                    reference_id=reference_id or f"{source}_{description[:30]}_{date_val.strftime('%Y%m%d')}",
+                    date=date_val,
+                    amount=abs(amount),
+                    currency=currency,
+                    source=source,
+                    description=description,
+                    type=entry_type,
+                    file_id=file_id,
+                    category_id=None  # Will be set in process_bank_statement
+                ))
+            except Exception:
+                continue
+
+        return entries
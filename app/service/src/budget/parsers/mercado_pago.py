@@ -0,0 +1,185 @@
+"""Mercado Pago account statement (.pdf)."""
+import io
+import re
+from typing import List
+
+import pandas as pd
+from loguru import logger
+
+from src.budget.parsers.base import BankParser, StatementSample, empty_amounts, parse_amounts
+from src.budget.parsers.registry import register
+from src.budget.schemas import BudgetEntryCreate
+
+
+def extract_pdf_to_dataframe(file_bytes: bytes) -> pd.DataFrame:
+    """
+    Extract data from a PDF file and return it as a DataFrame.
+    """
+    import pdfplumber
+
+    # Leer el texto completo del PDF
+    with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
+        full_text = "\n".join(page.extract_text() or "" for page in pdf.pages)
+
+    # Tomar solo el bloque del detalle
+    if "DETALLE DE MOVIMIENTOS" in full_text:
+        full_text = full_text.split("DETALLE DE MOVIMIENTOS")[1]
+
+    # Regex que captura: fecha, descripción, ID, valor y saldo
+    pattern = re.compile(
+        r"(\d{2}-\d{2}-\d{4})\s+"      # Fecha
+        r"(.*?)\s+"                    # Descripción
+        r"(\d+)\s+"                    # ID operación
+        r"\$\s+([-\d\.,]+)\s+"         # Valor
+        r"\$\s+([-\d\.,]+)"            # Saldo
+    )
+
+    matches = pattern.findall(full_text)
+
+    if not matches:
+        return pd.DataFrame()  # Vacío si no encontró nada
+
+    # Armar el DataFrame
+    df = pd.DataFrame(
+        matches,
+        columns=["Fecha", "Descripcion", "ID", "Valor", "Saldo"]
+    )
+
+    return df
+
+
+@register
+class MercadoPagoParser(BankParser):
+    name = "mercado_pago"
+    extensions = (".pdf",)
+
+    def sniff(self, sample: StatementSample) -> bool:
+        # The only bank exporting PDF statements
+        return sample.is_pdf
+
+    def read(self, file_bytes: bytes) -> pd.DataFrame:
+        # MercadoPago statements typically have columns: Fecha, Descripción, ID de la operación, Valor, Saldo
+        # Clean up the dataframe
+        df = extract_pdf_to_dataframe(file_bytes).dropna(how="all")
+
+        # Find the header row that contains "Fecha" and "Descripción"
+        header_row_idx = None
+        for idx, row in df.iterrows():
+            if any("Fecha" in str(cell) and "Descripción" in str(cell) for cell in row if pd.notna(cell)):
+                header_row_idx = idx
+                break
+
+        if header_row_idx is None:
+            # Try to find individual column headers
+            for idx, row in df.iterrows():
+                row_str = ' '.join([str(cell)
+                                   for cell in row if pd.notna(cell)])
+                if "Fecha" in row_str and "Descripción" in row_str:
+                    header_row_idx = idx
+                    break
+
+        if header_row_idx is not None:
+            # Set the header and clean the dataframe
+            df = df.iloc[header_row_idx + 1:].copy()
+
+        # Expected columns: Fecha, Descripción, ID de la operación, Valor, Saldo
+        # Rename columns to standard names
+        expected_columns = ["Fecha", "Descripcion",
+                            "ID_operacion", "Valor", "Saldo"]
+
+        # If we have the right number of columns, rename them
+        if len(df.columns) >= 4:
+            # Take only the first 5 columns or as many as we have
+            cols_to_use = min(5, len(df.columns))
+            df = df.iloc[:, :cols_to_use]
+
+            # Rename columns
+            column_names = expected_columns[:cols_to_use]
+            df.columns = column_names
+        else:
+            # If columns don't match expected format, try to identify them
+            df.columns = [f"Col_{i}" for i in range(len(df.columns))]
+
+        # Remove empty rows
+        return df.dropna(how="all")
+
+    def parse(self, batch: pd.DataFrame, file_id: int, source: str, currency: str) -> List[BudgetEntryCreate]:
+        entries: List[BudgetEntryCreate] = []
+
+        try:
+            # Amounts are in the "Valor" column (4th column, index 3)
+            if len(batch.columns) > 3:
+                amounts = parse_amounts(batch.iloc[:, 3], decimal_comma=True)
+            else:
+                amounts = empty_amounts(batch)
+
+            # Process each row
+            for (_, row), amount in zip(batch.iterrows(), amounts):
+                try:
+                    # Skip rows that don't contain transaction data
+                    if pd.isna(row.iloc[0]) or str(row.iloc[0]).strip() == "":
+                        continue
+
+                    # Extract date (first column)
+                    date_str = str(row.iloc[0]).strip()
+
+                    # Skip if it's not a date-like string
+                    if not any(char.isdigit() for char in date_str):
+                        continue
+
+                    # Parse date - MercadoPago uses DD-MM-YYYY format
+                    try:
+                        date_raw = pd.to_datetime(
+                            date_str, format="%d-%m-%Y", errors="coerce")
+                        if pd.isna(date_raw):
+                            date_raw = pd.to_datetime(
+                                date_str, dayfirst=True, errors="coerce")
+                    except Exception as ex:
+                        logger.error(f"Error parsing date: {date_str} - {ex}")
+                        continue
+
+                    if pd.isna(date_raw):
+                        continue
+
+                    # Extract reference ID (third column)
+                    reference_id = str(row.iloc[2]).strip() if len(row) > 2 and pd.notna(
+                        row.iloc[2]) else None
+
+                    # Extract description (second column)
+                    description = str(row.iloc[1]).strip() if len(row) > 1 and pd.notna(
+                        row.iloc[1]) else "Transacción MercadoPago"
+
+                    if amount is None:
+                        if len(row) > 3:
+                            logger.error(f"Error parsing amount: {row.iloc[3]}")
+                        continue
+
+                    if amount == 0:
+                        continue
+
+                    # Determine entry type
+                    entry_type = "income" if amount > 0 else "outcome"
+
+                    # Create entry
+                    entries.append(BudgetEntryCreate(
+                        reference_id=reference_id or f"{source}_{description[:30]}_{date_raw.strftime('%Y%m%d')}",
+                        date=date_raw,
+                        amount=abs(amount),
+                        currency=currency,
+                        source=source,
+                        description=description,
+                        type=entry_type,
+                        file_id=file_id,
+                        category_id=None  # Will be set in process_bank_statement
+                    ))
+
+                except Exception as e:
+                    # Skip problematic rows
+                    logger.error(f"Error processing MercadoPago row: {e}")
+                    continue
+
+        except Exception as e:
+            logger.error(f"Error processing MercadoPago statement: {e}")
+            return []
+
+        return entries
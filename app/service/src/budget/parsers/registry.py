@@ -0,0 +1,46 @@
+"""
+Registered bank statement parsers, lookup by name and detection by content.
+"""
+from typing import Dict, List, Optional
+
+from src.budget.parsers.base import BankParser, StatementSample
+
+_parsers: Dict[str, BankParser] = {}
+
+
+def register(parser_class: type[BankParser]) -> type[BankParser]:
+    """Class decorator adding a parser to the registry under its (case-insensitive) name."""
+    parser = parser_class()
+    key = parser.name.lower()
+    if key in _parsers:
+        raise ValueError(f"A parser for {parser.name} is already registered")
+    _parsers[key] = parser
+    return parser_class
+
+
+def get_parser(bank_name: str) -> Optional[BankParser]:
+    return _parsers.get(bank_name.lower())
+
+
+def registered_parsers() -> List[BankParser]:
+    return list(_parsers.values())
+
+
+def detect_bank(file_bytes: bytes, file_name: Optional[str] = None) -> Optional[BankParser]:
+    """
+    The parser whose sniffer recognizes the file, or None.
+
+    Only parsers accepting the file's extension are asked when a name is given.
+    None is returned as well when several match, rather than guessing.
+    """
+    return detect_sample(StatementSample(file_bytes, file_name))
+
+
+def detect_sample(sample: StatementSample) -> Optional[BankParser]:
+    """`detect_bank` for a sample built by the caller, e.g. with `StatementSample.from_base64`"""
+    candidates = [
+        parser for parser in _parsers.values()
+        if not sample.file_name or parser.accepts(sample.file_name)
+    ]
+    matches = [parser for parser in candidates if parser.sniff(sample)]
+    return matches[0] if len(matches) == 1 else None
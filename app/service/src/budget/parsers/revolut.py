@@ -0,0 +1,72 @@
+"""Revolut account statement (.csv, Spanish locale column names)."""
+import csv
+from datetime import datetime
+from typing import Dict, List
+
+import pandas as pd
+
+from src.budget.parsers.base import CsvBankParser, StatementSample, normalize_header
+from src.budget.parsers.registry import register
+from src.budget.schemas import BudgetEntryCreate
+from src.money import ZERO, parse_decimal
+
+
+def _parse_started_at(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        # Other layouts are rare; let pandas work them out
+        return pd.to_datetime(value).to_pydatetime()
+
+
+@register
+class RevolutParser(CsvBankParser):
+    name = "revolut"
+    extensions = (".csv",)
+
+    def sniff(self, sample: StatementSample) -> bool:
+        rows = list(csv.reader(sample.lines[:1]))
+        header = normalize_header(rows[0]) if rows else []
+        return {"fecha de inicio", "importe", "divisa", "estado"}.issubset(header)
+
+    def parse(self, batch: List[Dict[str, str]], file_id: int, source: str, currency: str) -> List[BudgetEntryCreate]:
+        entries: List[BudgetEntryCreate] = []
+
+        for row in batch:
+            try:
+                if row.get("Estado", "").strip().upper() != "COMPLETADO":
+                    continue
+
+                divisa = row.get("Divisa", "").strip()
+                if divisa != currency:
+                    continue
+
+                importe = parse_decimal(row.get("Importe", ""))
+                if importe is None or importe == 0:
+                    continue
+
+                comision = parse_decimal(row.get("Comisión", "")) or ZERO
+
+                date_raw = _parse_started_at(row.get("Fecha de inicio", "").strip())
+
+                description = row.get("Descripción", "").strip() or "Revolut transaction"
+                reference_id = f"revolut_{date_raw.strftime('%Y%m%d%H%M%S')}_{description[:21]}"
+
+                entry_type = "income" if importe > 0 else "outcome"
+                amount = abs(importe) + comision
+
+                entries.append(BudgetEntryCreate(
+                    reference_id=reference_id,
+                    date=date_raw.date(),
+                    amount=amount,
+                    currency=currency,
+                    source=source,
+                    description=description,
+                    type=entry_type,
+                    file_id=file_id,
+                    category_id=None
+                ))
+            except Exception:
+                continue
+
+        return entries
@@ -0,0 +1,80 @@
+"""Santander Río account statement (.xlsx)."""
+import io
+from typing import List
+
+import pandas as pd
+from loguru import logger
+
+from src.budget.parsers.base import BankParser, StatementSample, normalize_header, parse_amounts
+from src.budget.parsers.registry import register
+from src.budget.schemas import BudgetEntryCreate
+
+
+@register
+class SantanderRioParser(BankParser):
+    name = "santander_rio"
+    extensions = (".xlsx",)
+
+    def sniff(self, sample: StatementSample) -> bool:
+        for row in sample.rows:
+            cells = normalize_header(row)
+            if any("santander" in cell for cell in cells):
+                return True
+            if "caja de ahorro" in cells and "cuenta corriente" in cells:
+                return True
+        return False
+
+    def read(self, file_bytes: bytes) -> pd.DataFrame:
+        df = pd.read_excel(io.BytesIO(file_bytes))
+        df = df.iloc[12:].copy()
+
+        # Rename all 8 columns properly
+        df.columns = [
+            "Index",
+            "Fecha",
+            "Sucursal_origen",
+            "Descripcion",
+            "Referencia",
+            "Caja_de_Ahorro",
+            "Cuenta_Corriente",
+            "Saldo"
+        ]
+        df = df.drop(columns=["Index"])  # drop the blank index column
+        return df.dropna(how="all")
+
+    def parse(self, batch: pd.DataFrame, file_id: int, source: str, currency: str) -> List[BudgetEntryCreate]:
+        entries: List[BudgetEntryCreate] = []
+        try:
+            savings = parse_amounts(batch["Caja_de_Ahorro"])
+            amounts = savings.where(savings.notna(), parse_amounts(batch["Cuenta_Corriente"]))
+
+            for (_, row), amount in zip(batch.iterrows(), amounts):
+                try:
+                    reference_id = str(row["Referencia"]).strip() or None
+                    date_raw = pd.to_datetime(
+                        row["Fecha"], dayfirst=True, errors="coerce")
+                    description = str(row["Descripcion"]).strip(
+                    ) or "Transacción sin descripción"
+
+                    if amount is None:
+                        continue
+
+                    entry_type = "income" if amount > 0 else "outcome"
+
+                    entries.append(BudgetEntryCreate(
+                        reference_id=reference_id,
+                        date=date_raw,
+                        amount=abs(amount),
+                        currency=currency,
+                        source=source,
+                        description=description,
+                        type=entry_type,
+                        file_id=file_id,
+                        category_id=None  # Will be set in process_bank_statement
+                    ))
+                except Exception:
+                    continue
+        except Exception as ex:
+            logger.error(f"Error processing Santander Rio statement: {ex}")
+            return []
+        return entries
@@ -0,0 +1,175 @@
+"""
+Reclassification of stored entries.
+
+Categories are assigned when a statement is imported. When the patterns of
+TRANSACTION_CATEGORIES change, this job runs the current matcher over the
+entries already stored and updates those whose category changed:
+
+- entries are read in chunks in id order (keyset), one transaction per chunk,
+  matched in a worker thread, and the changes of a chunk are written with one
+  UPDATE ... FROM (VALUES ...);
+- the position is saved in `budget_reclassification` in the same transaction,
+  so an interrupted pass resumes after the last committed chunk. The row lock
+  on it keeps several workers from doing the same chunk twice;
+- a pass starts over from the first entry when the matcher version changes,
+  and does nothing once complete;
+- between chunks the job sleeps to stay within RECLASSIFY_DUTY_CYCLE of the
+  time, leaving the database to requests.
+
+Entries added by hand (source "manual") keep their category, and so do
+entries the matcher finds no category for. A user's own category rules and
+corrections (see `src.budget.memo`) take precedence over the patterns, as they
+do on import.
+
+    python -m src.budget.reclassify [--user-id 42]
+"""
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from loguru import logger
+from sqlalchemy import Integer, column, func, or_, select, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from src.budget.config import budget_config
+from src.budget.constants import MEMO_SOURCE_MANUAL
+from src.budget.memo import load_corrections
+from src.budget.utils import description_hash, identify_transaction_category, matcher_version
+from src.budget_transaction_category.catalogue import get_category_catalogue
+from src.budget_transaction_category.rules import CategoryRuleMatcher
+from src.budget_transaction_category.service import get_category_rule_matcher, load_category_catalogue
+from src.database import budget_entry, budget_reclassification, engine
+from src.monitoring.metrics import RECLASSIFIED_ENTRIES
+
+
+def _scope(user_id: Optional[int]) -> str:
+    return "all" if user_id is None else f"user:{user_id}"
+
+
+def changed_categories(
+    rows: Sequence[Any],
+    rule_matchers: Mapping[int, CategoryRuleMatcher] = {},
+    corrections: Mapping[tuple[int, str], int] = {},
+) -> List[Dict[str, int]]:
+    """
+    New category ids of the rows (id, user_id, description, category_id) classified differently:
+    by the rules of the row's user in `rule_matchers`, then by the user's `corrections`
+    (by (user_id, description hash)), then by the patterns
+    """
+    catalogue = get_category_catalogue()
+    changes = []
+    for row in rows:
+        if not row.description:
+            continue
+        rule_matcher = rule_matchers.get(row.user_id)
+        category_id = rule_matcher.match(row.description) if rule_matcher else None
+        if category_id is None and corrections:
+            category_id = corrections.get((row.user_id, description_hash(row.description)))
+        if category_id is None:
+            category_key = identify_transaction_category(row.description)
+            category_id = catalogue.id_of(category_key)
+        if category_id is not None and category_id != row.category_id:
+            changes.append({"id": row.id, "category_id": category_id})
+    return changes
+
+
+async def _reclassify_chunk(scope: str, user_id: Optional[int], version: str, chunk_size: int) -> Optional[int]:
+    """Reclassify the next chunk of the pass; returns the entries updated, None once the pass is complete"""
+    async with engine.begin() as conn:
+        await conn.execute(
+            pg_insert(budget_reclassification).values(scope=scope, matcher_version=version).on_conflict_do_nothing()
+        )
+        checkpoint = (await conn.execute(
+            select(budget_reclassification).where(budget_reclassification.c.scope == scope).with_for_update()
+        )).one()
+
+        progress: Dict[str, Any] = {"matcher_version": version}
+        if checkpoint.matcher_version != version:
+            # The patterns changed since the last pass
+            last_entry_id, updated_count = 0, 0
+            progress["started_at"] = func.now()
+        elif checkpoint.completed_at is not None:
+            return None
+        else:
+            last_entry_id, updated_count = checkpoint.last_entry_id, checkpoint.updated_count
+
+        conditions = [
+            budget_entry.c.id > last_entry_id,
+            or_(budget_entry.c.source.is_(None), budget_entry.c.source != MEMO_SOURCE_MANUAL),
+        ]
+        if user_id is not None:
+            conditions.append(budget_entry.c.user_id == user_id)
+
+        rows = (await conn.execute(
+            select(budget_entry.c.id, budget_entry.c.user_id, budget_entry.c.description, budget_entry.c.category_id)
+            .where(*conditions)
+            .order_by(budget_entry.c.id)
+            .limit(chunk_size)
+        )).all()
+
+        rule_matchers = {user: await get_category_rule_matcher(user) for user in {row.user_id for row in rows}}
+        corrections = await load_corrections(conn, rows)
+        # A chunk's worth of regex matching, kept off the event loop
+        changes = await asyncio.to_thread(changed_categories, rows, rule_matchers, corrections)
+        if changes:
+            changed = values(column("id", Integer), column("category_id", Integer), name="changed").data(
+                [(change["id"], change["category_id"]) for change in changes]
+            )
+            await conn.execute(
+                update(budget_entry)
+                .where(budget_entry.c.id == changed.c.id)
+                .values(category_id=changed.c.category_id, updated_at=func.now())
+            )
+
+        await conn.execute(
+            update(budget_reclassification)
+            .where(budget_reclassification.c.scope == scope)
+            .values(
+                last_entry_id=rows[-1].id if rows else last_entry_id,
+                updated_count=updated_count + len(changes),
+                completed_at=func.now() if len(rows) < chunk_size else None,
+                **progress
+            )
+        )
+
+    return len(changes)
+
+
+async def reclassify_entries(user_id: Optional[int] = None) -> int:
+    """Run or resume the pass over one user's entries (or everybody's); returns the entries updated"""
+    scope, version = _scope(user_id), matcher_version()
+    duty_cycle = budget_config.RECLASSIFY_DUTY_CYCLE
+    total_updated = 0
+
+    while True:
+        started = time.monotonic()
+        updated = await _reclassify_chunk(scope, user_id, version, budget_config.RECLASSIFY_CHUNK_SIZE)
+        if updated is None:
+            break
+
+        total_updated += updated
+        RECLASSIFIED_ENTRIES.inc(updated)
+
+        # At a 25% duty cycle, a chunk that took 50ms is followed by 150ms of rest
+        await asyncio.sleep((time.monotonic() - started) * (1 / duty_cycle - 1))
+
+    if total_updated:
+        logger.info(f"Reclassified {total_updated} entries ({scope}, matcher {version})")
+    return total_updated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user-id", type=int, help="only this user's entries (default: everybody's)")
+    args = parser.parse_args()
+
+    async def run() -> None:
+        await load_category_catalogue()
+        await reclassify_entries(args.user_id)
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,76 @@
+import asyncio
 from datetime import date
-from typing import List, Optional
-from fastapi import APIRouter, Depends, status, Query, Body, HTTPException
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, status, Query, Body, HTTPException, Request, Response
 import base64
 
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from src.auth_user.dependencies import require_role
 from src.auth_user.schemas import JWTData
-from src.budget.schemas import BudgetEntryCreate, BudgetSummary, BudgetResponseWithMeta, BudgetResponse, FilesResponseWithMeta, FilesResponse, BudgetSummaryByCurrency
+from src.budget.schemas import (
+    BudgetEntryCreate,
+    EntryCategoryUpdate,
+    BudgetSummary,
+    BudgetResponseWithMeta,
+    BudgetSearchResponseWithMeta,
+    FilesResponseWithMeta,
+    BudgetSummaryByCurrency,
+    BudgetTimeseries,
+    StatementsImport,
+    StatementsImportResponse,
+    budget_response_serializer,
+    files_response_serializer,
+)
 from src.budget.service import (
     create_budget_entry,
     get_budget_summary,
     get_budget_summary_by_currency,
+    get_budget_timeseries,
     get_budget_entries,
+    stream_budget_entries,
+    search_budget_entries,
+    BudgetSearchFilters,
     delete_budget_entry,
+    update_entry_category,
     delete_file,
     process_bank_statement,
-    create_file,
-    list_files
+    import_bank_statements,
+    unpack_statement_archive,
+    StatementUpload,
+    detect_statement_bank,
+    load_statement_parsers,
+    list_files,
+    get_user_data_version
 )
+from src.budget.config import budget_config
+from src.budget.constants import DATA_CACHE_CONTROL, TIMESERIES_GRANULARITIES
+from src.budget.exceptions import InvalidStatementArchive
 from src.budget.utils import generate_xlsx
+from src.budget_transaction_category.catalogue import get_category_catalogue
+from src.conditional import cache_headers, etag_matches, make_etag, not_modified
+from src.fx_rate.service import get_fx_rates_version
+from src.monitoring.timing import timed
+from src.serialization import NDJSON_MEDIA_TYPE, dumps, json_response
 
 
 router = APIRouter()
 
 
+async def _data_cache_headers(user_id: int, endpoint: str, *parameters: Any) -> Dict[str, str]:
+    """
+    ETag and caching headers of a response computed from the user's data with `parameters`.
+
+    The tag changes with every write to the user's entries or files. The version
+    is read before the response is computed, so a write in between only makes
+    the next request fetch the response again.
+    """
+    version = await get_user_data_version(user_id)
+    etag = make_etag(endpoint, user_id, version, get_category_catalogue().etag, *parameters)
+    return cache_headers(etag, DATA_CACHE_CONTROL)
+
+
 @router.post("/entry", status_code=status.HTTP_201_CREATED)
 async def post_entry(
     entry: BudgetEntryCreate,
@@ -36,7 +82,7 @@ async def post_entry(
 
 @router.post("/import-file", status_code=status.HTTP_200_OK)
 async def post_file(
-    bank_name: str = Body(...),
+    bank_name: Optional[str] = Body(None),  # Detected from the file content when omitted
     file_content: str = Body(...),  # Base64 encoded file content
     file_name: str = Body(...),
     currency: str = Body(...),  # Currency code, e.g., "USD", "EUR"
@@ -44,50 +90,42 @@ async def post_file(
 ) -> dict[str, str | int]:
     """
     Import transactions from file (Base64 encoded) based on the bank format.
-    Supported banks: santander_rio, ICBC, mercado_pago
+    Supported banks are the registered parsers (see `src.budget.parsers`);
+    without `bank_name` the bank is detected from the file content.
     """
-    # Define bank-specific file formats
-    bank_formats = {
-        "santander_rio": [".xlsx"],
-        "ICBC": [".csv"],
-        "mercado_pago": [".pdf"],
-        "bbva": [".xls"],
-        "comm_bank": [".csv"],
-        "revolut": [".csv"],
-    }
+    parsers = load_statement_parsers()
+
+    if not bank_name:
+        bank_name = detect_statement_bank(file_content, file_name)
+        if bank_name is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Could not detect the bank of this statement. Please select it."
+            )
 
     # Validate bank name first
-    supported_banks = list(bank_formats.keys())
-    if bank_name.lower() not in map(str.lower, supported_banks):
+    parser = parsers.get_parser(bank_name)
+    if parser is None:
+        supported_banks = [p.name for p in parsers.registered_parsers()]
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Unsupported bank. Supported banks: {', '.join(supported_banks)}"
         )
 
-    # Get expected formats for the selected bank (case insensitive match)
-    expected_format = bank_formats[[
-        k for k in bank_formats.keys() if k.lower() == bank_name.lower()][0]]
-
     # Validate file type based on bank selection
-    if not any(file_name.lower().endswith(ext.lower()) for ext in expected_format):
+    if not parser.accepts(file_name):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"For {bank_name}, file must be in format: {', '.join(expected_format)}"
+            detail=f"For {bank_name}, file must be in format: {', '.join(parser.extensions)}"
         )
 
-    file_id = await create_file(
-        user_id=jwt_data.id_user,
-        file_name=file_name,
-        file_content=file_content,
-        currency=currency
-    )
-
     try:
-        # Process bank statement in the service layer
-        imported_count, skipped_count = await process_bank_statement(jwt_data.id_user, file_id, bank_name, currency, file_content)
+        # Process bank statement in the service layer, which stores the file with its entries
+        imported_count, skipped_count = await process_bank_statement(jwt_data.id_user, file_name, bank_name, currency, file_content)
 
         return {
             "message": f"Successfully imported {imported_count} transactions from {bank_name}",
+            "bank_name": parser.name,
             "imported_count": imported_count,
             "skipped_count": skipped_count,
         }
@@ -109,36 +147,62 @@ async def post_file(
         ) from e
 
 
+@router.post("/import-files", status_code=status.HTTP_200_OK, response_model=StatementsImportResponse)
+async def post_files(
+    statements: StatementsImport,
+    jwt_data: JWTData = Depends(require_role([]))
+) -> dict:
+    """
+    Import several statements in one request: a Base64 encoded .zip archive
+    (`archive`) and/or a list of Base64 encoded files (`files`). Statements are
+    parsed concurrently and imported together; counts are reported per file.
+    """
+    uploads: List[StatementUpload] = []
+    if statements.archive:
+        try:
+            archive_bytes = base64.b64decode(statements.archive)
+        except ValueError as ex:
+            raise InvalidStatementArchive() from ex
+        uploads += await asyncio.to_thread(unpack_statement_archive, archive_bytes)
+
+    for statement in statements.files or []:
+        try:
+            file_bytes = base64.b64decode(statement.file_content)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{statement.file_name} is not Base64 encoded"
+            )
+        uploads.append(StatementUpload(statement.file_name, file_bytes, statement.bank_name))
+
+    return await import_bank_statements(jwt_data.id_user, uploads, statements.currency)
+
+
 @router.get("/files", response_model=List[FilesResponseWithMeta])
 async def get_files(
+    request: Request,
     jwt_data: JWTData = Depends(require_role([])),
     currency: str = Query(...),
     limit: Optional[int] = Query(
         default=100, description="Number of items to return per page"),
     offset: Optional[int] = Query(
         default=0, description="Offset from the beginning of the result set"),
-) -> JSONResponse:
-    result = await list_files(user_id=jwt_data.id_user, limit=limit, offset=offset, currency=currency)
+) -> Response:
+    headers = await _data_cache_headers(jwt_data.id_user, "files", currency, limit, offset)
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return not_modified(headers)
 
-    files_data = result["data"]
-    metadata = result["metadata"]
-
-    if not files_data:
-        return JSONResponse(status_code=status.HTTP_200_OK, content={"data": files_data, "metadata": metadata})
+    result = await list_files(user_id=jwt_data.id_user, limit=limit, offset=offset, currency=currency)
 
-    files_response = [
-        FilesResponse(**file_data) for file_data in files_data
-    ]
+    with timed("serialize"):
+        content = files_response_serializer.page(result["data"], result["metadata"])
 
-    return JSONResponse(
-        status_code=status.HTTP_200_OK,
-        content={"data": [file.model_dump()
-                          for file in files_response], "metadata": metadata}
-    )
+    return json_response(content, headers=headers)
 
 
 @router.get("/details", response_model=List[BudgetResponseWithMeta])
 async def get_budget_details(
+    request: Request,
     jwt_data: JWTData = Depends(require_role([])),
     currency: str = Query(...),
     start_date: Optional[date] = Query(None),
@@ -147,8 +211,15 @@ async def get_budget_details(
         default=100, description="Number of items to return per page"),
     offset: Optional[int] = Query(
         default=0, description="Offset from the beginning of the result set"),
-) -> JSONResponse:
+) -> Response:
+    """
+    Get the entries of a date range, newest first.
+
+    With `Accept: application/x-ndjson` the entries are streamed as they are
+    read, one JSON object per line, and the last line is `{"metadata": {...}}`.
+    """
     today = date.today()
+    ndjson = NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
 
     # Default to current month if no dates provided
     if not start_date:
@@ -156,6 +227,26 @@ async def get_budget_details(
     if not end_date:
         end_date = today
 
+    # The tag covers the dates defaulted above, so it changes with them, and the representation
+    headers = await _data_cache_headers(
+        jwt_data.id_user, "details", currency, start_date, end_date, limit, offset, ndjson
+    )
+    headers["Vary"] = "Accept"
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return not_modified(headers)
+
+    if ndjson:
+        parts = stream_budget_entries(jwt_data.id_user, start_date, end_date, limit, offset, currency)
+
+        async def lines():
+            async for part in parts:
+                if "data" in part:
+                    yield budget_response_serializer.lines(part["data"])
+                else:
+                    yield dumps(part) + b"\n"
+
+        return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
     result = await get_budget_entries(
         jwt_data.id_user,
         start_date,
@@ -165,25 +256,57 @@ async def get_budget_details(
         currency
     )
 
-    budgets_data = result["data"]
-    metadata = result["metadata"]
+    with timed("serialize"):
+        content = budget_response_serializer.page(result["data"], result["metadata"])
 
-    if not budgets_data:
-        return JSONResponse(status_code=status.HTTP_200_OK, content={"data": budgets_data, "metadata": metadata})
+    return json_response(content, headers=headers)
 
-    budget_response = [
-        BudgetResponse(**budget_data) for budget_data in budgets_data
-    ]
 
-    return JSONResponse(
-        status_code=status.HTTP_200_OK,
-        content={"data": [budget.model_dump()
-                          for budget in budget_response], "metadata": metadata}
+@router.get("/search", response_model=BudgetSearchResponseWithMeta)
+async def search_budget(
+    jwt_data: JWTData = Depends(require_role([])),
+    q: Optional[str] = Query(
+        None, min_length=2, max_length=100, description="Text to find in the description, typos allowed"),
+    currency: Optional[str] = Query(None),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    min_amount: Optional[Decimal] = Query(None, ge=0),
+    max_amount: Optional[Decimal] = Query(None, ge=0),
+    type: Optional[str] = Query(None, pattern="^(income|outcome)$"),
+    category_id: Optional[int] = Query(None),
+    source: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(
+        default=100, ge=1, le=budget_config.SEARCH_MAX_LIMIT, description="Number of items to return per page"),
+) -> Response:
+    """
+    Search transactions across all dates: case and accent insensitive, matching
+    parts of the description or close spellings, combined with the filters given.
+
+    Example URL: {{ENV_URL}}/budget/search?q=uber&type=outcome&min_amount=1000
+    """
+    filters = BudgetSearchFilters(
+        query=q,
+        currency=currency,
+        start_date=start_date,
+        end_date=end_date,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        type=type,
+        category_id=category_id,
+        source=source
     )
+    result = await search_budget_entries(jwt_data.id_user, filters, limit, cursor)
+
+    with timed("serialize"):
+        content = budget_response_serializer.page(result["data"], result["metadata"])
+
+    return json_response(content)
 
 
 @router.get("/summary", response_model=BudgetSummary)
 async def get_monthly_summary(
+    request: Request,
     jwt_data: JWTData = Depends(require_role([])),
     currency: str = Query(...),
     start_date: Optional[date] = Query(None),
@@ -202,21 +325,34 @@ async def get_monthly_summary(
     if not end_date:
         end_date = today
 
+    headers = await _data_cache_headers(jwt_data.id_user, "summary", currency, start_date, end_date)
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return not_modified(headers)
+
     summary = await get_budget_summary(jwt_data.id_user, start_date, end_date, currency)
-    return summary
+    # Encoded here rather than by response_model so totals keep their Decimal digits
+    return json_response(BudgetSummary(**summary).model_dump(), headers=headers)
 
 
 @router.get("/summary-by-currency", response_model=BudgetSummaryByCurrency)
 async def get_summary_by_currency(
+    request: Request,
     jwt_data: JWTData = Depends(require_role([])),
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
+    reporting_currency: Optional[str] = Query(
+        None, pattern="^[A-Z]{3}$", description="Also convert and add up all totals in this currency"),
 ):
     """
     Get budget summary grouped by currency with income/outcome totals.
     Only includes currencies that have transactions with non-zero income or outcome.
 
-    Example URL: {{ENV_URL}}/budget/summary-by-currency?start_date=2023-01-01&end_date=2023-01-31
+    With `reporting_currency`, each currency's totals are converted with the
+    exchange rate of each transaction's day (the latest one on or before it)
+    and added up into one income, outcome and net. Currencies without rates
+    are listed in `unconverted_currencies` and left out of those totals.
+
+    Example URL: {{ENV_URL}}/budget/summary-by-currency?start_date=2023-01-01&end_date=2023-01-31&reporting_currency=USD
     """
     today = date.today()
 
@@ -226,8 +362,62 @@ async def get_summary_by_currency(
     if not end_date:
         end_date = today
 
-    summary = await get_budget_summary_by_currency(jwt_data.id_user, start_date, end_date)
-    return summary
+    # Converted totals change with the exchange rates as well
+    fx_rates_version = await get_fx_rates_version() if reporting_currency else None
+    headers = await _data_cache_headers(
+        jwt_data.id_user, "summary-by-currency", start_date, end_date, reporting_currency, fx_rates_version
+    )
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return not_modified(headers)
+
+    summary = await get_budget_summary_by_currency(jwt_data.id_user, start_date, end_date, reporting_currency)
+    return json_response(BudgetSummaryByCurrency(**summary).model_dump(), headers=headers)
+
+
+@router.get("/timeseries", response_model=BudgetTimeseries)
+async def get_timeseries(
+    jwt_data: JWTData = Depends(require_role([])),
+    currency: str = Query(...),
+    granularity: str = Query("month", pattern=f"^({'|'.join(TIMESERIES_GRANULARITIES)})$"),
+    by_category: bool = Query(False),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+):
+    """
+    Get income, outcome and net per day, week or month, optionally per category.
+    Buckets without transactions are included with zero totals.
+
+    Example URL: {{ENV_URL}}/budget/timeseries?currency=ARS&granularity=month&start_date=2025-01-01
+    """
+    today = date.today()
+
+    # Default to the last twelve months, current one included
+    if not end_date:
+        end_date = today
+    if not start_date:
+        start_date = date(end_date.year - 1, end_date.month, 1)
+
+    timeseries = await get_budget_timeseries(
+        jwt_data.id_user, currency, granularity, start_date, end_date, by_category
+    )
+    return json_response(BudgetTimeseries(**timeseries).model_dump())
+
+
+@router.put("/entry/{entry_id}/category", status_code=status.HTTP_200_OK)
+async def correct_entry_category(
+    entry_id: int,
+    correction: EntryCategoryUpdate,
+    jwt_data: JWTData = Depends(require_role([]))
+):
+    updated = await update_entry_category(jwt_data.id_user, entry_id, correction.category_id)
+
+    if not updated:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Entry not found or not authorized to update this entry"
+        )
+
+    return {"message": "Entry category updated successfully"}
 
 
 @router.delete("/entry/{entry_id}", status_code=status.HTTP_200_OK)
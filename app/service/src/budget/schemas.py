@@ -3,6 +3,8 @@ from typing import Optional, List, Dict
 
 from pydantic import validator
 from src.models import CustomModel, convert_datetime_to_date
+from src.money import ZERO, Money
+from src.serialization import RowSerializer
 
 
 class Validators:
@@ -19,7 +21,7 @@ class Validators:
 
 class BudgetEntryCreate(CustomModel):
     reference_id: str
-    amount: float
+    amount: Money
     currency: str
     source: Optional[str] = None  # e.g., 'icbc', 'mercado_pago', 'manual'
     type: str
@@ -35,26 +37,90 @@ class BudgetEntryCreate(CustomModel):
         return v
 
 
+class EntryCategoryUpdate(CustomModel):
+    category_id: int  # Checked against the catalogue by the service
+
+
 class CategorySummary(CustomModel):
     key: str
     name: str
-    amount: float
+    amount: Money
+
+
+class StatementFile(CustomModel):
+    file_name: str
+    file_content: str  # Base64 encoded file content
+    bank_name: Optional[str] = None  # Detected from the file content when omitted
+
+
+class StatementsImport(CustomModel):
+    currency: str
+    archive: Optional[str] = None  # Base64 encoded .zip of statements
+    files: Optional[List[StatementFile]] = None
+
+
+class StatementImportResult(CustomModel):
+    file_name: str
+    bank_name: Optional[str] = None
+    imported_count: int = 0
+    skipped_count: int = 0
+    error: Optional[str] = None
+
+
+class StatementsImportResponse(CustomModel):
+    message: str
+    imported_count: int
+    skipped_count: int
+    files: List[StatementImportResult]
 
 
 class BudgetSummary(CustomModel):
-    income: float = 0.0
-    outcome: float = 0.0
+    income: Money = ZERO
+    outcome: Money = ZERO
     categories: Optional[Dict[str, List[CategorySummary]]] = None
 
 
 class CurrencySummary(CustomModel):
     currency: str
-    income: float = 0.0
-    outcome: float = 0.0
+    income: Money = ZERO
+    outcome: Money = ZERO
+    # In the reporting currency, when one was requested and rates were found
+    converted_income: Optional[Money] = None
+    converted_outcome: Optional[Money] = None
 
 
 class BudgetSummaryByCurrency(CustomModel):
     currencies: List[CurrencySummary]
+    # With a reporting currency: totals of all currencies that could be converted into it
+    reporting_currency: Optional[str] = None
+    income: Optional[Money] = None
+    outcome: Optional[Money] = None
+    net: Optional[Money] = None
+    unconverted_currencies: Optional[List[str]] = None  # No rate for some of their days
+
+
+class TimeseriesCategory(CustomModel):
+    key: str
+    name: str
+    income: Money = ZERO
+    outcome: Money = ZERO
+    net: Money = ZERO
+
+
+class TimeseriesBucket(CustomModel):
+    bucket: date  # First day of the day, week (Monday) or month
+    income: Money = ZERO
+    outcome: Money = ZERO
+    net: Money = ZERO
+    categories: Optional[List[TimeseriesCategory]] = None  # With by_category only
+
+
+class BudgetTimeseries(CustomModel):
+    currency: str
+    granularity: str
+    start_date: date
+    end_date: date
+    buckets: List[TimeseriesBucket]
 
 
 class Metadata(CustomModel):
@@ -67,7 +133,7 @@ class BudgetResponse(CustomModel):
     id: int
     user_id: int
     reference_id: str
-    amount: float
+    amount: Money
     currency: str
     source: Optional[str] = None  # e.g., 'icbc', 'mercado_pago', 'manual'
     type: str
@@ -82,11 +148,27 @@ class BudgetResponse(CustomModel):
         return Validators.format_datetime(value)
 
 
+# Same output as BudgetResponse(**row).model_dump() for list pages, without a model per row
+budget_response_serializer = RowSerializer(BudgetResponse, date_fields=("date", "created_at", "updated_at"))
+
+
 class BudgetResponseWithMeta(CustomModel):
     data: List[BudgetResponse]
     metadata: Metadata
 
 
+class SearchMetadata(CustomModel):
+    total_count: Optional[int] = None  # Only on the first page
+    total_count_capped: bool = False  # total_count is a lower bound (SEARCH_COUNT_LIMIT)
+    limit: int
+    next_cursor: Optional[str] = None  # Pass as `cursor` for the next page; None on the last one
+
+
+class BudgetSearchResponseWithMeta(CustomModel):
+    data: List[BudgetResponse]
+    metadata: SearchMetadata
+
+
 class FilesResponse(CustomModel):
     id: int
     file_name: str
@@ -99,6 +181,9 @@ class FilesResponse(CustomModel):
         return Validators.format_datetime(value)
 
 
+files_response_serializer = RowSerializer(FilesResponse, date_fields=("created_at", "updated_at"))
+
+
 class FilesResponseWithMeta(CustomModel):
     data: List[FilesResponse]
     metadata: Metadata
@@ -1,19 +1,57 @@
-from sqlalchemy import select, insert, func, and_, delete
-from datetime import date, datetime
-from typing import Dict, Any, List
-import pandas as pd
-import io
+from sqlalchemy import (
+    Date, Select, String, TIMESTAMP, select, insert, update, func, and_, or_, case, cast, delete, literal, true, tuple_
+)
+from sqlalchemy.dialects.postgresql import INTERVAL
+from sqlalchemy.ext.asyncio import AsyncConnection
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import PurePosixPath
+from typing import Dict, Any, AsyncIterator, Iterator, List, NamedTuple, Optional
+import asyncio
 import base64
+import io
+import multiprocessing
+import time
+import zipfile
+
 from loguru import logger
 
 from src.auth_user.service import get_user_by_id
-from src.budget.utils import extract_pdf_to_dataframe, identify_transaction_category
-from src.database import fetch_all, fetch_one, execute, budget_entry, files, budget_transaction_category
+from src.budget.memo import CategoryMemo, load_category_memo, record_correction, save_category_memo
+from src.budget.utils import description_hash, identify_transaction_category
+from src.budget.config import budget_config
+from src.budget.constants import IMPORT_LOCK_NAMESPACE
+from src.budget.exceptions import (
+    InvalidSearchCursor, InvalidStatementArchive, NoStatements, TooManyBuckets, TooManyStatements
+)
+from src.cache import VersionedCache
+from src.database import (
+    engine,
+    fetch_all,
+    fetch_one,
+    execute,
+    search_text,
+    budget_entry,
+    files,
+    budget_transaction_category,
+    fx_rate,
+    user_data_version
+)
+from src.fx_rate.config import fx_rate_config
+from src.fx_rate.service import get_fx_rates
 from src.budget.schemas import BudgetEntryCreate, CategorySummary
-from src.budget_transaction_category.constants import CATEGORY_IDS
+from src.budget_transaction_category.catalogue import get_category_catalogue
+from src.budget_transaction_category.rules import CategoryRuleMatcher
+from src.budget_transaction_category.service import get_category_rule_matcher, require_category
+from src.money import CENT, ZERO
+from src.monitoring.metrics import CLASSIFIER_RESULTS, IMPORT_ROWS, IMPORT_STAGE_DURATION
+from src.monitoring.timing import timed
 
 
 async def create_budget_entry(user_id: int, entry: BudgetEntryCreate) -> None:
+    """Add an entry by hand; the category chosen for it is remembered as a correction"""
     stmt = insert(budget_entry).values(
         user_id=user_id,
         reference_id=entry.reference_id,
@@ -28,7 +66,32 @@ async def create_budget_entry(user_id: int, entry: BudgetEntryCreate) -> None:
         created_at=datetime.utcnow(),
         updated_at=datetime.utcnow(),
     )
-    await execute(stmt)
+    async with engine.begin() as conn:
+        await conn.execute(stmt)
+        if entry.category_id:
+            await record_correction(conn, user_id, entry.description, entry.category_id)
+
+
+async def update_entry_category(user_id: int, entry_id: int, category_id: int) -> bool:
+    """
+    Correct the category of one of the user's entries. Future imports of the
+    same merchant get this category too, and the reclassification job keeps it
+
+    Returns:
+        bool: True if successful, False if entry not found or not owned by user
+    """
+    await require_category(category_id)
+    async with engine.begin() as conn:
+        entry = (await conn.execute(
+            update(budget_entry)
+            .where(budget_entry.c.id == entry_id, budget_entry.c.user_id == user_id)
+            .values(category_id=category_id, updated_at=datetime.utcnow())
+            .returning(budget_entry.c.description)
+        )).one_or_none()
+        if entry is None:
+            return False
+        await record_correction(conn, user_id, entry.description, category_id)
+    return True
 
 
 async def get_budget_summary(user_id: int, start_date: date, end_date: date, currency: str) -> Dict[str, Any]:
@@ -44,9 +107,9 @@ async def get_budget_summary(user_id: int, start_date: date, end_date: date, cur
     ).group_by(budget_entry.c.type)
 
     type_result = await fetch_all(type_stmt)
-    summary = {"income": 0.0, "outcome": 0.0}
+    summary = {"income": ZERO, "outcome": ZERO}
     for row in type_result:
-        summary[row["type"]] = float(row["total"])
+        summary[row["type"]] = row["total"]
 
     # Get summary by category
     category_stmt = select(
@@ -90,8 +153,8 @@ async def get_budget_summary(user_id: int, start_date: date, end_date: date, cur
             CategorySummary(
                 key=category_key,
                 name=category_name,
-                amount=float(row["total"])
-            ).dict()
+                amount=row["total"]
+            ).model_dump()
         )
 
     # Return combined summary that matches BudgetSummary schema
@@ -102,11 +165,20 @@ async def get_budget_summary(user_id: int, start_date: date, end_date: date, cur
     }
 
 
-async def get_budget_summary_by_currency(user_id: int, start_date: date, end_date: date) -> Dict[str, Any]:
+async def get_budget_summary_by_currency(
+    user_id: int,
+    start_date: date,
+    end_date: date,
+    reporting_currency: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Get budget summary grouped by currency with income/outcome totals.
     Only includes currencies that have transactions with non-zero income or outcome.
+    With `reporting_currency`, totals are also converted and added up in it.
     """
+    if reporting_currency:
+        return await _get_converted_summary(user_id, start_date, end_date, reporting_currency)
+
     # Get summary by currency and type
     currency_stmt = select(
         budget_entry.c.currency,
@@ -129,17 +201,15 @@ async def get_budget_summary_by_currency(user_id: int, start_date: date, end_dat
     for row in currency_result:
         currency = row["currency"]
         entry_type = row["type"]
-        total = float(row["total"])
-
         if currency not in currency_data:
-            currency_data[currency] = {"income": 0.0, "outcome": 0.0}
+            currency_data[currency] = {"income": ZERO, "outcome": ZERO}
 
-        currency_data[currency][entry_type] = total
+        currency_data[currency][entry_type] = row["total"]
 
     # Convert to list format and filter out currencies with both income and outcome as 0
     currencies = []
     for currency, data in currency_data.items():
-        if data["income"] != 0.0 or data["outcome"] != 0.0:
+        if data["income"] != ZERO or data["outcome"] != ZERO:
             currencies.append({
                 "currency": currency,
                 "income": data["income"],
@@ -149,14 +219,278 @@ async def get_budget_summary_by_currency(user_id: int, start_date: date, end_dat
     return {"currencies": currencies}
 
 
-async def get_budget_entries(
+def _converted_summary_query(user_id: int, start_date: date, end_date: date, reporting_currency: str) -> Select:
+    daily = select(
+        budget_entry.c.currency,
+        budget_entry.c.type,
+        budget_entry.c.date,
+        func.sum(budget_entry.c.amount).label("total")
+    ).where(
+        budget_entry.c.user_id == user_id,
+        budget_entry.c.date >= start_date,
+        budget_entry.c.date <= end_date
+    ).group_by(
+        budget_entry.c.currency,
+        budget_entry.c.type,
+        budget_entry.c.date
+    ).subquery("daily")
+
+    # Latest rate on or before each day, of the pair or of its inverse
+    day_rate = select(
+        case((fx_rate.c.base == daily.c.currency, fx_rate.c.rate), else_=1 / fx_rate.c.rate).label("rate")
+    ).where(
+        or_(
+            and_(fx_rate.c.base == daily.c.currency, fx_rate.c.quote == reporting_currency),
+            and_(fx_rate.c.base == reporting_currency, fx_rate.c.quote == daily.c.currency)
+        ),
+        fx_rate.c.date <= daily.c.date
+    ).order_by(fx_rate.c.date.desc()).limit(1).lateral("day_rate")
+
+    rate = case((daily.c.currency == reporting_currency, 1), else_=day_rate.c.rate)
+    # Days without a rate are returned one by one, the others summed per currency and type
+    unconverted_date = case((rate.is_(None), daily.c.date)).label("unconverted_date")
+
+    return select(
+        daily.c.currency,
+        daily.c.type,
+        unconverted_date,
+        func.sum(daily.c.total).label("total"),
+        func.sum(daily.c.total * rate).label("converted")
+    ).select_from(
+        daily.outerjoin(day_rate, true())
+    ).group_by(
+        daily.c.currency,
+        daily.c.type,
+        unconverted_date
+    )
+
+
+async def _get_converted_summary(
     user_id: int,
     start_date: date,
     end_date: date,
-    limit: int,
-    offset: int,
-    currency: str
-) -> dict[str, Any]:
+    reporting_currency: str
+) -> Dict[str, Any]:
+    rows = await fetch_all(_converted_summary_query(user_id, start_date, end_date, reporting_currency))
+
+    # Pairs without a rate of their own (e.g. ARS -> AUD) go through a pivot currency, in memory,
+    # all the days of a currency at once
+    unconverted_days: Dict[str, set] = {}
+    for row in rows:
+        if row["converted"] is None:
+            unconverted_days.setdefault(row["currency"], set()).add(row["unconverted_date"])
+    day_rates = {}
+    if unconverted_days:
+        fx_rates = await get_fx_rates()
+        day_rates = {
+            currency: fx_rates.rates(currency, reporting_currency, days, fx_rate_config.FX_PIVOT_CURRENCIES)
+            for currency, days in unconverted_days.items()
+        }
+
+    currency_data: Dict[str, Dict[str, Any]] = {}
+    unconverted = set()
+    for row in rows:
+        currency = row["currency"]
+        entry_type = row["type"]
+        data = currency_data.setdefault(currency, {
+            "currency": currency,
+            "income": ZERO,
+            "outcome": ZERO,
+            "converted_income": ZERO,
+            "converted_outcome": ZERO
+        })
+        data[entry_type] += row["total"]
+
+        converted = row["converted"]
+        if converted is None:
+            rate = day_rates[currency][row["unconverted_date"]]
+            if rate is None:
+                unconverted.add(currency)
+                continue
+            converted = row["total"] * rate
+        data[f"converted_{entry_type}"] += converted
+
+    currencies = []
+    income = outcome = ZERO
+    for currency, data in currency_data.items():
+        if data["income"] == ZERO and data["outcome"] == ZERO:
+            continue
+
+        if currency in unconverted:
+            data["converted_income"] = data["converted_outcome"] = None
+        else:
+            # Rates carry 12 decimals, converted totals are shown in cents
+            data["converted_income"] = data["converted_income"].quantize(CENT)
+            data["converted_outcome"] = data["converted_outcome"].quantize(CENT)
+            income += data["converted_income"]
+            outcome += data["converted_outcome"]
+        currencies.append(data)
+
+    return {
+        "currencies": currencies,
+        "reporting_currency": reporting_currency,
+        "income": income,
+        "outcome": outcome,
+        "net": income - outcome,
+        "unconverted_currencies": sorted(unconverted)
+    }
+
+
+# region Time series
+
+_timeseries_cache = VersionedCache("timeseries", budget_config.TIMESERIES_CACHE_SIZE)
+
+
+async def get_user_data_version(user_id: int) -> int:
+    """Version of the user's entries, bumped on every write to them (0 before the first one)"""
+    row = await fetch_one(
+        select(user_data_version.c.version).where(user_data_version.c.user_id == user_id)
+    )
+    return row["version"] if row else 0
+
+
+def count_timeseries_buckets(granularity: str, start_date: date, end_date: date) -> int:
+    if end_date < start_date:
+        return 0
+    if granularity == "day":
+        return (end_date - start_date).days + 1
+    if granularity == "week":
+        first_monday = start_date - timedelta(days=start_date.weekday())
+        return (end_date - first_monday).days // 7 + 1
+    return (end_date.year - start_date.year) * 12 + end_date.month - start_date.month + 1
+
+
+def _timeseries_query(
+    user_id: int,
+    currency: str,
+    granularity: str,
+    start_date: date,
+    end_date: date,
+    by_category: bool
+) -> Select:
+    def truncate(value):
+        return cast(func.date_trunc(granularity, cast(value, TIMESTAMP)), Date)
+
+    # Bound with their own types, the casts happen in SQL
+    start, end, step = literal(start_date, Date), literal(end_date, Date), literal(f"1 {granularity}", String)
+
+    bucket = truncate(budget_entry.c.date).label("bucket")
+    columns = [bucket]
+    group_by = [bucket]
+    if by_category:
+        category_key = func.coalesce(budget_transaction_category.c.category_key, "uncategorized").label("category_key")
+        category_name = func.coalesce(budget_transaction_category.c.category_name, "Uncategorized").label("category_name")
+        columns += [category_key, category_name]
+        group_by += [category_key, category_name]
+
+    totals = select(
+        *columns,
+        func.sum(budget_entry.c.amount).filter(budget_entry.c.type == "income").label("income"),
+        func.sum(budget_entry.c.amount).filter(budget_entry.c.type == "outcome").label("outcome"),
+    ).select_from(
+        budget_entry.outerjoin(
+            budget_transaction_category,
+            budget_entry.c.category_id == budget_transaction_category.c.id
+        )
+    ).where(
+        budget_entry.c.user_id == user_id,
+        budget_entry.c.date >= start_date,
+        budget_entry.c.date <= end_date,
+        budget_entry.c.currency == currency
+    ).group_by(*group_by).subquery("totals")
+
+    # Every bucket of the range, so that empty ones come back too
+    series = select(
+        cast(
+            func.generate_series(truncate(start), truncate(end), cast(step, INTERVAL)),
+            Date
+        ).label("bucket")
+    ).subquery("series")
+
+    stmt = select(
+        series.c.bucket,
+        *([totals.c.category_key, totals.c.category_name] if by_category else []),
+        totals.c.income,
+        totals.c.outcome,
+    ).select_from(
+        series.outerjoin(totals, totals.c.bucket == series.c.bucket)
+    ).order_by(series.c.bucket)
+
+    return stmt.order_by(totals.c.category_key) if by_category else stmt
+
+
+async def get_budget_timeseries(
+    user_id: int,
+    currency: str,
+    granularity: str,
+    start_date: date,
+    end_date: date,
+    by_category: bool = False
+) -> Dict[str, Any]:
+    """
+    Income, outcome and net per day, week or month of the range, zero for buckets
+    without entries, and per category with `by_category`.
+
+    Results are cached per worker under the user's data version, so repeated
+    dashboard loads don't aggregate the entries again until they change.
+    """
+    if count_timeseries_buckets(granularity, start_date, end_date) > budget_config.TIMESERIES_MAX_BUCKETS:
+        raise TooManyBuckets()
+
+    # Read before the entries: a write in between only makes the cached result newer than its version
+    version = await get_user_data_version(user_id)
+    cache_key = (user_id, currency, granularity, start_date, end_date, by_category)
+    cached = _timeseries_cache.get(cache_key, version)
+    if cached is not None:
+        return cached
+
+    rows = await fetch_all(_timeseries_query(user_id, currency, granularity, start_date, end_date, by_category))
+
+    buckets: Dict[date, Dict[str, Any]] = {}
+    for row in rows:
+        bucket = buckets.get(row["bucket"])
+        if bucket is None:
+            bucket = buckets[row["bucket"]] = {
+                "bucket": row["bucket"],
+                "income": ZERO,
+                "outcome": ZERO,
+                "net": ZERO,
+                "categories": [] if by_category else None
+            }
+
+        income = row["income"] or ZERO
+        outcome = row["outcome"] or ZERO
+        bucket["income"] += income
+        bucket["outcome"] += outcome
+        bucket["net"] += income - outcome
+
+        # Empty buckets come back as a single row without a category
+        if by_category and row["category_key"] is not None:
+            bucket["categories"].append({
+                "key": row["category_key"],
+                "name": row["category_name"],
+                "income": income,
+                "outcome": outcome,
+                "net": income - outcome
+            })
+
+    result = {
+        "currency": currency,
+        "granularity": granularity,
+        "start_date": start_date,
+        "end_date": end_date,
+        "buckets": list(buckets.values())
+    }
+    _timeseries_cache.set(cache_key, version, result)
+    return result
+
+# endregion Time series
+
+
+def _entries_queries(
+    user_id: int, start_date: date, end_date: date, limit: int, offset: int, currency: str
+) -> tuple[Select, Select]:
+    """Count and page queries of /budget/details"""
     # Build filter conditions
     conditions = [
         budget_entry.c.user_id == user_id,
@@ -167,14 +501,28 @@ async def get_budget_entries(
 
     # Count query to get total records
     count_query = select(func.count()).select_from(budget_entry).where(and_(*conditions))
-    total_count_result = await fetch_one(count_query)
-    total_count = total_count_result['count_1'] if total_count_result else 0
 
     # Get paginated entries
     stmt = select(budget_entry).where(and_(*conditions)) \
         .order_by(budget_entry.c.date.desc()) \
         .limit(limit).offset(offset)
 
+    return count_query, stmt
+
+
+async def get_budget_entries(
+    user_id: int,
+    start_date: date,
+    end_date: date,
+    limit: int,
+    offset: int,
+    currency: str
+) -> dict[str, Any]:
+    count_query, stmt = _entries_queries(user_id, start_date, end_date, limit, offset, currency)
+
+    total_count_result = await fetch_one(count_query)
+    total_count = total_count_result['count_1'] if total_count_result else 0
+
     entries = await fetch_all(stmt)
 
     return {
@@ -187,6 +535,159 @@ async def get_budget_entries(
     }
 
 
+async def stream_budget_entries(
+    user_id: int,
+    start_date: date,
+    end_date: date,
+    limit: int,
+    offset: int,
+    currency: str
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    The page of `get_budget_entries` in parts: {"data": [...]} for every
+    DETAILS_STREAM_BATCH_SIZE rows read from a server-side cursor, then
+    {"metadata": {...}}. Memory stays the same whatever the page size.
+
+    Rows and count are read in one repeatable read transaction, so the count
+    matches the rows even though it is taken after them.
+    """
+    count_query, stmt = _entries_queries(user_id, start_date, end_date, limit, offset, currency)
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="REPEATABLE READ", postgresql_readonly=True)
+        async with conn.begin():
+            result = await conn.stream(stmt)
+            async for rows in result.mappings().partitions(budget_config.DETAILS_STREAM_BATCH_SIZE):
+                yield {"data": [dict(row) for row in rows]}
+
+            total_count = (await conn.execute(count_query)).scalar_one()
+
+    yield {
+        "metadata": {
+            "total_count": total_count,
+            "limit": limit,
+            "offset": offset
+        }
+    }
+
+
+# region Search
+
+class BudgetSearchFilters(NamedTuple):
+    query: Optional[str] = None  # Substring or fuzzy match on the description
+    currency: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    min_amount: Optional[Decimal] = None
+    max_amount: Optional[Decimal] = None
+    type: Optional[str] = None  # 'income' or 'outcome'
+    category_id: Optional[int] = None
+    source: Optional[str] = None
+
+
+def encode_search_cursor(entry: Dict[str, Any]) -> str:
+    """Opaque cursor for the page after `entry` (results are ordered by date, then id, newest first)"""
+    return base64.urlsafe_b64encode(f"{entry['date'].isoformat()}:{entry['id']}".encode()).decode()
+
+
+def decode_search_cursor(cursor: str) -> tuple[date, int]:
+    try:
+        entry_date, entry_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return date.fromisoformat(entry_date), int(entry_id)
+    except ValueError as ex:
+        raise InvalidSearchCursor() from ex
+
+
+def _escape_like(text: str) -> str:
+    # Backslash is the default LIKE escape character in Postgres
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _search_conditions(user_id: int, filters: BudgetSearchFilters) -> list:
+    conditions = [budget_entry.c.user_id == user_id]
+
+    if filters.query:
+        # Both forms are answered by the trigram index: case and accent insensitive
+        # substrings ("uber" in "UBER *TRIP") and close words ("netflx" for "NETFLIX.COM")
+        description = search_text(budget_entry.c.description)
+        conditions.append(or_(
+            description.like(search_text(f"%{_escape_like(filters.query)}%")),
+            search_text(filters.query).op("<%")(description),
+        ))
+
+    if filters.currency:
+        conditions.append(budget_entry.c.currency == filters.currency)
+    if filters.start_date:
+        conditions.append(budget_entry.c.date >= filters.start_date)
+    if filters.end_date:
+        conditions.append(budget_entry.c.date <= filters.end_date)
+    if filters.min_amount is not None:
+        conditions.append(budget_entry.c.amount >= filters.min_amount)
+    if filters.max_amount is not None:
+        conditions.append(budget_entry.c.amount <= filters.max_amount)
+    if filters.type:
+        conditions.append(budget_entry.c.type == filters.type)
+    if filters.category_id is not None:
+        conditions.append(budget_entry.c.category_id == filters.category_id)
+    if filters.source:
+        conditions.append(budget_entry.c.source == filters.source)
+
+    return conditions
+
+
+async def search_budget_entries(
+    user_id: int,
+    filters: BudgetSearchFilters,
+    limit: int,
+    cursor: Optional[str] = None
+) -> dict[str, Any]:
+    """
+    Search the user's entries, newest first.
+
+    Pages are keyset paginated: `cursor` (the previous page's `next_cursor`)
+    continues after the last entry returned, so deep pages cost the same as the
+    first one. Matches are counted on the first page only, and at most
+    SEARCH_COUNT_LIMIT of them, so a broad search doesn't count the whole table.
+    """
+    conditions = _search_conditions(user_id, filters)
+
+    page_conditions = list(conditions)
+    if cursor:
+        page_conditions.append(
+            tuple_(budget_entry.c.date, budget_entry.c.id) < tuple_(*decode_search_cursor(cursor)))
+
+    # One extra row tells whether there is a next page
+    page_stmt = select(budget_entry).where(and_(*page_conditions)) \
+        .order_by(budget_entry.c.date.desc(), budget_entry.c.id.desc()) \
+        .limit(limit + 1)
+
+    if cursor:
+        entries = await fetch_all(page_stmt)
+        total_count, total_count_capped = None, False
+    else:
+        count_limit = budget_config.SEARCH_COUNT_LIMIT
+        matches = select(budget_entry.c.id).where(and_(*conditions)).limit(count_limit + 1).subquery()
+        count_stmt = select(func.count().label("total")).select_from(matches)
+
+        entries, count_row = await asyncio.gather(fetch_all(page_stmt), fetch_one(count_stmt))
+        total_count = min(count_row["total"], count_limit)
+        total_count_capped = count_row["total"] > count_limit
+
+    next_cursor = encode_search_cursor(entries[limit - 1]) if len(entries) > limit else None
+
+    return {
+        "data": entries[:limit],
+        "metadata": {
+            "total_count": total_count,
+            "total_count_capped": total_count_capped,
+            "limit": limit,
+            "next_cursor": next_cursor
+        }
+    }
+
+# endregion Search
+
+
 async def delete_budget_entry(user_id: int, entry_id: int) -> bool:
     """Delete a budget entry if it belongs to the user
 
@@ -217,9 +718,15 @@ async def delete_budget_entry(user_id: int, entry_id: int) -> bool:
     return True
 
 
-async def create_file(user_id: int, file_name: str, file_content: str, currency: str) -> int:
+async def create_file(
+    user_id: int,
+    file_name: str,
+    file_content: str,
+    currency: str,
+    conn: Optional[AsyncConnection] = None
+) -> int:
     """
-    Create a new file entry in the database.
+    Create a new file entry in the database, inside `conn`'s transaction when given.
     Returns the ID of the created file.
     """
     stmt = insert(files).values(
@@ -231,6 +738,8 @@ async def create_file(user_id: int, file_name: str, file_content: str, currency:
         updated_at=datetime.utcnow()
     ).returning(files.c.id)
 
+    if conn is not None:
+        return (await conn.execute(stmt)).scalar_one()
     result = await fetch_one(stmt)
     return result['id'] if result else None
 
@@ -298,7 +807,12 @@ async def list_files(user_id: int, limit: int, offset: int, currency: str) -> di
     }
 
 
-async def _get_existing_reference_ids(user_id: int, reference_ids: list[str]) -> set[str]:
+async def _get_existing_reference_ids(
+    user_id: int,
+    reference_ids: list[str],
+    conn: Optional[AsyncConnection] = None
+) -> set[str]:
+    """Reference ids the user already has; inside `conn`'s transaction when given"""
     if not reference_ids:
         return set()
     stmt = select(budget_entry.c.reference_id).where(
@@ -307,54 +821,65 @@ async def _get_existing_reference_ids(user_id: int, reference_ids: list[str]) ->
             budget_entry.c.reference_id.in_(reference_ids)
         )
     )
+    if conn is not None:
+        result = await conn.execute(stmt)
+        return {row.reference_id for row in result}
     rows = await fetch_all(stmt)
     return {row["reference_id"] for row in rows}
 
 
-async def process_bank_statement(user_id: int, file_id: int, bank_name: str, currency: str, file_content: str) -> tuple[int, int]:
-    """
-    Process bank statements from different banks and add entries to the database
-    Returns the number of entries imported
-    """
-    # Process based on bank format
-    entries = []
+def load_statement_parsers():
+    """Import the statement parsing stack (pandas, pdfplumber) on first use; see `src.budget.parsers`"""
+    from src.budget import parsers
+    return parsers
 
-    # Decode Base64 file content
-    file_bytes = base64.b64decode(file_content)
 
-    if bank_name.lower() == "santander_rio":
-        # Load into pandas DataFrame
-        df = pd.read_excel(io.BytesIO(file_bytes))
+def detect_statement_bank(file_content: str, file_name: Optional[str] = None) -> Optional[str]:
+    """Name of the bank whose statement format `file_content` (Base64) matches, or None if unclear"""
+    parsers = load_statement_parsers()
+    parser = parsers.detect_sample(parsers.StatementSample.from_base64(file_content, file_name))
+    return parser.name if parser else None
 
-        entries = _process_santander_rio_format(
-            df, file_id, bank_name, currency)
-    elif bank_name.lower() == "mercado_pago":
-        df = extract_pdf_to_dataframe(file_bytes)
 
-        entries = _process_mercado_pago_format(
-            df, file_id, bank_name, currency)
+class _ImportStages:
+    """Per-stage durations of one import, summed over its batches and recorded once at the end"""
 
-    elif bank_name.lower() == "icbc":
-        # Load into pandas DataFrame
-        df = pd.read_csv(io.BytesIO(file_bytes), encoding='utf-8')
+    def __init__(self, bank: str):
+        self.bank = bank
+        self.seconds: Dict[str, float] = {}
 
-        entries = _process_icbc_format(df, file_id, bank_name, currency)
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            with timed(name):
+                yield
+        finally:
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - start
 
-    elif bank_name.lower() == "bbva":
-        # Load into pandas DataFrame
-        df = pd.read_excel(io.BytesIO(file_bytes), header=2)
+    def observe(self) -> None:
+        for name, seconds in self.seconds.items():
+            IMPORT_STAGE_DURATION.observe(seconds, bank=self.bank, stage=name)
 
-        entries = _process_bbva_format(df, file_id, bank_name, currency)
 
-    elif bank_name.lower() == "comm_bank":
-        df = pd.read_csv(io.BytesIO(file_bytes), encoding='utf-8', header=None)
+@asynccontextmanager
+async def _import_transaction(user_id: int, stages: _ImportStages) -> AsyncIterator[AsyncConnection]:
+    """
+    Transaction for the dedupe-and-insert step of an import.
 
-        entries = _process_comm_bank_format(df, file_id, bank_name, currency)
+    It holds a per-user advisory lock until commit, so two imports of the same
+    user can't both find a reference id missing and both insert it. Imports of
+    different users are not serialized. Statements are parsed and categorized
+    before taking it, so only the dedupe and persist stages are serialized.
+    """
+    async with engine.begin() as conn:
+        with stages.stage("lock"):
+            await conn.execute(select(func.pg_advisory_xact_lock(IMPORT_LOCK_NAMESPACE, user_id)))
+        yield conn
 
-    elif bank_name.lower() == "revolut":
-        df = pd.read_csv(io.BytesIO(file_bytes), encoding='utf-8')
-        entries = _process_revolut_format(df, file_id, bank_name, currency)
 
+async def _ignored_descriptions(user_id: int) -> List[str]:
+    """Descriptions of transactions never imported: moves between the user's own accounts"""
     user_data = await get_user_by_id(user_id)
 
     # Filter out unwanted transactions
@@ -366,434 +891,368 @@ async def process_bank_statement(user_id: int, file_id: int, bank_name: str, cur
     if user_data and user_data.get("national_id"):
         ignored_descriptions.append(user_data["national_id"])
 
-    # Filter out entries with large amounts that would exceed database limits
+    return ignored_descriptions
+
+
+def _categorize_entries(
+    entries: List[BudgetEntryCreate],
+    ignored_descriptions: List[str],
+    rule_matcher: Optional[CategoryRuleMatcher] = None,
+    memo: Optional[CategoryMemo] = None,
+) -> tuple[List[BudgetEntryCreate], int]:
+    """
+    Drop ignored transactions and assign categories; returns the kept entries and how many got one
+
+    The user's own rules (`rule_matcher`) come first, then the category `memo`
+    of descriptions seen before, then the built-in patterns; what the patterns
+    find is learned into the memo.
+    """
+    catalogue = get_category_catalogue()
     filtered_entries = []
+    classified_count = 0
     for entry in entries:
         # Skip entries with descriptions in the ignore list
         if any(desc.lower() in entry.description.lower() for desc in ignored_descriptions):
             continue
 
         # Identify category for the entry
-        category_key = identify_transaction_category(entry.description)
-        if category_key and category_key in CATEGORY_IDS:
-            entry.category_id = CATEGORY_IDS[category_key]
+        category_id = rule_matcher.match(entry.description) if rule_matcher else None
+        if category_id is None:
+            memo_key = description_hash(entry.description) if memo is not None else None
+            category_id = memo.get(memo_key) if memo is not None else None
+            if category_id is None:
+                category_key = identify_transaction_category(entry.description)
+                category_id = catalogue.id_of(category_key)
+                if category_id is not None and memo is not None:
+                    memo.learn(memo_key, category_id)
+        if category_id is not None:
+            entry.category_id = category_id
+            classified_count += 1
 
         filtered_entries.append(entry)
 
-    # Duplicate detection
-    candidate_reference_ids = [e.reference_id for e in filtered_entries]
-    existing_ids = await _get_existing_reference_ids(user_id, candidate_reference_ids)
-
-    new_entries = [e for e in filtered_entries if e.reference_id not in existing_ids]
-    skipped_count = len(filtered_entries) - len(new_entries)
-
-    # Bulk insert all new entries in a single statement
-    if new_entries:
-        rows = [
-            {
-                "user_id": user_id,
-                "reference_id": e.reference_id,
-                "amount": e.amount,
-                "type": e.type,
-                "currency": e.currency,
-                "source": e.source,
-                "description": e.description,
-                "category_id": e.category_id if e.category_id else None,
-                "date": e.date,
-                "file_id": e.file_id if e.file_id else None,
-                "created_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow(),
-            }
-            for e in new_entries
-        ]
-        await execute(insert(budget_entry).values(rows))
-
-    return len(new_entries), skipped_count
-
-
-def _process_santander_rio_format(df: pd.DataFrame, file_id: int, bank_name: str, currency: str) -> List[BudgetEntryCreate]:
-    """Process Santander Rio bank statement format"""
-    entries: List[BudgetEntryCreate] = []
-    try:
-        df = df.iloc[12:].copy()
-
-        # Rename all 8 columns properly
-        df.columns = [
-            "Index",
-            "Fecha",
-            "Sucursal_origen",
-            "Descripcion",
-            "Referencia",
-            "Caja_de_Ahorro",
-            "Cuenta_Corriente",
-            "Saldo"
-        ]
-        df = df.drop(columns=["Index"])  # drop the blank index column
-        df = df.dropna(how="all")
-
-        for _, row in df.iterrows():
-            try:
-                reference_id = str(row["Referencia"]).strip() or None
-                date_raw = pd.to_datetime(
-                    row["Fecha"], dayfirst=True, errors="coerce")
-                description = str(row["Descripcion"]).strip(
-                ) or "Transacción sin descripción"
-                amount = pd.to_numeric(
-                    row.get("Caja_de_Ahorro"), errors="coerce")
-                if pd.isna(amount):
-                    amount = pd.to_numeric(
-                        row.get("Cuenta_Corriente"), errors="coerce")
-
-                if pd.isna(amount):
-                    continue
-
-                entry_type = "income" if amount > 0 else "outcome"
-
-                entries.append(BudgetEntryCreate(
-                    reference_id=reference_id,
-                    date=date_raw,
-                    amount=abs(amount),
-                    currency=currency,
-                    source=bank_name,
-                    description=description,
-                    type=entry_type,
-                    file_id=file_id,
-                    category_id=None  # Will be set in process_bank_statement
-                ))
-            except Exception:
-                continue
-    except Exception as ex:
-        logger.error(f"Error processing Santander Rio statement: {ex}")
-        return []
-    return entries
-
-
-def _process_mercado_pago_format(df: pd.DataFrame, file_id: int, bank_name: str, currency: str) -> List[BudgetEntryCreate]:
-    """Process MercadoPago bank statement format"""
-    entries: List[BudgetEntryCreate] = []
-
-    try:
-        # MercadoPago statements typically have columns: Fecha, Descripción, ID de la operación, Valor, Saldo
-        # Clean up the dataframe
-        df = df.dropna(how="all")
-
-        # Find the header row that contains "Fecha" and "Descripción"
-        header_row_idx = None
-        for idx, row in df.iterrows():
-            if any("Fecha" in str(cell) and "Descripción" in str(cell) for cell in row if pd.notna(cell)):
-                header_row_idx = idx
-                break
-
-        if header_row_idx is None:
-            # Try to find individual column headers
-            for idx, row in df.iterrows():
-                row_str = ' '.join([str(cell)
-                                   for cell in row if pd.notna(cell)])
-                if "Fecha" in row_str and "Descripción" in row_str:
-                    header_row_idx = idx
-                    break
-
-        if header_row_idx is not None:
-            # Set the header and clean the dataframe
-            df = df.iloc[header_row_idx + 1:].copy()
-
-        # Expected columns: Fecha, Descripción, ID de la operación, Valor, Saldo
-        # Rename columns to standard names
-        expected_columns = ["Fecha", "Descripcion",
-                            "ID_operacion", "Valor", "Saldo"]
-
-        # If we have the right number of columns, rename them
-        if len(df.columns) >= 4:
-            # Take only the first 5 columns or as many as we have
-            cols_to_use = min(5, len(df.columns))
-            df = df.iloc[:, :cols_to_use]
-
-            # Rename columns
-            column_names = expected_columns[:cols_to_use]
-            df.columns = column_names
-        else:
-            # If columns don't match expected format, try to identify them
-            df.columns = [f"Col_{i}" for i in range(len(df.columns))]
-
-        # Remove empty rows
-        df = df.dropna(how="all")
-
-        # Process each row
-        for _, row in df.iterrows():
-            try:
-                # Skip rows that don't contain transaction data
-                if pd.isna(row.iloc[0]) or str(row.iloc[0]).strip() == "":
-                    continue
-
-                # Extract date (first column)
-                date_str = str(row.iloc[0]).strip()
-
-                # Skip if it's not a date-like string
-                if not any(char.isdigit() for char in date_str):
-                    continue
-
-                # Parse date - MercadoPago uses DD-MM-YYYY format
-                try:
-                    date_raw = pd.to_datetime(
-                        date_str, format="%d-%m-%Y", errors="coerce")
-                    if pd.isna(date_raw):
-                        date_raw = pd.to_datetime(
-                            date_str, dayfirst=True, errors="coerce")
-                except Exception as ex:
-                    logger.error(f"Error parsing date: {date_str} - {ex}")
-                    continue
-
-                if pd.isna(date_raw):
-                    continue
-
-                # Extract reference ID (third column)
-                reference_id = str(row.iloc[2]).strip() if len(row) > 2 and pd.notna(
-                    row.iloc[2]) else None
-
-                # Extract description (second column)
-                description = str(row.iloc[1]).strip() if len(row) > 1 and pd.notna(
-                    row.iloc[1]) else "Transacción MercadoPago"
-
-                # Extract amount - look for the "Valor" column (usually 4th column, index 3)
-                amount = None
-
-                # Try to find amount in the expected position (index 3 for "Valor")
-                if len(row) > 3:
-                    amount_str = str(row.iloc[3]).strip()
-                    # Remove currency symbols and clean the string
-                    amount_str = amount_str.replace(
-                        "$", "").replace(".", "").strip()
-
-                    # Replace comma with period for decimal separator
-                    amount_str = amount_str.replace(",", ".")
-
-                    try:
-                        amount = float(amount_str)
-                    except Exception as ex:
-                        logger.error(
-                            f"Error parsing amount: {amount_str} - {ex}")
-                        amount = None
-
-                if amount is None or amount == 0:
-                    continue
-
-                # Determine entry type
-                entry_type = "income" if amount > 0 else "outcome"
-
-                # Create entry
-                entries.append(BudgetEntryCreate(
-                    reference_id=reference_id or f"{bank_name}_{description[:30]}_{date_raw.strftime('%Y%m%d')}",
-                    date=date_raw,
-                    amount=abs(amount),
-                    currency=currency,
-                    source=bank_name,
-                    description=description,
-                    type=entry_type,
-                    file_id=file_id,
-                    category_id=None  # Will be set in process_bank_statement
-                ))
-
-            except Exception as e:
-                # Skip problematic rows
-                logger.error(f"Error processing MercadoPago row: {e}")
-                continue
-
-    except Exception as e:
-        logger.error(f"Error processing MercadoPago statement: {e}")
-        return []
-
-    return entries
+    return filtered_entries, classified_count
+
+
+def _entry_rows(user_id: int, entries: List[BudgetEntryCreate]) -> List[Dict[str, Any]]:
+    now = datetime.utcnow()
+    return [
+        {
+            "user_id": user_id,
+            "reference_id": e.reference_id,
+            "amount": e.amount,
+            "type": e.type,
+            "currency": e.currency,
+            "source": e.source,
+            "description": e.description,
+            "category_id": e.category_id if e.category_id else None,
+            "date": e.date,
+            "file_id": e.file_id if e.file_id else None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for e in entries
+    ]
 
 
-def _process_icbc_format(df: pd.DataFrame, file_id: int, bank_name: str, currency: str) -> List[BudgetEntryCreate]:
-    """Process ICBC bank statement CSV file into BudgetEntryCreate list"""
-    entries: List[BudgetEntryCreate] = []
-    # Rename columns for clarity
-    df.columns = ["Fecha", "Descripcion", "Debito", "Credito", "Referencia"]
+async def process_bank_statement(user_id: int, file_name: str, bank_name: str, currency: str, file_content: str) -> tuple[int, int]:
+    """
+    Process bank statements from different banks and add entries to the database
+    Returns the number of entries imported
 
-    for _, row in df.iterrows():
-        try:
-            reference_id = str(row["Referencia"]).replace(
-                ".", "").strip() or None
-            # Parse date
-            date_val = datetime.strptime(str(row["Fecha"]), "%m/%d/%y").date()
-            description = str(row["Descripcion"]).strip(
-            ) or "Transacción sin descripción"
-            credito = pd.to_numeric(row.get("Credito"), errors="coerce") or 0.0
-            debito = pd.to_numeric(row.get("Debito"), errors="coerce") or 0.0
-
-            # Determine amount and type
-            if credito > 0:
-                amount = credito
-                entry_type = "income"
-            else:
-                amount = debito
-                entry_type = "outcome"
-
-            entries.append(BudgetEntryCreate(
-                reference_id=reference_id or f"{bank_name}_{description[:30]}_{date_val.strftime('%Y%m%d')}",
-                date=date_val,
-                amount=abs(amount),
+    The statement is parsed and categorized batch by batch (see
+    `BankParser.batches`) in a worker thread, outside any transaction, so only
+    one batch of raw rows is in memory at a time. The resulting entries are
+    staged in memory and written, with the statement's file row, in one short
+    transaction which alone holds the user's import lock: a statement that
+    fails halfway leaves nothing behind and can simply be imported again.
+    """
+    bank = bank_name.lower()
+    parser = load_statement_parsers().get_parser(bank_name)
+    if parser is None:
+        return 0, 0
+
+    ignored_descriptions = await _ignored_descriptions(user_id)
+    rule_matcher = await get_category_rule_matcher(user_id)
+
+    stages = _ImportStages(bank)
+    parsed_count = filtered_count = classified_count = skipped_count = imported_count = 0
+
+    def next_batch(batches: Iterator[Any]) -> Optional[List[BudgetEntryCreate]]:
+        batch = next(batches, None)
+        # Entries get their file id once the file row is created, below
+        return None if batch is None else parser.parse(batch, None, bank_name, currency)
+
+    with stages.stage("parse"):
+        # Decode Base64 file content
+        file_bytes = base64.b64decode(file_content)
+        batches = parser.batches(file_bytes)
+
+    # Categorized batches and what each taught the memo, written below
+    staged: List[tuple[List[BudgetEntryCreate], CategoryMemo]] = []
+    while True:
+        with stages.stage("parse"):
+            entries = await asyncio.to_thread(next_batch, batches)
+        if entries is None:
+            break
+
+        with stages.stage("categorize"):
+            memo = await load_category_memo(user_id, [e.description for e in entries])
+            # User regexes and the built-in patterns run off the event loop
+            filtered_entries, classified = await asyncio.to_thread(
+                _categorize_entries, entries, ignored_descriptions, rule_matcher, memo)
+        staged.append((filtered_entries, memo))
+
+        parsed_count += len(entries)
+        filtered_count += len(filtered_entries)
+        classified_count += classified
+
+    # Reference ids inserted by this import: rows repeating one inside the same
+    # statement are legitimate (same day, same merchant), not duplicates
+    inserted_ids: set[str] = set()
+    async with _import_transaction(user_id, stages) as conn:
+        with stages.stage("persist"):
+            file_id = await create_file(
+                user_id=user_id,
+                file_name=file_name,
+                file_content=file_content,
                 currency=currency,
-                source=bank_name,
-                description=description,
-                type=entry_type,
-                file_id=file_id,
-                category_id=None  # Will be set in process_bank_statement
-            ))
-        except Exception:
-            continue
+                conn=conn,
+            )
+        for filtered_entries, memo in staged:
+            for entry in filtered_entries:
+                entry.file_id = file_id
+
+            # Duplicate detection
+            with stages.stage("dedupe"):
+                existing_ids = await _get_existing_reference_ids(
+                    user_id, [e.reference_id for e in filtered_entries], conn)
+                existing_ids -= inserted_ids
+
+            new_entries = [e for e in filtered_entries if e.reference_id not in existing_ids]
+
+            # Bulk insert the batch's new entries, and what the batch taught the memo
+            with stages.stage("persist"):
+                if new_entries:
+                    await conn.execute(insert(budget_entry), _entry_rows(user_id, new_entries))
+                await save_category_memo(conn, user_id, memo)
+            inserted_ids.update(e.reference_id for e in new_entries)
+
+            skipped_count += len(filtered_entries) - len(new_entries)
+            imported_count += len(new_entries)
+
+    stages.observe()
+    CLASSIFIER_RESULTS.inc(classified_count, result="hit")
+    CLASSIFIER_RESULTS.inc(filtered_count - classified_count, result="miss")
+    IMPORT_ROWS.inc(parsed_count, bank=bank, outcome="parsed")
+    IMPORT_ROWS.inc(parsed_count - filtered_count, bank=bank, outcome="ignored")
+    IMPORT_ROWS.inc(skipped_count, bank=bank, outcome="skipped")
+    IMPORT_ROWS.inc(imported_count, bank=bank, outcome="imported")
+
+    return imported_count, skipped_count
+
+
+# region Multi-statement imports
+
+class StatementUpload(NamedTuple):
+    file_name: str
+    file_bytes: bytes
+    bank_name: Optional[str] = None  # detected from the content when None
+
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_parse_pool() -> Optional[ProcessPoolExecutor]:
+    """Worker processes for multi-statement imports, started on first use; None to parse in a thread"""
+    global _parse_pool
+    if budget_config.IMPORT_PARSE_WORKERS <= 0:
+        return None
+    if _parse_pool is None:
+        # Forking a process that runs the event loop and holds DB connections is unsafe, spawn fresh workers
+        _parse_pool = ProcessPoolExecutor(
+            max_workers=budget_config.IMPORT_PARSE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _parse_pool
 
-    return entries
 
-
-def _process_bbva_format(df: pd.DataFrame, file_id: int, bank_name: str, currency: str) -> List[BudgetEntryCreate]:
-    """Process BBVA bank statement Excel file with headers on line 3 (index 2)"""
-    entries: List[BudgetEntryCreate] = []
-    try:
-        df.columns = ["Fecha", "Concepto", "Extra", "Importe", "Saldo"]
-        df = df.dropna(how="all")
-        for _, row in df.iterrows():
-            try:
-                # Parse date (format: d/m/Y)
-                date_val = pd.to_datetime(
-                    str(row["Fecha"]).strip(), format="%d/%m/%Y", errors="coerce")
-                if pd.isna(date_val):
-                    continue
-                # Description: Concepto + Extra (if present)
-                concepto = str(row["Concepto"]).strip(
-                ) if pd.notna(row["Concepto"]) else ""
-                extra = str(row["Extra"]).strip() if pd.notna(
-                    row["Extra"]) else ""
-                description = f"{concepto} {extra}".strip()
-                # Parse amount (Importe, with comma as decimal separator)
-                importe_str = str(row["Importe"]).replace(
-                    ".", "").replace(",", ".").strip()
-                try:
-                    amount = float(importe_str)
-                except Exception:
-                    continue
-                if amount == 0:
-                    continue
-                # Determine type
-                entry_type = "income" if amount > 0 else "outcome"
-                # Reference ID: use bank, description, date
-                reference_id = f"{bank_name}_{description[:30]}_{date_val.strftime('%Y%m%d')}"
-                # Create entry
-                entries.append(BudgetEntryCreate(
-                    reference_id=reference_id,
-                    date=date_val,
-                    amount=abs(amount),
-                    currency=currency,
-                    source=bank_name,
-                    description=description,
-                    type=entry_type,
-                    file_id=file_id,
-                    category_id=None  # Will be set in process_bank_statement
-                ))
-            except Exception as ex:
-                logger.error(f"Error processing BBVA statement row: {ex}")
-                continue
-    except Exception as ex:
-        logger.error(f"Error processing BBVA statement: {ex}")
-        return []
-    return entries
+def shutdown_parse_pool() -> None:
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(cancel_futures=True)
+        _parse_pool = None
 
 
-def _process_comm_bank_format(df: pd.DataFrame, file_id: int, bank_name: str, currency: str) -> List[BudgetEntryCreate]:
-    """Process CommBank CSV file (no headers) into BudgetEntryCreate list"""
-    entries: List[BudgetEntryCreate] = []
+def unpack_statement_archive(archive_bytes: bytes) -> List[StatementUpload]:
+    """The statements inside a zip archive, skipping folders and OS metadata files (__MACOSX, .DS_Store)"""
     try:
-        # Assign columns: Date, Amount, Description, Balance
-        df.columns = ["Date", "Amount", "Description", "Balance"]
-        for _, row in df.iterrows():
-            try:
-                # Parse date (format: d/m/Y)
-                date_val = pd.to_datetime(
-                    str(row["Date"]).strip(), format="%d/%m/%Y", errors="coerce")
-                if pd.isna(date_val):
-                    continue
-                # Parse amount
-                amount = pd.to_numeric(row["Amount"], errors="coerce")
-                if pd.isna(amount) or amount == 0:
-                    continue
-                # Determine type
-                entry_type = "income" if amount > 0 else "outcome"
-                # Description
-                description = str(row["Description"]
-                                  ).strip() or "CommBank Transaction"
-                # Reference ID: can be None or generated
-                reference_id = f"{bank_name}_{description[:30]}_{date_val.strftime('%Y%m%d')}"
-                # Create entry
-                entries.append(BudgetEntryCreate(
-                    reference_id=reference_id,
-                    date=date_val,
-                    amount=abs(amount),
-                    currency=currency,
-                    source=bank_name,
-                    description=description,
-                    type=entry_type,
-                    file_id=file_id,
-                    category_id=None  # Will be set in process_bank_statement
-                ))
-            except Exception as ex:
-                logger.error(f"Error processing CommBank statement row: {ex}")
-                continue
-    except Exception as ex:
-        logger.error(f"Error processing CommBank statement: {ex}")
-        return []
-    return entries
-
-
-def _process_revolut_format(df: pd.DataFrame, file_id: int, bank_name: str, currency: str) -> List[BudgetEntryCreate]:
-    """Process Revolut CSV export (Spanish locale column names)."""
-    entries: List[BudgetEntryCreate] = []
+        archive = zipfile.ZipFile(io.BytesIO(archive_bytes))
+    except zipfile.BadZipFile as ex:
+        raise InvalidStatementArchive() from ex
+
+    members = [
+        info for info in archive.infolist()
+        if not info.is_dir()
+        and not info.filename.startswith("__MACOSX/")
+        and not PurePosixPath(info.filename).name.startswith(".")
+    ]
+    if len(members) > budget_config.IMPORT_MAX_FILES:
+        raise TooManyStatements()
 
+    statements = []
+    remaining = budget_config.IMPORT_MAX_UNCOMPRESSED_BYTES
     try:
-        df = df.dropna(how="all")
-
-        for _, row in df.iterrows():
-            try:
-                if str(row.get("Estado", "")).strip().upper() != "COMPLETADO":
-                    continue
-
-                divisa = str(row.get("Divisa", "")).strip()
-                if divisa != currency:
-                    continue
-
-                importe = pd.to_numeric(row.get("Importe"), errors="coerce")
-                if pd.isna(importe) or importe == 0:
-                    continue
-
-                comision = pd.to_numeric(row.get("Comisión", 0), errors="coerce")
-                if pd.isna(comision):
-                    comision = 0.0
+        for info in members:
+            # Sizes in the archive header can't be trusted, stop reading once over the limit
+            with archive.open(info) as member:
+                file_bytes = member.read(remaining + 1)
+            remaining -= len(file_bytes)
+            if remaining < 0:
+                raise TooManyStatements()
+            statements.append(StatementUpload(PurePosixPath(info.filename).name, file_bytes))
+    except (zipfile.BadZipFile, RuntimeError) as ex:
+        # Corrupt or encrypted members
+        raise InvalidStatementArchive() from ex
+
+    return statements
+
+
+async def import_bank_statements(user_id: int, statements: List[StatementUpload], currency: str) -> Dict[str, Any]:
+    """
+    Import several statements at once, e.g. the contents of a zip archive.
+
+    Each statement goes to its bank parser (detected from the content unless
+    given) and is parsed in the worker pool, at most IMPORT_PARSE_WORKERS at a
+    time. All entries then go through a single categorize, dedupe and insert
+    pass; a transaction found in two statements is imported once. Statements
+    that fail are reported in their file result and don't stop the others.
+    File rows are created for the statements that parsed, in the transaction
+    inserting their entries.
+    """
+    if not statements:
+        raise NoStatements()
+    if len(statements) > budget_config.IMPORT_MAX_FILES:
+        raise TooManyStatements()
+
+    parsers = load_statement_parsers()
+    results = [
+        {"file_name": s.file_name, "bank_name": None, "imported_count": 0, "skipped_count": 0, "error": None}
+        for s in statements
+    ]
 
-                date_raw = pd.to_datetime(str(row.get("Fecha de inicio", "")).strip(), errors="coerce")
-                if pd.isna(date_raw):
-                    continue
+    # Route every statement to its parser
+    jobs = []
+    for index, statement in enumerate(statements):
+        if statement.bank_name:
+            parser = parsers.get_parser(statement.bank_name)
+            if parser is None:
+                results[index]["error"] = f"Unsupported bank: {statement.bank_name}"
+                continue
+        else:
+            parser = parsers.detect_bank(statement.file_bytes, statement.file_name)
+            if parser is None:
+                results[index]["error"] = "Could not detect the bank of this statement"
+                continue
+        if not parser.accepts(statement.file_name):
+            results[index]["error"] = f"For {parser.name}, file must be in format: {', '.join(parser.extensions)}"
+            continue
 
-                description = str(row.get("Descripción", "")).strip() or "Revolut transaction"
-                reference_id = f"revolut_{date_raw.strftime('%Y%m%d%H%M%S')}_{description[:21]}"
+        results[index]["bank_name"] = parser.name
+        jobs.append((index, statement.bank_name or parser.name, statement.file_bytes))
+
+    # Parse concurrently, bounded by the pool size
+    pool = _get_parse_pool()
+    limit = asyncio.Semaphore(max(budget_config.IMPORT_PARSE_WORKERS, 1))
+    loop = asyncio.get_running_loop()
+
+    # Entries get their file id once the file row is created, below
+    async def parse(bank_name: str, file_bytes: bytes) -> tuple[List[BudgetEntryCreate], float]:
+        async with limit:
+            if pool is None:
+                return await asyncio.to_thread(parsers.parse_statement_in_worker, bank_name, file_bytes, None, currency)
+            return await loop.run_in_executor(pool, parsers.parse_statement_in_worker, bank_name, file_bytes, None, currency)
+
+    with timed("parse"):
+        outcomes = await asyncio.gather(
+            *(parse(bank_name, file_bytes) for _, bank_name, file_bytes in jobs),
+            return_exceptions=True,
+        )
 
-                entry_type = "income" if importe > 0 else "outcome"
-                amount = abs(float(importe)) + float(comision)
+    # One categorize, dedupe and insert pass over every statement
+    ignored_descriptions = await _ignored_descriptions(user_id)
+    rule_matcher = await get_category_rule_matcher(user_id)
+    stages = _ImportStages("multi_file")
+    with stages.stage("categorize"):
+        memo = await load_category_memo(user_id, [
+            e.description for outcome in outcomes if not isinstance(outcome, BaseException) for e in outcome[0]
+        ])
+    parsed = []
+    for (index, bank_name, _), outcome in zip(jobs, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.error(f"Error processing {results[index]['file_name']}: {outcome}")
+            results[index]["error"] = f"Error processing file: {outcome}"
+            continue
 
-                entries.append(BudgetEntryCreate(
-                    reference_id=reference_id,
-                    date=date_raw.date(),
-                    amount=amount,
+        entries, parse_seconds = outcome
+        bank = bank_name.lower()
+        IMPORT_STAGE_DURATION.observe(parse_seconds, bank=bank, stage="parse")
+
+        with stages.stage("categorize"):
+            filtered_entries, classified = await asyncio.to_thread(
+                _categorize_entries, entries, ignored_descriptions, rule_matcher, memo)
+
+        CLASSIFIER_RESULTS.inc(classified, result="hit")
+        CLASSIFIER_RESULTS.inc(len(filtered_entries) - classified, result="miss")
+        IMPORT_ROWS.inc(len(entries), bank=bank, outcome="parsed")
+        IMPORT_ROWS.inc(len(entries) - len(filtered_entries), bank=bank, outcome="ignored")
+        parsed.append((index, bank, filtered_entries))
+
+    async with _import_transaction(user_id, stages) as conn:
+        with stages.stage("persist"):
+            for index, _, entries in parsed:
+                statement = statements[index]
+                file_id = await create_file(
+                    user_id=user_id,
+                    file_name=statement.file_name,
+                    file_content=base64.b64encode(statement.file_bytes).decode("ascii"),
                     currency=currency,
-                    source=bank_name,
-                    description=description,
-                    type=entry_type,
-                    file_id=file_id,
-                    category_id=None
-                ))
-            except Exception:
-                continue
-    except Exception as ex:
-        logger.error(f"Error processing Revolut statement: {ex}")
-        return []
+                    conn=conn,
+                )
+                for entry in entries:
+                    entry.file_id = file_id
+
+        with stages.stage("dedupe"):
+            existing_ids = await _get_existing_reference_ids(
+                user_id, list({e.reference_id for _, _, entries in parsed for e in entries}), conn)
+
+        # Reference id -> statement that imports it (-1: already in the database). Repeats
+        # inside one statement are kept, as in single imports; repeats across statements are not
+        owners: Dict[str, int] = dict.fromkeys(existing_ids, -1)
+        new_entries = []
+        for index, bank, entries in parsed:
+            kept = [e for e in entries if owners.setdefault(e.reference_id, index) == index]
+            new_entries.extend(kept)
+            results[index]["imported_count"] = len(kept)
+            results[index]["skipped_count"] = len(entries) - len(kept)
+
+        with stages.stage("persist"):
+            if new_entries:
+                await conn.execute(insert(budget_entry), _entry_rows(user_id, new_entries))
+            await save_category_memo(conn, user_id, memo)
+
+    # Counted once committed
+    for index, bank, _ in parsed:
+        IMPORT_ROWS.inc(results[index]["skipped_count"], bank=bank, outcome="skipped")
+        IMPORT_ROWS.inc(results[index]["imported_count"], bank=bank, outcome="imported")
+    stages.observe()
+
+    imported_count = sum(r["imported_count"] for r in results)
+    return {
+        "message": f"Successfully imported {imported_count} transactions from {len(parsed)} of {len(statements)} files",
+        "imported_count": imported_count,
+        "skipped_count": sum(r["skipped_count"] for r in results),
+        "files": results,
+    }
 
-    return entries
+# endregion Multi-statement imports
@@ -1,72 +1,101 @@
-import pandas as pd
+import hashlib
 import io
-import pdfplumber
+import json
 import re
-from typing import List, Dict, Any
+import unicodedata
+from typing import List, Dict, Any, Optional
 
+from src.budget_transaction_category.catalogue import get_category_catalogue
 from src.budget_transaction_category.constants import TRANSACTION_CATEGORIES
 
 
-def extract_pdf_to_dataframe(file_bytes: bytes) -> pd.DataFrame:
+class CategoryMatcher:
     """
-    Extract data from a PDF file and return it as a DataFrame.
+    Category patterns compiled once, one regex per category.
+
+    Categories are tried in order and the first one with a matching pattern
+    wins. `version` changes whenever the patterns do, so work done with an
+    older matcher can be detected and redone.
     """
 
-    # Leer el texto completo del PDF
-    with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-        full_text = "\n".join(page.extract_text() or "" for page in pdf.pages)
+    def __init__(self, categories: Dict[str, List[str]]):
+        self.patterns = [
+            (key, re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE))
+            for key, patterns in categories.items()
+            if patterns
+        ]
+        self.version = hashlib.sha256(json.dumps(list(categories.items())).encode()).hexdigest()[:16]
 
-    # Tomar solo el bloque del detalle
-    if "DETALLE DE MOVIMIENTOS" in full_text:
-        full_text = full_text.split("DETALLE DE MOVIMIENTOS")[1]
+    def match(self, description: str) -> Optional[str]:
+        for key, pattern in self.patterns:
+            if pattern.search(description):
+                return key
+        return None
 
-    # Regex que captura: fecha, descripción, ID, valor y saldo
-    pattern = re.compile(
-        r"(\d{2}-\d{2}-\d{4})\s+"      # Fecha
-        r"(.*?)\s+"                    # Descripción
-        r"(\d+)\s+"                    # ID operación
-        r"\$\s+([-\d\.,]+)\s+"         # Valor
-        r"\$\s+([-\d\.,]+)"            # Saldo
-    )
 
-    matches = pattern.findall(full_text)
+def _configured_categories() -> Dict[str, List[str]]:
+    # Alphabetical, as dir() lists them
+    return {
+        category_attr: getattr(TRANSACTION_CATEGORIES, category_attr)
+        for category_attr in dir(TRANSACTION_CATEGORIES)
+        if not category_attr.startswith('_') and isinstance(getattr(TRANSACTION_CATEGORIES, category_attr), list)
+    }
 
-    if not matches:
-        return pd.DataFrame()  # Vacío si no encontró nada
 
-    # Armar el DataFrame
-    df = pd.DataFrame(
-        matches,
-        columns=["Fecha", "Descripcion", "ID", "Valor", "Saldo"]
-    )
+CATEGORY_MATCHER = CategoryMatcher(_configured_categories())
 
-    return df
 
+def matcher_version() -> str:
+    """Version of the patterns and of the category ids they map to"""
+    # Keys map to ids through the catalogue, a change there changes the results as well
+    ids = sorted((category["category_key"], category["id"]) for category in get_category_catalogue().categories)
+    return hashlib.sha256(f"{CATEGORY_MATCHER.version}:{ids}".encode()).hexdigest()[:16]
 
-def identify_transaction_category(description: str) -> str:
+
+# Parts of a description that change between two transactions with the same merchant
+_VOLATILE_PARTS = [
+    # Dates: 12/06, 12-06-26, 2026-06-12
+    re.compile(r"\b\d{1,4}[/-]\d{1,2}(?:[/-]\d{2,4})?\b"),
+    # Card suffixes: xxxx1234, **** 1234, *1234, tarjeta 1234
+    re.compile(r"(?:[x*]{2,}[\s-]*|\*|\b(?:tarjeta|tarj|card)\.?\s*(?:n[o°º]?\.?\s*)?)\d{2,4}\b"),
+    # Reference numbers: ref 12345, nro: A1B2, op #991
+    re.compile(r"\b(?:ref|nro|op|trx|id|comprobante|cupon)\b\s*[.:#]?\s*[\w-]*\d[\w-]*"),
+    # Whatever else carries three digits or more, e.g. authorization codes
+    re.compile(r"#?\b\w*\d{3,}\w*\b"),
+]
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_description(description: Optional[str]) -> str:
     """
-    Identify the transaction category based on the description
-    Returns the category key or None if no match found
+    The merchant part of a description: lower case, without accents, dates,
+    card suffixes, reference numbers or punctuation. Empty when nothing is left
     """
-    description = description.lower()
+    text = unicodedata.normalize("NFKD", (description or "").lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    for pattern in _VOLATILE_PARTS:
+        text = pattern.sub(" ", text)
+    return _NON_WORD.sub(" ", text).strip()
 
-    # Check each category's patterns
-    for category_attr in dir(TRANSACTION_CATEGORIES):
-        if category_attr.startswith('_'):
-            continue
 
-        patterns = getattr(TRANSACTION_CATEGORIES, category_attr)
-        if not isinstance(patterns, list):
-            continue
+def description_hash(description: Optional[str]) -> Optional[str]:
+    """Key of the description in the category memo, None for descriptions without a merchant part"""
+    normalized = normalize_description(description)
+    return hashlib.sha256(normalized.encode()).hexdigest() if normalized else None
 
-        for pattern in patterns:
-            if re.search(pattern, description, re.IGNORECASE):
-                return category_attr
 
-    return None
+def identify_transaction_category(description: str) -> str:
+    """
+    Identify the transaction category based on the description
+    Returns the category key or None if no match found
+    """
+    return CATEGORY_MATCHER.match(description.lower())
 
 
 def generate_xlsx(entries: List[Dict[str, Any]]) -> bytes:
+    # pandas is only needed for exports, keep it out of application startup
+    import pandas as pd
+
     if not entries:
         df = pd.DataFrame()
     else:
@@ -0,0 +1,58 @@
+"""
+Catalogue of transaction categories.
+
+No migration seeds the categories: they are inserted by hand, or by the load
+test seed, and rarely change. They are read once at startup (see
+`service.load_category_catalogue`) into an immutable index by id and by key
+that the category endpoint, the services and imports all share, along with
+the endpoint's encoded body and ETag; `service.get_category` reloads it when a
+category added since is asked for. Until then, e.g. in tests and command line
+tools, the catalogue holds the ids of CATEGORY_IDS.
+"""
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping, Optional
+
+from src.budget_transaction_category.constants import CATEGORY_IDS
+from src.conditional import make_etag
+from src.serialization import dumps
+
+# Columns of a category, as the endpoint returns them
+FIELDS = ("id", "category_key", "category_name", "description")
+
+
+class CategoryCatalogue:
+    """Categories by id and by key; read only"""
+
+    def __init__(self, rows: Iterable[Mapping[str, Any]]):
+        self.categories = tuple(
+            MappingProxyType({field: row.get(field) for field in FIELDS})
+            for row in sorted(rows, key=lambda row: row["id"])
+        )
+        self.by_id = MappingProxyType({category["id"]: category for category in self.categories})
+        self.by_key = MappingProxyType({category["category_key"]: category for category in self.categories})
+        self.body = dumps([dict(category) for category in self.categories])
+        self.etag = make_etag(self.body)
+
+    @classmethod
+    def from_constants(cls) -> "CategoryCatalogue":
+        return cls(
+            {"id": category_id, "category_key": key, "category_name": key.replace("_", " ").capitalize()}
+            for key, category_id in CATEGORY_IDS.items()
+        )
+
+    def id_of(self, key: Optional[str]) -> Optional[int]:
+        """Id of the category with this key, None for no key or an unknown one"""
+        category = self.by_key.get(key) if key else None
+        return category["id"] if category else None
+
+
+_catalogue = CategoryCatalogue.from_constants()
+
+
+def get_category_catalogue() -> CategoryCatalogue:
+    return _catalogue
+
+
+def set_category_catalogue(catalogue: CategoryCatalogue) -> None:
+    global _catalogue
+    _catalogue = catalogue
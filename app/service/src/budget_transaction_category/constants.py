@@ -136,3 +136,23 @@ CATEGORY_IDS = {
     "BANK_FEES": 10,
     "TRANSPORTATION": 11,
 }
+
+# The catalogue is the same for every user and rarely changes
+CATALOGUE_CACHE_CONTROL = "private, max-age=3600"
+
+
+# How a user category rule's pattern is compared with a description (case insensitive)
+RULE_MATCH_TYPES = ("contains", "starts_with", "exact", "regex")
+MAX_RULES_PER_USER = 500
+# Regex rules run on every imported description: keep them short, and only the
+# first RULE_MATCH_MAX_LENGTH characters of a description (its column size) are matched
+MAX_REGEX_RULE_LENGTH = 100
+RULE_MATCH_MAX_LENGTH = 255
+
+# Compiled rule matchers kept per worker (one per user)
+RULE_MATCHER_CACHE_SIZE = 1024
+
+
+class ERRORCODE:
+    TOO_MANY_RULES = f"A user can have at most {MAX_RULES_PER_USER} category rules."
+    UNKNOWN_CATEGORY = "Unknown transaction category."
@@ -0,0 +1,20 @@
+from src.budget_transaction_category.constants import ERRORCODE
+from src.exceptions import BadRequest
+
+
+class TooManyCategoryRules(BadRequest):
+    DETAIL = ERRORCODE.TOO_MANY_RULES
+    ERROR_CODE = "TOO_MANY_CATEGORY_RULES"
+
+    def __init__(self):
+        super().__init__(detail=self.DETAIL)
+        self.error_code = self.ERROR_CODE
+
+
+class UnknownCategory(BadRequest):
+    DETAIL = ERRORCODE.UNKNOWN_CATEGORY
+    ERROR_CODE = "UNKNOWN_CATEGORY"
+
+    def __init__(self):
+        super().__init__(detail=self.DETAIL)
+        self.error_code = self.ERROR_CODE
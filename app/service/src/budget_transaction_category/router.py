@@ -1,10 +1,14 @@
 from typing import List
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 
 from src.auth_user.dependencies import require_role
 from src.auth_user.schemas import JWTData
 from src.budget_transaction_category import schema
 from src.budget_transaction_category import service
+from src.budget_transaction_category.catalogue import get_category_catalogue
+from src.budget_transaction_category.constants import CATALOGUE_CACHE_CONTROL
+from src.conditional import cache_headers, etag_matches, not_modified
+from src.serialization import json_response
 
 
 router = APIRouter()
@@ -12,12 +16,71 @@ router = APIRouter()
 
 @router.get("/budget-transaction-category", response_model=List[schema.TransactionCategoryResponse])
 async def get_categories(
+    request: Request,
     jwt_data: JWTData = Depends(require_role([]))
 ):
     """
     Get all transaction categories for dropdown selection in the client
     
-    Returns a list of all available transaction categories with their IDs, keys, and display names
+    Returns a list of all available transaction categories with their IDs, keys, and display names.
+    The list rarely changes: revalidate with If-None-Match for a 304
     """
-    categories = await service.get_transaction_categories()
-    return categories
+    catalogue = get_category_catalogue()
+    headers = cache_headers(catalogue.etag, CATALOGUE_CACHE_CONTROL)
+    if etag_matches(request.headers.get("if-none-match"), catalogue.etag):
+        return not_modified(headers)
+    return json_response(catalogue.body, headers=headers)
+
+
+@router.get("/rules", response_model=List[schema.CategoryRuleResponse])
+async def get_rules(
+    jwt_data: JWTData = Depends(require_role([]))
+):
+    """
+    Get the user's categorization rules, in the order they are tried
+
+    Imported transactions get the category of the first rule matching their
+    description, before the built-in patterns are tried
+    """
+    return await service.list_category_rules(jwt_data.id_user)
+
+
+@router.post("/rules", status_code=status.HTTP_201_CREATED, response_model=schema.CategoryRuleResponse)
+async def add_rule(
+    rule: schema.CategoryRuleCreate,
+    jwt_data: JWTData = Depends(require_role([]))
+):
+    return await service.create_category_rule(jwt_data.id_user, rule)
+
+
+@router.put("/rules/{rule_id}", response_model=schema.CategoryRuleResponse)
+async def edit_rule(
+    rule_id: int,
+    rule: schema.CategoryRuleCreate,
+    jwt_data: JWTData = Depends(require_role([]))
+):
+    updated = await service.update_category_rule(jwt_data.id_user, rule_id, rule)
+
+    if updated is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Rule not found or not authorized to edit this rule"
+        )
+
+    return updated
+
+
+@router.delete("/rules/{rule_id}", status_code=status.HTTP_200_OK)
+async def remove_rule(
+    rule_id: int,
+    jwt_data: JWTData = Depends(require_role([]))
+):
+    deleted = await service.delete_category_rule(jwt_data.id_user, rule_id)
+
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Rule not found or not authorized to delete this rule"
+        )
+
+    return {"message": "Rule deleted successfully"}
@@ -0,0 +1,94 @@
+"""
+Matching of user category rules.
+
+All rules of a user compile into a single regex: one lookahead alternative per
+rule, anchored at the start of the description and ordered by priority. The
+regex engine tries the alternatives in order, so one `match` call per
+description finds the highest priority rule that applies, however many rules
+there are.
+
+Regex rules are user input run against every imported description, so
+`check_regex_rule` only accepts patterns that cannot backtrack
+catastrophically and that keep their meaning once combined with other rules.
+"""
+import re
+from re import _constants as sre_constants, _parser as sre_parser
+from typing import Any, Mapping, Optional, Sequence
+
+from loguru import logger
+
+from src.budget_transaction_category.constants import MAX_REGEX_RULE_LENGTH, RULE_MATCH_MAX_LENGTH
+
+_REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, sre_constants.POSSESSIVE_REPEAT)
+
+
+def _check_regex_tree(items, repeated: bool) -> None:
+    for op, av in items:
+        if op in (sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS):
+            # Group numbers shift once the rules are combined
+            raise re.error("backreferences are not supported")
+        if op in _REPEATS:
+            if repeated:
+                raise re.error("nested quantifiers are not supported")
+            _check_regex_tree(av[2], True)
+        elif op is sre_constants.BRANCH:
+            if repeated:
+                raise re.error("alternatives inside a quantifier are not supported")
+            for branch in av[1]:
+                _check_regex_tree(branch, repeated)
+        elif op is sre_constants.SUBPATTERN:
+            _check_regex_tree(av[3], repeated)
+        elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            _check_regex_tree(av[1], repeated)
+        elif op is sre_constants.ATOMIC_GROUP:
+            _check_regex_tree(av, repeated)
+
+
+def check_regex_rule(pattern: str) -> None:
+    """Raise re.error for a pattern the matcher does not accept"""
+    if len(pattern) > MAX_REGEX_RULE_LENGTH:
+        raise re.error(f"patterns are limited to {MAX_REGEX_RULE_LENGTH} characters")
+    # Named groups would clash with the rule markers
+    if "(?P<" in pattern:
+        raise re.error("named groups are not supported")
+    _check_regex_tree(sre_parser.parse(pattern), False)
+
+
+def rule_regex(pattern: str, match_type: str) -> str:
+    """Lookahead of one rule, to be tried at the start of the description"""
+    if match_type == "regex":
+        check_regex_rule(pattern)
+        body = rf"[\s\S]*?(?:{pattern})"
+    elif match_type == "starts_with":
+        body = rf"\s*{re.escape(pattern)}"
+    elif match_type == "exact":
+        body = rf"\s*{re.escape(pattern)}\s*\Z"
+    else:
+        body = rf"[\s\S]*?{re.escape(pattern)}"
+    return f"(?={body})"
+
+
+class CategoryRuleMatcher:
+    """A user's rules, highest priority first, compiled into one regex"""
+
+    def __init__(self, rules: Sequence[Mapping[str, Any]]):
+        self.category_ids = []
+        alternatives = []
+        for rule in rules:
+            try:
+                lookahead = rule_regex(rule["pattern"], rule["match_type"])
+            except re.error as ex:
+                # Saved before the current checks, never tried
+                logger.warning(f"Skipping category rule {rule.get('id')}: {ex}")
+                continue
+            # The empty group after each lookahead tells which alternative matched
+            alternatives.append(f"{lookahead}(?P<r{len(self.category_ids)}>)")
+            self.category_ids.append(rule["category_id"])
+        self._regex = re.compile(f"(?:{'|'.join(alternatives)})", re.IGNORECASE) if alternatives else None
+
+    def match(self, description: Optional[str]) -> Optional[int]:
+        """Category id of the first rule that matches, or None"""
+        if self._regex is None or not description:
+            return None
+        match = self._regex.match(description[:RULE_MATCH_MAX_LENGTH])
+        return self.category_ids[int(match.lastgroup[1:])] if match else None
@@ -1,4 +1,10 @@
+import re
+from datetime import datetime
 from typing import Optional
+
+from pydantic import Field, field_validator, model_validator
+from src.budget_transaction_category.constants import RULE_MATCH_TYPES
+from src.budget_transaction_category.rules import rule_regex
 from src.models import CustomModel
 
 
@@ -7,3 +13,36 @@ class TransactionCategoryResponse(CustomModel):
     category_key: str
     category_name: str
     description: Optional[str] = None
+
+
+class CategoryRuleCreate(CustomModel):
+    pattern: str = Field(..., min_length=1, max_length=255)
+    match_type: str = "contains"
+    priority: int = 0  # Higher first; ties in creation order
+    category_id: int
+
+    @field_validator('match_type')
+    @classmethod
+    def validate_match_type(cls, v):
+        if v not in RULE_MATCH_TYPES:
+            raise ValueError(f"Match type must be one of: {', '.join(RULE_MATCH_TYPES)}")
+        return v
+
+    @model_validator(mode="after")
+    def validate_pattern(self):
+        # Compiled the way the matcher combines it with the user's other rules
+        try:
+            re.compile(rule_regex(self.pattern, self.match_type))
+        except re.error as ex:
+            raise ValueError(f"Invalid regular expression: {ex}") from ex
+        return self
+
+
+class CategoryRuleResponse(CustomModel):
+    id: int
+    pattern: str
+    match_type: str
+    priority: int
+    category_id: int
+    created_at: datetime
+    updated_at: datetime
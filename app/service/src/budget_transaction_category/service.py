@@ -1,15 +1,144 @@
-from sqlalchemy import select
-from typing import Dict, Any, List
+from loguru import logger
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+from typing import Dict, Any, List, Mapping, Optional
 
-from src.database import fetch_all, budget_transaction_category
+from src.budget_transaction_category.catalogue import CategoryCatalogue, get_category_catalogue, set_category_catalogue
+from src.budget_transaction_category.constants import CATEGORY_IDS, MAX_RULES_PER_USER, RULE_MATCHER_CACHE_SIZE
+from src.budget_transaction_category.exceptions import TooManyCategoryRules, UnknownCategory
+from src.budget_transaction_category.rules import CategoryRuleMatcher
+from src.budget_transaction_category.schema import CategoryRuleCreate
+from src.cache import VersionedCache
+from src.database import engine, fetch_all, fetch_one, budget_transaction_category, user_category_rule, user_data_version
 
 
 
-async def get_transaction_categories() -> List[Dict[str, Any]]:
+async def load_category_catalogue() -> CategoryCatalogue:
     """
-    Get all transaction categories for dropdown display in the client
-    Returns a list of categories with their IDs, keys, and names
+    Read the transaction categories into the catalogue every request uses:
+    at startup, and again when a category added since is looked up
     """
-    stmt = select(budget_transaction_category)
-    categories = await fetch_all(stmt)
-    return categories
+    catalogue = CategoryCatalogue(await fetch_all(select(budget_transaction_category)))
+
+    # The patterns name categories by key, those missing from the table are never assigned
+    missing = [key for key in CATEGORY_IDS if key not in catalogue.by_key]
+    if missing:
+        logger.warning(f"Transaction categories missing from the database: {missing}")
+
+    set_category_catalogue(catalogue)
+    return catalogue
+
+
+async def get_category(category_id: int) -> Optional[Mapping[str, Any]]:
+    """The category with this id, or None; looked up in the database when the catalogue doesn't have it"""
+    category = get_category_catalogue().by_id.get(category_id)
+    if category is None:
+        row = await fetch_one(
+            select(budget_transaction_category.c.id).where(budget_transaction_category.c.id == category_id)
+        )
+        if row is not None:
+            logger.warning(f"Transaction category {category_id} is not in the catalogue, reloading it")
+            category = (await load_category_catalogue()).by_id.get(category_id)
+    return category
+
+
+async def require_category(category_id: int) -> None:
+    if await get_category(category_id) is None:
+        raise UnknownCategory()
+
+
+# region Category rules
+
+_rule_matchers = VersionedCache("category_rules", RULE_MATCHER_CACHE_SIZE)
+
+# Tried in this order, the first rule that matches wins
+_RULE_ORDER = (user_category_rule.c.priority.desc(), user_category_rule.c.id)
+
+
+def bump_category_rules_version(user_id: int):
+    """Statement invalidating the user's cached rule matcher, to run with every change to the rules"""
+    stmt = pg_insert(user_data_version).values(user_id=user_id, category_rules_version=1)
+    return stmt.on_conflict_do_update(
+        index_elements=[user_data_version.c.user_id],
+        set_={
+            "category_rules_version": user_data_version.c.category_rules_version + 1,
+            "updated_at": func.now(),
+        },
+    )
+
+
+async def get_category_rules_version(user_id: int) -> int:
+    row = await fetch_one(
+        select(user_data_version.c.category_rules_version).where(user_data_version.c.user_id == user_id)
+    )
+    return row["category_rules_version"] if row else 0
+
+
+async def get_category_rule_matcher(user_id: int) -> CategoryRuleMatcher:
+    """The user's rules compiled into one matcher, compiled again only after they change"""
+    version = await get_category_rules_version(user_id)
+    matcher = _rule_matchers.get(user_id, version)
+    if matcher is None:
+        rules = await list_category_rules(user_id)
+        matcher = CategoryRuleMatcher(rules)
+        _rule_matchers.set(user_id, version, matcher)
+    return matcher
+
+
+async def list_category_rules(user_id: int) -> List[Dict[str, Any]]:
+    return await fetch_all(
+        select(user_category_rule).where(user_category_rule.c.user_id == user_id).order_by(*_RULE_ORDER)
+    )
+
+
+async def _count_category_rules(conn: AsyncConnection, user_id: int) -> int:
+    return (await conn.execute(
+        select(func.count()).select_from(user_category_rule).where(user_category_rule.c.user_id == user_id)
+    )).scalar_one()
+
+
+async def create_category_rule(user_id: int, rule: CategoryRuleCreate) -> Dict[str, Any]:
+    await require_category(rule.category_id)
+    async with engine.begin() as conn:
+        # The version row lock serializes the user's rule changes, so the limit holds under concurrent requests
+        await conn.execute(bump_category_rules_version(user_id))
+        if await _count_category_rules(conn, user_id) >= MAX_RULES_PER_USER:
+            raise TooManyCategoryRules()
+
+        row = (await conn.execute(
+            user_category_rule.insert()
+            .values(user_id=user_id, **rule.model_dump())
+            .returning(user_category_rule)
+        )).one()
+    return row._asdict()
+
+
+async def update_category_rule(user_id: int, rule_id: int, rule: CategoryRuleCreate) -> Optional[Dict[str, Any]]:
+    """The updated rule, None when the user has no rule with this id"""
+    await require_category(rule.category_id)
+    async with engine.begin() as conn:
+        row = (await conn.execute(
+            update(user_category_rule)
+            .where(user_category_rule.c.id == rule_id, user_category_rule.c.user_id == user_id)
+            .values(**rule.model_dump(), updated_at=func.now())
+            .returning(user_category_rule)
+        )).one_or_none()
+        if row is None:
+            return None
+        await conn.execute(bump_category_rules_version(user_id))
+    return row._asdict()
+
+
+async def delete_category_rule(user_id: int, rule_id: int) -> bool:
+    async with engine.begin() as conn:
+        result = await conn.execute(
+            delete(user_category_rule)
+            .where(user_category_rule.c.id == rule_id, user_category_rule.c.user_id == user_id)
+        )
+        if result.rowcount == 0:
+            return False
+        await conn.execute(bump_category_rules_version(user_id))
+    return True
+
+# endregion Category rules
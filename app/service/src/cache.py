@@ -0,0 +1,40 @@
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from src.monitoring.metrics import CACHE_REQUESTS
+
+
+class VersionedCache:
+    """
+    Per-process LRU cache of results computed from one user's data.
+
+    Every value is stored with the user's data version it was computed from and
+    is only returned while that version is still current. Any write to the
+    user's entries bumps the version (see `user_data_version`), so stale
+    values are never served and nothing has to be invalidated explicitly.
+    Runs on the event loop thread, so no locking is needed.
+    """
+
+    def __init__(self, name: str, max_entries: int):
+        self.name = name
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[int, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, version: int) -> Optional[Any]:
+        cached = self._entries.get(key)
+        if cached is None or cached[0] != version:
+            CACHE_REQUESTS.inc(cache=self.name, result="miss")
+            return None
+
+        self._entries.move_to_end(key)
+        CACHE_REQUESTS.inc(cache=self.name, result="hit")
+        return cached[1]
+
+    def set(self, key: Hashable, version: int, value: Any) -> None:
+        self._entries[key] = (version, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -0,0 +1,35 @@
+"""
+Conditional GET.
+
+Responses that carry an `ETag` let the client revalidate its copy with
+`If-None-Match`; while the tag still matches, a 304 without a body is sent
+instead, ideally before the response is even computed.
+"""
+import hashlib
+from typing import Any, Dict, Optional
+
+from fastapi import Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong entity tag of the response `parts` identify"""
+    digest = hashlib.sha256(":".join(str(part) for part in parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether the client's `If-None-Match` header names `etag` (weak comparison, as RFC 9110 asks for it)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def cache_headers(etag: str, cache_control: str) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
+def not_modified(headers: Dict[str, str]) -> Response:
+    # A 304 repeats the validators and caching headers the 200 would have sent
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
@@ -16,9 +16,23 @@ class Config(BaseSettings):
     ENV_ENVIRONMENT: Environment = Environment(os.getenv("ENV_ENVIRONMENT", "LOCAL"))
     APP_VERSION: str = "1"
 
+    # Import the statement parsing stack in the background once the server is up
+    ENV_PREWARM_PARSERS: bool = True
+
     ENV_CORS_ORIGINS: list[str]
     ENV_CORS_HEADERS: list[str]
 
+    # Reverse proxies (addresses or CIDR ranges) whose X-Forwarded-For is believed when
+    # rate limiting by client IP. Behind Railway's proxy every connection comes from the
+    # proxy, so set its range (e.g. ["10.0.0.0/8"]) or all clients share one limit.
+    # Empty: use the connection's address, for deployments without a proxy
+    ENV_TRUSTED_PROXIES: list[str] = []
+
+    # Where rate limit buckets live: "memory" keeps them per process, so with several
+    # workers every limit is multiplied by the worker count; "postgres" shares them
+    ENV_RATE_LIMIT_BACKEND: str = "memory"
+    ENV_RATE_LIMIT_SWEEP_INTERVAL: float = 10 * 60  # seconds between deletions of refilled buckets
+
 settings = Config()
 
 app_configs: dict[str, Any] = {"title": "App API"}
@@ -1,11 +1,16 @@
 from typing import Any, Dict, List
 from sqlalchemy import (
+    BigInteger,
     Boolean,
+    CheckConstraint,
     Column,
     DateTime,
     Date,
     Delete,
+    Float,
     ForeignKey,
+    Function,
+    Index,
     Integer,
     LargeBinary,
     MetaData,
@@ -27,10 +32,14 @@ from sqlalchemy.ext.asyncio import create_async_engine
 
 from src.config import settings
 from src.constants import DB_NAMING_CONVENTION
+from src.monitoring.metrics import register_pool_metrics
+from src.monitoring.timing import instrument_engine
 
 DATABASE_URL = str(settings.ENV_DATABASE_URL)
 
 engine = create_async_engine(DATABASE_URL)
+instrument_engine(engine.sync_engine)
+register_pool_metrics(engine.sync_engine.pool)
 metadata = MetaData(naming_convention=DB_NAMING_CONVENTION)
 
 
@@ -66,8 +75,8 @@ auth_refresh_token = Table(
     Column("uuid", UUID, primary_key=True),
     Column("id_user", Integer, ForeignKey(
         "mynab.auth_user.id")),
-    Column("refresh_token", String, nullable=False),
-    Column("expires_at", DateTime, nullable=False),
+    Column("token_hash", String(64), nullable=False, unique=True),  # sha256 hex of the issued token
+    Column("expires_at", DateTime, nullable=False, index=True),
     Column("created_at", DateTime, server_default=func.now(), nullable=False),
     Column("updated_at", DateTime, server_default=func.now(), onupdate=func.now()),
     schema="mynab",
@@ -85,6 +94,21 @@ auth_user_activity_log = Table(
     schema="mynab",
 )
 
+# Token buckets of the shared rate limit backend (see `src.rate_limit`). Unlogged:
+# losing them on a crash only resets the limits
+rate_limit_bucket = Table(
+    "rate_limit_bucket",
+    metadata,
+    Column("key", String(255), primary_key=True),
+    Column("tokens", Float, nullable=False),
+    Column("allowed", Boolean, nullable=False),  # Whether the last request took a token
+    Column("updated_at", DateTime, server_default=func.now(), nullable=False),
+    Column("refilled_at", DateTime, nullable=False),  # Full again by then, the row can go
+    Index("rate_limit_bucket_refilled_at_idx", "refilled_at"),
+    schema="mynab",
+    prefixes=["UNLOGGED"],
+)
+
 # Email verification codes for passwordless authentication
 auth_email_verification = Table(
     "auth_email_verification",
@@ -100,6 +124,27 @@ auth_email_verification = Table(
     Column("ip_address", String(45), nullable=True),  # Track IP for security
     Column("user_agent", String(255), nullable=True),  # Track user agent for security
     Column("created_at", DateTime, server_default=func.now(), nullable=False),
+    # A single live code per email and purpose, replaced on every new request
+    Index("auth_email_verification_email_code_type_idx", "email", "code_type", unique=True),
+    Index("ix_auth_email_verification_expires_at", "expires_at"),
+    schema="mynab",
+)
+
+# Outgoing emails, written by request handlers and delivered by the mail worker
+mail_outbox = Table(
+    "mail_outbox",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("message", JSON, nullable=False),  # provider payload: from, to, subject, html, text, ...
+    Column("status", String(20), nullable=False, server_default="pending"),  # 'pending', 'sending', 'sent', 'failed'
+    Column("attempts", Integer, nullable=False, server_default="0"),
+    Column("max_attempts", Integer, nullable=False, server_default="5"),
+    Column("next_attempt_at", DateTime, server_default=func.now(), nullable=False),
+    Column("last_error", Text, nullable=True),
+    Column("provider_message_id", String(255), nullable=True),
+    Column("created_at", DateTime, server_default=func.now(), nullable=False),
+    Column("sent_at", DateTime, nullable=True),
+    Index("mail_outbox_status_next_attempt_at_idx", "status", "next_attempt_at"),
     schema="mynab",
 )
 
@@ -145,9 +190,113 @@ budget_entry = Table(
     Column("file_id", Integer, ForeignKey("mynab.files.id"), nullable=True),
     Column("created_at", DateTime, server_default=func.now(), nullable=False),
     Column("updated_at", DateTime, server_default=func.now(), onupdate=func.now()),
+    # Newest first pages of a user's entries (search keyset pagination)
+    Index("budget_entry_user_id_date_id_idx", "user_id", "date", "id"),
     schema="mynab",
 )
 
+# Progress of the category reclassification job, one row per scope ('all' or 'user:<id>')
+budget_reclassification = Table(
+    "budget_reclassification",
+    metadata,
+    Column("scope", String(50), primary_key=True),
+    Column("matcher_version", String(64), nullable=False),  # Patterns the pass runs with
+    Column("last_entry_id", Integer, nullable=False, server_default="0"),  # Entries up to this id are done
+    Column("updated_count", Integer, nullable=False, server_default="0"),
+    Column("started_at", DateTime, server_default=func.now(), nullable=False),
+    Column("updated_at", DateTime, server_default=func.now(), onupdate=func.now(), nullable=False),
+    Column("completed_at", DateTime, nullable=True),
+    schema="mynab",
+)
+
+# Exchange rates: 1 `base` is worth `rate` `quote` from `date` until the pair's next rate
+fx_rate = Table(
+    "fx_rate",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("date", Date, nullable=False),
+    Column("base", String(3), nullable=False),
+    Column("quote", String(3), nullable=False),
+    Column("rate", DECIMAL(38, 12), nullable=False),
+    Column("source", String(50), nullable=True),  # e.g. 'csv', 'admin'
+    Column("created_at", DateTime, server_default=func.now(), nullable=False),
+    Column("updated_at", DateTime, server_default=func.now(), onupdate=func.now(), nullable=False),
+    # Latest rate of a pair on or before a date
+    Index("fx_rate_base_quote_date_idx", "base", "quote", "date", unique=True),
+    schema="mynab",
+)
+
+# Single row counting the statements that changed fx_rate (bumped by a trigger),
+# so cached rates and ETags are checked without scanning the table
+fx_rate_version = Table(
+    "fx_rate_version",
+    metadata,
+    Column("id", Integer, primary_key=True, server_default="1"),
+    Column("version", BigInteger, nullable=False, server_default="0"),
+    Column("updated_at", DateTime, server_default=func.now(), nullable=False),
+    CheckConstraint("id = 1", name="fx_rate_version_single_row"),
+    schema="mynab",
+)
+
+# Per-user versions of cached data. `version` is bumped by triggers on budget_entry and
+# files on every write to a user's entries or files; results computed from them are
+# cached, and their ETags derived, under the version they were read at. `category_rules_version` is bumped with every
+# change to the user's category rules, whose compiled matcher is cached the same way
+user_data_version = Table(
+    "user_data_version",
+    metadata,
+    Column("user_id", Integer, ForeignKey("mynab.auth_user.id", ondelete="CASCADE"), primary_key=True),
+    Column("version", BigInteger, nullable=False, server_default="0"),
+    Column("category_rules_version", BigInteger, nullable=False, server_default="0"),
+    Column("updated_at", DateTime, server_default=func.now(), nullable=False),
+    schema="mynab",
+)
+
+# User defined categorization rules, tried before the global TRANSACTION_CATEGORIES patterns
+user_category_rule = Table(
+    "user_category_rule",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("user_id", Integer, ForeignKey("mynab.auth_user.id", ondelete="CASCADE"), nullable=False),
+    Column("pattern", String(255), nullable=False),
+    Column("match_type", String(20), nullable=False, server_default="contains"),  # see RULE_MATCH_TYPES
+    Column("priority", Integer, nullable=False, server_default="0"),  # Higher first
+    Column("category_id", Integer, ForeignKey("mynab.budget_transaction_category.id"), nullable=False),
+    Column("created_at", DateTime, server_default=func.now(), nullable=False),
+    Column("updated_at", DateTime, server_default=func.now(), onupdate=func.now(), nullable=False),
+    Index("user_category_rule_user_id_idx", "user_id"),
+    schema="mynab",
+)
+
+# Category of each normalized description (see `description_hash`) of a user, learned
+# from imports ("classifier", valid while the patterns are at `matcher_version`) and
+# from the user's corrections ("manual", always valid)
+category_memo = Table(
+    "category_memo",
+    metadata,
+    Column("user_id", Integer, ForeignKey("mynab.auth_user.id", ondelete="CASCADE"), primary_key=True),
+    Column("description_hash", String(64), primary_key=True),
+    Column("category_id", Integer, ForeignKey("mynab.budget_transaction_category.id"), nullable=False),
+    Column("source", String(20), nullable=False),
+    Column("matcher_version", String(64), nullable=True),
+    Column("updated_at", DateTime, server_default=func.now(), onupdate=func.now(), nullable=False),
+    schema="mynab",
+)
+
+
+def search_text(value: Any) -> Function:
+    """`value` lower cased and without accents, as the description search index stores it"""
+    return func.mynab.f_unaccent(func.lower(value))
+
+
+# Trigram index for substring and fuzzy matches on descriptions (pg_trgm, see the search migration)
+Index(
+    "budget_entry_description_trgm_idx",
+    search_text(budget_entry.c.description).label("description_search_text"),
+    postgresql_using="gin",
+    postgresql_ops={"description_search_text": "gin_trgm_ops"},
+)
+
 
 async def fetch_one(select_query: Select | Insert | Update) -> dict[str, Any] | None:
     async with engine.begin() as conn:
@@ -1,3 +1,4 @@
+import math
 from typing import Any
 
 from fastapi import HTTPException, status
@@ -39,3 +40,12 @@ class NotAuthenticated(DetailedHTTPException):
 
     def __init__(self) -> None:
         super().__init__(headers={"WWW-Authenticate": "Bearer"})
+
+
+class TooManyRequests(DetailedHTTPException):
+    STATUS_CODE = status.HTTP_429_TOO_MANY_REQUESTS
+    DETAIL = "Too many requests, please try again later"
+
+    def __init__(self, retry_after: float | None = None) -> None:
+        headers = {"Retry-After": str(math.ceil(retry_after))} if retry_after else None
+        super().__init__(headers=headers)
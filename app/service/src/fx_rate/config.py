@@ -0,0 +1,14 @@
+from typing import Optional
+
+from pydantic_settings import BaseSettings
+
+
+class FxRateConfig(BaseSettings):
+    # Rates loaded by `python -m src.fx_rate.seed` (run by entrypoint.sh when set)
+    FX_RATES_CSV: Optional[str] = None
+
+    # Currencies tried as intermediate when a pair has no rate of its own, e.g. ARS -> USD -> AUD
+    FX_PIVOT_CURRENCIES: list[str] = ["USD", "EUR"]
+
+
+fx_rate_config = FxRateConfig()
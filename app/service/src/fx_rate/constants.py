@@ -0,0 +1,6 @@
+# Columns of the rates CSV, one rate per line: 1 base is worth `rate` quote on `date`
+CSV_COLUMNS = ("date", "base", "quote", "rate")
+
+
+class ERRORCODE:
+    INVALID_FX_RATES = "The exchange rates could not be read. Expected columns: date, base, quote, rate."
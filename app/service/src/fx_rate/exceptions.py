@@ -0,0 +1,11 @@
+from src.exceptions import BadRequest
+from src.fx_rate.constants import ERRORCODE
+
+
+class InvalidFxRates(BadRequest):
+    DETAIL = ERRORCODE.INVALID_FX_RATES
+    ERROR_CODE = "INVALID_FX_RATES"
+
+    def __init__(self, detail: str = None):
+        super().__init__(detail=f"{self.DETAIL} {detail}" if detail else self.DETAIL)
+        self.error_code = self.ERROR_CODE
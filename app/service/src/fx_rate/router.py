@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, status
+
+from src.auth_user.dependencies import require_role
+from src.auth_user.schemas import JWTData
+from src.constants import ROLES
+from src.fx_rate.exceptions import InvalidFxRates
+from src.fx_rate.schemas import FxRatesUpload, FxRatesUploadResponse
+from src.fx_rate.service import parse_fx_rates_csv, upsert_fx_rates
+
+
+router = APIRouter()
+
+
+@router.post("/rates", status_code=status.HTTP_200_OK, response_model=FxRatesUploadResponse)
+async def post_rates(
+    upload: FxRatesUpload,
+    jwt_data: JWTData = Depends(require_role([ROLES.ADMIN]))
+):
+    """
+    Add or replace exchange rates, as a list (`rates`) and/or CSV text (`csv`)
+    with a date,base,quote,rate header. A rate stored for the same pair and
+    date is replaced.
+    """
+    rates = list(upload.rates or [])
+    if upload.csv:
+        rates += parse_fx_rates_csv(upload.csv)
+    if not rates:
+        raise InvalidFxRates("No rates were sent.")
+
+    count = await upsert_fx_rates(rates, source="admin")
+    return {"message": f"Stored {count} exchange rates", "count": count}
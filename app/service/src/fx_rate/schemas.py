@@ -0,0 +1,38 @@
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
+
+from pydantic import field_validator
+from src.models import CustomModel
+
+
+class FxRate(CustomModel):
+    date: date
+    base: str
+    quote: str
+    rate: Decimal
+
+    @field_validator('base', 'quote')
+    @classmethod
+    def validate_currency(cls, v):
+        v = v.strip().upper()
+        if len(v) != 3 or not v.isalpha():
+            raise ValueError("Currency must be a three letter code, e.g. 'USD'")
+        return v
+
+    @field_validator('rate')
+    @classmethod
+    def validate_rate(cls, v):
+        if not v.is_finite() or v <= 0:
+            raise ValueError("Rate must be a positive number")
+        return v
+
+
+class FxRatesUpload(CustomModel):
+    rates: Optional[List[FxRate]] = None
+    csv: Optional[str] = None  # Same rates as CSV text with a date,base,quote,rate header
+
+
+class FxRatesUploadResponse(CustomModel):
+    message: str
+    count: int
@@ -0,0 +1,34 @@
+"""
+Load exchange rates from a local CSV file (date,base,quote,rate per line).
+
+    python -m src.fx_rate.seed [rates.csv]
+
+Without a path, FX_RATES_CSV is used. Rates already stored for the same pair
+and date are replaced, so the same file can be loaded on every deploy.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+from loguru import logger
+
+from src.fx_rate.config import fx_rate_config
+from src.fx_rate.service import parse_fx_rates_csv, upsert_fx_rates
+
+
+async def seed(path: str) -> int:
+    rates = parse_fx_rates_csv(Path(path).read_text(encoding="utf-8"))
+    count = await upsert_fx_rates(rates, source="csv")
+    logger.info(f"Loaded {count} exchange rates from {path}")
+    return count
+
+
+def main() -> None:
+    path = sys.argv[1] if len(sys.argv) > 1 else fx_rate_config.FX_RATES_CSV
+    if not path:
+        sys.exit("No rates file: pass a path or set FX_RATES_CSV")
+    asyncio.run(seed(path))
+
+
+if __name__ == "__main__":
+    main()
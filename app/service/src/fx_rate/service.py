@@ -0,0 +1,152 @@
+"""
+Exchange rates.
+
+Summaries convert amounts inside their SQL aggregation with the latest rate of
+the pair, or of its inverse, on or before each day. `FxRates` keeps the whole
+table in memory for what that join can't do, going through a pivot currency,
+converting all the days of a currency in one pass. It is reloaded only when
+`fx_rate_version`, bumped by a trigger, changes.
+"""
+import csv
+import io
+from bisect import bisect_right
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from pydantic import ValidationError
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from src.database import engine, fetch_all, fetch_one, fx_rate, fx_rate_version
+from src.fx_rate.constants import CSV_COLUMNS
+from src.fx_rate.exceptions import InvalidFxRates
+from src.fx_rate.schemas import FxRate
+
+ONE = Decimal(1)
+
+
+def parse_fx_rates_csv(text: str) -> List[FxRate]:
+    reader = csv.DictReader(io.StringIO(text.lstrip("\ufeff")))
+    header = {name.strip().lower() for name in reader.fieldnames or []}
+    if not set(CSV_COLUMNS) <= header:
+        raise InvalidFxRates()
+
+    rates = []
+    for line, row in enumerate(reader, start=2):
+        row = {name.strip().lower(): (value or "").strip() for name, value in row.items() if name}
+        try:
+            rates.append(FxRate(**{column: row[column] for column in CSV_COLUMNS}))
+        except ValidationError as ex:
+            raise InvalidFxRates(f"Line {line}: {ex.errors()[0]['msg']}") from ex
+    return rates
+
+
+async def upsert_fx_rates(rates: List[FxRate], source: str) -> int:
+    """Insert the rates, replacing those already stored for the same pair and date"""
+    # The last one wins when a pair and date repeat, Postgres rejects updating a row twice in one statement
+    rows = {
+        (rate.base, rate.quote, rate.date): {
+            "date": rate.date,
+            "base": rate.base,
+            "quote": rate.quote,
+            "rate": rate.rate,
+            "source": source,
+        }
+        for rate in rates
+    }
+    if not rows:
+        return 0
+
+    stmt = pg_insert(fx_rate)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[fx_rate.c.base, fx_rate.c.quote, fx_rate.c.date],
+        set_={"rate": stmt.excluded.rate, "source": stmt.excluded.source, "updated_at": func.now()},
+    )
+    async with engine.begin() as conn:
+        await conn.execute(stmt, list(rows.values()))
+    return len(rows)
+
+
+class FxRates:
+    """Rates of every pair by date, for conversions at serving time"""
+
+    def __init__(self, rows: Iterable[Dict[str, Any]]):
+        self._pairs: Dict[tuple[str, str], tuple[List[date], List[Decimal]]] = {}
+        for row in sorted(rows, key=lambda row: row["date"]):
+            dates, rates = self._pairs.setdefault((row["base"], row["quote"]), ([], []))
+            dates.append(row["date"])
+            rates.append(row["rate"])
+
+    def _latest(self, base: str, quote: str, days: Sequence[date]) -> List[Optional[Decimal]]:
+        """Latest rate on or before each of the sorted `days`; each search starts where the last one ended"""
+        series = self._pairs.get((base, quote))
+        if not series:
+            return [None] * len(days)
+
+        dates, rates = series
+        latest = []
+        index = 0
+        for day in days:
+            index = bisect_right(dates, day, index)
+            latest.append(rates[index - 1] if index else None)
+        return latest
+
+    def _pair_rates(self, base: str, quote: str, days: Sequence[date]) -> List[Optional[Decimal]]:
+        return [
+            rate if rate is not None else (ONE / inverse if inverse is not None else None)
+            for rate, inverse in zip(self._latest(base, quote, days), self._latest(quote, base, days))
+        ]
+
+    def rates(
+        self,
+        base: str,
+        quote: str,
+        days: Iterable[date],
+        pivots: Sequence[str] = ()
+    ) -> Dict[date, Optional[Decimal]]:
+        """`rate` on each of `days` at once: every series involved is searched once for all of them"""
+        days = sorted(set(days))
+        if base == quote:
+            return dict.fromkeys(days, ONE)
+
+        rates = dict(zip(days, self._pair_rates(base, quote, days)))
+        missing = [day for day in days if rates[day] is None]
+        for pivot in pivots:
+            if not missing:
+                break
+            if pivot in (base, quote):
+                continue
+            to_pivot = self._pair_rates(base, pivot, missing)
+            from_pivot = self._pair_rates(pivot, quote, missing)
+            for day, to_rate, from_rate in zip(missing, to_pivot, from_pivot):
+                if to_rate is not None and from_rate is not None:
+                    rates[day] = to_rate * from_rate
+            missing = [day for day in missing if rates[day] is None]
+        return rates
+
+    def rate(self, base: str, quote: str, on: date, pivots: Sequence[str] = ()) -> Optional[Decimal]:
+        """Value of 1 `base` in `quote` on `on`, directly or through one of `pivots`; None without rates"""
+        return self.rates(base, quote, [on], pivots)[on]
+
+
+# Version of the table the cached rates were loaded from
+_fx_rates: Optional[tuple[int, FxRates]] = None
+
+
+async def get_fx_rates_version() -> int:
+    """Counter bumped by a trigger on every statement changing the rates table"""
+    row = await fetch_one(select(fx_rate_version.c.version).where(fx_rate_version.c.id == 1))
+    return row["version"] if row else 0
+
+
+async def get_fx_rates() -> FxRates:
+    """All rates, loaded again only when the table changed since the last call"""
+    global _fx_rates
+
+    version = await get_fx_rates_version()
+
+    if _fx_rates is None or _fx_rates[0] != version:
+        rows = await fetch_all(select(fx_rate.c.date, fx_rate.c.base, fx_rate.c.quote, fx_rate.c.rate))
+        _fx_rates = (version, FxRates(rows))
+    return _fx_rates[1]
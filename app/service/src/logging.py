@@ -1,12 +1,14 @@
 import json
 from typing import Callable, Awaitable, Any, Optional
-from fastapi import Request, Response
+from fastapi import Request, Response, status
 
 from starlette.types import Message
 from src.auth_user.exceptions import InvalidToken
 from src.database import execute, auth_user_activity_log
 from src.auth_user.jwt import parse_jwt_user_data_optional
 from src.auth_user.schemas import JWTData
+from src.monitoring.metrics import ACTIVITY_LOG_IN_FLIGHT
+from src.monitoring.timing import timed
 
 
 async def log_user_activity(request: Request, id_user: Optional[int], action: str, details: dict[str, Any]):
@@ -39,6 +41,14 @@ async def log_middleware(request: Request, call_next: Callable[[Request], Awaita
 
     response = await call_next(request)
 
+    # Throttled requests are rejected without touching the database
+    if response.status_code == status.HTTP_429_TOO_MANY_REQUESTS:
+        return response
+
+    # Metrics scrapes are not user activity
+    if request.url.path == "/metrics":
+        return response
+
     token = request.headers.get("Authorization")
     if token:
         token = token.split(" ")[1]
@@ -67,6 +77,11 @@ async def log_middleware(request: Request, call_next: Callable[[Request], Awaita
         "body": body_data
     }
 
-    await log_user_activity(request, id_user, action, details)
+    ACTIVITY_LOG_IN_FLIGHT.inc()
+    try:
+        with timed("activity_log"):
+            await log_user_activity(request, id_user, action, details)
+    finally:
+        ACTIVITY_LOG_IN_FLIGHT.dec()
 
     return response
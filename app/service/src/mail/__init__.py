@@ -1,16 +1,23 @@
 from .service import MailService
 from .config import MailConfig
 from .exceptions import MailServiceError, MailConfigurationError, MailSendError
-from .dependencies import get_mail_service, get_mail_config
+from .dependencies import get_mail_service, get_mail_config, get_mail_outbox_worker
+from .transport import MailTransport, ResendTransport, FileTransport
+from .worker import MailOutboxWorker
 from .router import router
 
 __all__ = [
     "MailService",
-    "MailConfig", 
+    "MailConfig",
+    "MailTransport",
+    "ResendTransport",
+    "FileTransport",
+    "MailOutboxWorker",
     "MailServiceError",
     "MailConfigurationError",
     "MailSendError",
     "get_mail_service",
     "get_mail_config",
+    "get_mail_outbox_worker",
     "router"
 ]
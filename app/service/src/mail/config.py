@@ -1,7 +1,7 @@
 """Mail service configuration."""
 import os
 from typing import Optional
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, field_validator, model_validator
 from .exceptions import MailConfigurationError
 
 
@@ -17,6 +17,25 @@ class MailConfig(BaseModel):
 
     # Template settings
     template_dir: Optional[str] = None
+    template_bytecode_cache: bool = True
+    template_cache_dir: Optional[str] = None  # defaults to a per-user temp directory
+
+    # Transport: "resend" or "file" (writes messages to file_transport_dir)
+    transport: str = "resend"
+    file_transport_dir: Optional[str] = None
+
+    # Outbox worker settings
+    outbox_poll_interval: float = 1.0  # seconds
+    outbox_batch_size: int = 20
+    outbox_concurrency: int = 4
+    outbox_max_attempts: int = 5
+    outbox_backoff_seconds: float = 30.0
+    outbox_max_backoff_seconds: float = 60 * 60
+    outbox_lease_seconds: float = 5 * 60  # a claimed message is retried after this
+    # Sent and failed rows hold the rendered message (login codes included), purge them after this
+    outbox_retention_seconds: float = 24 * 60 * 60
+    outbox_purge_interval: float = 60 * 60
+    outbox_purge_batch_size: int = 500
 
     class Config:
         env_prefix = "MAIL_"
@@ -33,19 +52,29 @@ class MailConfig(BaseModel):
             from_email=os.getenv("ENV_MAIL_FROM_EMAIL"),
             from_name=os.getenv("ENV_MAIL_FROM_NAME", "MYNAB"),
             template_dir=os.getenv(
-                "ENV_MAIL_TEMPLATE_DIR", default_template_dir)
+                "ENV_MAIL_TEMPLATE_DIR", default_template_dir),
+            template_cache_dir=os.getenv("ENV_MAIL_TEMPLATE_CACHE_DIR"),
+            transport=os.getenv("ENV_MAIL_TRANSPORT", "resend"),
+            file_transport_dir=os.getenv("ENV_MAIL_FILE_TRANSPORT_DIR"),
+            outbox_poll_interval=float(os.getenv("ENV_MAIL_OUTBOX_POLL_INTERVAL", 1.0)),
+            outbox_concurrency=int(os.getenv("ENV_MAIL_OUTBOX_CONCURRENCY", 4)),
+            outbox_max_attempts=int(os.getenv("ENV_MAIL_OUTBOX_MAX_ATTEMPTS", 5)),
+            outbox_retention_seconds=float(os.getenv("ENV_MAIL_OUTBOX_RETENTION_SECONDS", 24 * 60 * 60)),
         )
 
-    @field_validator("api_key")
-    @classmethod
-    def validate_api_key(cls, v: str) -> str:
-        if not v:
-            raise MailConfigurationError("Resend API key is required")
-        return v
-
     @field_validator("from_email")
     @classmethod
     def validate_from_email(cls, v: str) -> str:
         if not v:
             raise MailConfigurationError("From email is required")
         return v
+
+    @model_validator(mode="after")
+    def validate_transport(self) -> "MailConfig":
+        if self.transport == "resend" and not self.api_key:
+            raise MailConfigurationError("Resend API key is required")
+        if self.transport == "file" and not self.file_transport_dir:
+            raise MailConfigurationError("File transport directory is required")
+        if self.transport not in ("resend", "file"):
+            raise MailConfigurationError(f"Unknown mail transport: {self.transport}")
+        return self
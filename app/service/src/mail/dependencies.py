@@ -2,6 +2,7 @@
 from functools import lru_cache
 from .config import MailConfig
 from .service import MailService
+from .worker import MailOutboxWorker
 
 
 @lru_cache()
@@ -15,3 +16,9 @@ def get_mail_service() -> MailService:
     """Get mail service instance."""
     config = get_mail_config()
     return MailService(config)
+
+
+@lru_cache()
+def get_mail_outbox_worker() -> MailOutboxWorker:
+    """Get the outbox worker, sharing the mail service transport."""
+    return MailOutboxWorker(get_mail_config(), get_mail_service().transport)
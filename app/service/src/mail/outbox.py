@@ -0,0 +1,134 @@
+"""Persistence for the outgoing mail queue."""
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, delete, func, insert, select, update
+
+from src.database import execute, fetch_all, fetch_one, mail_outbox
+
+
+async def enqueue_message(message: Dict[str, Any], max_attempts: int) -> int:
+    """Store a message for background delivery and return its outbox ID."""
+    insert_query = insert(mail_outbox).values(
+        message=message,
+        max_attempts=max_attempts,
+    ).returning(mail_outbox.c.id)
+
+    result = await fetch_one(insert_query)
+    return result["id"]
+
+
+async def claim_due_messages(limit: int, lease_seconds: float) -> List[Dict[str, Any]]:
+    """
+    Claim up to `limit` messages that are due for delivery.
+
+    Claimed rows move to 'sending' and are leased until `lease_seconds` from now,
+    so a worker that dies mid-send does not lose them. SKIP LOCKED lets several
+    workers poll the same table without blocking each other.
+    """
+    await fail_expired_leases()
+
+    due_messages = (
+        select(mail_outbox.c.id)
+        .where(
+            and_(
+                mail_outbox.c.status.in_(("pending", "sending")),
+                mail_outbox.c.next_attempt_at <= func.now(),
+                mail_outbox.c.attempts < mail_outbox.c.max_attempts
+            )
+        )
+        .order_by(mail_outbox.c.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+
+    claim_query = (
+        update(mail_outbox)
+        .where(mail_outbox.c.id.in_(due_messages))
+        .values(
+            status="sending",
+            attempts=mail_outbox.c.attempts + 1,
+            next_attempt_at=func.now() + timedelta(seconds=lease_seconds)
+        )
+        .returning(mail_outbox)
+    )
+
+    return await fetch_all(claim_query)
+
+
+async def fail_expired_leases() -> None:
+    """
+    Give up on messages whose lease expired on their final attempt.
+
+    The worker that claimed them died before recording an outcome, and they
+    have no attempts left to be claimed again.
+    """
+    update_query = (
+        update(mail_outbox)
+        .where(
+            and_(
+                mail_outbox.c.status == "sending",
+                mail_outbox.c.next_attempt_at <= func.now(),
+                mail_outbox.c.attempts >= mail_outbox.c.max_attempts
+            )
+        )
+        .values(status="failed", last_error="Lease expired on the final attempt")
+    )
+    await execute(update_query)
+
+
+async def mark_message_sent(message_id: int, provider_message_id: str) -> None:
+    update_query = (
+        update(mail_outbox)
+        .where(mail_outbox.c.id == message_id)
+        .values(
+            status="sent",
+            provider_message_id=provider_message_id,
+            last_error=None,
+            sent_at=func.now()
+        )
+    )
+    await execute(update_query)
+
+
+async def mark_message_failed(message_id: int, error: str, retry_in_seconds: Optional[float]) -> None:
+    """Schedule a retry after `retry_in_seconds`, or give up on the message if it is None."""
+    values: Dict[str, Any] = {"last_error": error}
+    if retry_in_seconds is None:
+        values["status"] = "failed"
+    else:
+        values["status"] = "pending"
+        values["next_attempt_at"] = func.now() + timedelta(seconds=retry_in_seconds)
+
+    update_query = update(mail_outbox).where(mail_outbox.c.id == message_id).values(values)
+    await execute(update_query)
+
+
+async def delete_finished_messages(older_than_seconds: float, batch_size: int) -> int:
+    """
+    Delete up to `batch_size` sent or failed messages older than `older_than_seconds`.
+
+    Rows keep the rendered message, login codes included, so they are not kept
+    around once nothing will send them again. Returns how many were removed.
+    """
+    finished_messages = (
+        select(mail_outbox.c.id)
+        .where(
+            and_(
+                mail_outbox.c.status.in_(("sent", "failed")),
+                func.coalesce(mail_outbox.c.sent_at, mail_outbox.c.next_attempt_at)
+                < func.now() - timedelta(seconds=older_than_seconds)
+            )
+        )
+        .limit(batch_size)
+        .scalar_subquery()
+    )
+    delete_query = (
+        delete(mail_outbox)
+        .where(mail_outbox.c.id.in_(finished_messages))
+        .returning(mail_outbox.c.id)
+    )
+
+    deleted = await fetch_all(delete_query)
+    return len(deleted)
@@ -0,0 +1,90 @@
+"""Template loaders and environments used to render emails."""
+import html
+import re
+from typing import Callable, Optional, Tuple
+
+from jinja2 import BaseLoader, Environment, FileSystemBytecodeCache, FileSystemLoader
+
+_HTML_HEAD = re.compile(r"<head\b.*?</head>", re.IGNORECASE | re.DOTALL)
+_HTML_STYLE = re.compile(r"<style\b.*?</style>", re.IGNORECASE | re.DOTALL)
+_HTML_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+_HTML_TAG = re.compile(r"<[^>]+>")
+_JINJA_SPAN = re.compile(r"\{\{.*?\}\}|\{%.*?%\}|\{#.*?#\}", re.DOTALL)
+_JINJA_PLACEHOLDER = re.compile(r"\x00(\d+)\x00")
+
+
+def html_to_text_skeleton(source: str) -> str:
+    """
+    Turn an HTML template source into a plain-text template source.
+
+    Markup is removed while Jinja tags and expressions are kept, so the result
+    still renders with the same context and inheritance. Leading whitespace and
+    blank lines are dropped here once instead of on every rendered email.
+
+    Jinja spans are swapped for placeholders while the markup is stripped, so a
+    comparison like ``{% if n < 3 %}`` is not taken for a tag and entities
+    inside expressions are not unescaped.
+    """
+    spans: list[str] = []
+
+    def mask(match: re.Match) -> str:
+        spans.append(match.group(0))
+        return f"\x00{len(spans) - 1}\x00"
+
+    source = _JINJA_SPAN.sub(mask, source)
+    source = _HTML_HEAD.sub("", source)
+    source = _HTML_STYLE.sub("", source)
+    source = _HTML_COMMENT.sub("", source)
+    source = html.unescape(_HTML_TAG.sub("", source))
+    source = _JINJA_PLACEHOLDER.sub(lambda match: spans[int(match.group(1))], source)
+
+    lines = (line.strip() for line in source.splitlines())
+    return "\n".join(line for line in lines if line) + "\n"
+
+
+class PlainTextLoader(BaseLoader):
+    """Serve the plain-text skeleton of every template found by the wrapped loader."""
+
+    def __init__(self, html_loader: FileSystemLoader):
+        self.html_loader = html_loader
+
+    def get_source(self, environment: Environment, template: str) -> Tuple[str, Optional[str], Optional[Callable[[], bool]]]:
+        source, filename, uptodate = self.html_loader.get_source(environment, template)
+        return html_to_text_skeleton(source), filename, uptodate
+
+    def list_templates(self) -> list[str]:
+        return self.html_loader.list_templates()
+
+
+def create_template_environments(
+    template_dir: str,
+    use_bytecode_cache: bool = True,
+    bytecode_cache_dir: Optional[str] = None
+) -> Tuple[Environment, Environment]:
+    """
+    Build the HTML environment and its plain-text counterpart for a template directory.
+
+    With the bytecode cache enabled, compiled templates are shared between worker
+    processes and restarts. Both environments load the same file names, so they
+    use distinct cache file patterns to avoid overwriting each other.
+    """
+    html_loader = FileSystemLoader(template_dir)
+    html_cache = text_cache = None
+    if use_bytecode_cache:
+        html_cache = FileSystemBytecodeCache(bytecode_cache_dir, "__mynab_mail_html_%s.cache")
+        text_cache = FileSystemBytecodeCache(bytecode_cache_dir, "__mynab_mail_text_%s.cache")
+
+    # Templates only change with deployments, skip the mtime check on every lookup
+    html_env = Environment(
+        loader=html_loader,
+        autoescape=True,
+        auto_reload=False,
+        bytecode_cache=html_cache
+    )
+    text_env = Environment(
+        loader=PlainTextLoader(html_loader),
+        autoescape=False,
+        auto_reload=False,
+        bytecode_cache=text_cache
+    )
+    return html_env, text_env
@@ -19,9 +19,9 @@ async def send_template_email(
     mail_service: MailService = Depends(get_mail_service),
     _jwt_data: JWTData = Depends(require_role([ROLES.ADMIN])),
 ) -> EmailResponse:
-    """Send an email using a template."""
+    """Queue an email rendered from a template for background delivery."""
     try:
-        success = mail_service.send_template_email(
+        await mail_service.queue_template_email(
             to_emails=request.to_emails,
             subject=request.subject,
             template_name=request.template_name,
@@ -32,15 +32,9 @@ async def send_template_email(
             bcc_emails=request.bcc_emails
         )
 
-        if not success:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Template email sending failed"
-            )
-
         return EmailResponse(
             success=True,
-            message=f"Template email sent successfully to {len(request.to_emails)} recipient(s)"
+            message=f"Template email queued for {len(request.to_emails)} recipient(s)"
         )
 
     except MailTemplateError as e:
@@ -1,23 +1,27 @@
 import logging
 import base64
-import re
 from pathlib import Path
 from typing import List, Optional, Union, Dict, Any
-from jinja2 import Environment, FileSystemLoader
-import resend
+from jinja2 import Template
 
+from . import outbox
 from .config import MailConfig
 from .exceptions import MailSendError, MailTemplateError
+from .rendering import create_template_environments
+from .transport import MailTransport, create_transport
 
 logger = logging.getLogger(__name__)
 
 
 class MailService:
-    def __init__(self, config: MailConfig):
+    def __init__(self, config: MailConfig, transport: Optional[MailTransport] = None):
         self.config = config
         self._template_env = None
+        self._text_template_env = None
+        self._html_templates: Dict[str, Template] = {}
+        self._text_templates: Dict[str, Template] = {}
         self._setup_templates()
-        resend.api_key = config.api_key
+        self.transport = transport or create_transport(config)
 
     def _setup_templates(self) -> None:
         if self.config.template_dir:
@@ -25,10 +29,12 @@ class MailService:
             if not template_path.exists() and not template_path.is_absolute():
                 template_path = Path.cwd() / self.config.template_dir
             if template_path.exists():
-                self._template_env = Environment(
-                    loader=FileSystemLoader(str(template_path)),
-                    autoescape=True
+                self._template_env, self._text_template_env = create_template_environments(
+                    str(template_path),
+                    use_bytecode_cache=self.config.template_bytecode_cache,
+                    bytecode_cache_dir=self.config.template_cache_dir
                 )
+                self._precompile_templates()
                 logger.info(
                     f"Template environment initialized with path: {template_path}")
             else:
@@ -38,16 +44,43 @@ class MailService:
         else:
             logger.warning("No template directory configured")
 
+    def _precompile_templates(self) -> None:
+        """Compile every HTML template and its plain-text skeleton once, at startup."""
+        for template_name in self._template_env.list_templates():
+            try:
+                self._html_templates[template_name] = self._template_env.get_template(template_name)
+                self._text_templates[template_name] = self._text_template_env.get_template(template_name)
+            except Exception as e:
+                logger.error(f"Template precompilation failed for {template_name}: {e}")
+                raise MailTemplateError(f"Template precompilation failed for {template_name}: {e}")
+
+    def _get_template(self, templates: Dict[str, Template], env, template_name: str) -> Template:
+        template = templates.get(template_name)
+        if template is None:
+            # Not a file in the template directory, let Jinja raise a proper error
+            template = env.get_template(template_name)
+        return template
+
     def _render_template(self, template_name: str, context: Dict[str, Any]) -> str:
         if not self._template_env:
             raise MailTemplateError("Template environment not configured")
         try:
-            template = self._template_env.get_template(template_name)
+            template = self._get_template(self._html_templates, self._template_env, template_name)
             return template.render(context)
         except Exception as e:
             logger.error(f"Template rendering failed: {e}")
             raise MailTemplateError(f"Template rendering failed: {e}")
 
+    def _render_text_template(self, template_name: str, context: Dict[str, Any]) -> str:
+        if not self._text_template_env:
+            raise MailTemplateError("Template environment not configured")
+        try:
+            template = self._get_template(self._text_templates, self._text_template_env, template_name)
+            return template.render(context)
+        except Exception as e:
+            logger.error(f"Text template rendering failed: {e}")
+            raise MailTemplateError(f"Text template rendering failed: {e}")
+
     def _encode_attachment(self, file_path: str) -> Dict[str, str]:
         file_path_obj = Path(file_path)
         if not file_path_obj.exists():
@@ -59,6 +92,53 @@ class MailService:
             'filename': file_path_obj.name
         }
 
+    def _build_message(
+        self,
+        to_emails: Union[str, List[str]],
+        subject: str,
+        body: str,
+        html_body: Optional[str] = None,
+        from_email: Optional[str] = None,
+        from_name: Optional[str] = None,
+        cc_emails: Optional[Union[str, List[str]]] = None,
+        bcc_emails: Optional[Union[str, List[str]]] = None,
+        reply_to: Optional[Union[str, List[str]]] = None,
+        attachments: Optional[List[str]] = None,
+        tags: Optional[List[Dict[str, str]]] = None
+    ) -> Dict[str, Any]:
+        to_list = [to_emails] if isinstance(to_emails, str) else to_emails
+        sender = from_email or self.config.from_email
+        sender_name = from_name or self.config.from_name
+        if sender_name:
+            sender = f"{sender_name} <{sender}>"
+
+        message: Dict[str, Any] = {
+            "from": sender,
+            "to": to_list,
+            "subject": subject,
+        }
+
+        if body:
+            message["text"] = body
+        if html_body:
+            message["html"] = html_body
+        if cc_emails:
+            message["cc"] = [cc_emails] if isinstance(
+                cc_emails, str) else cc_emails
+        if bcc_emails:
+            message["bcc"] = [bcc_emails] if isinstance(
+                bcc_emails, str) else bcc_emails
+        if reply_to:
+            message["reply_to"] = [reply_to] if isinstance(
+                reply_to, str) else reply_to
+        if tags:
+            message["tags"] = tags
+        if attachments:
+            message["attachments"] = [
+                self._encode_attachment(p) for p in attachments]
+
+        return message
+
     def send_email(
         self,
         to_emails: Union[str, List[str]],
@@ -73,46 +153,47 @@ class MailService:
         attachments: Optional[List[str]] = None,
         tags: Optional[List[Dict[str, str]]] = None
     ) -> bool:
+        """Send an email synchronously. Blocks on the provider, prefer `queue_email` from request handlers."""
         try:
-            to_list = [to_emails] if isinstance(to_emails, str) else to_emails
-            sender = from_email or self.config.from_email
-
-            send_params: resend.Emails.SendParams = {
-                "from": sender,
-                "to": to_list,
-                "subject": subject,
-            }
-
-            if html_body:
-                send_params["html"] = html_body
-            if cc_emails:
-                send_params["cc"] = [cc_emails] if isinstance(
-                    cc_emails, str) else cc_emails
-            if bcc_emails:
-                send_params["bcc"] = [bcc_emails] if isinstance(
-                    bcc_emails, str) else bcc_emails
-            if reply_to:
-                send_params["reply_to"] = [reply_to] if isinstance(
-                    reply_to, str) else reply_to
-            if tags:
-                send_params["tags"] = tags
-            if attachments:
-                send_params["attachments"] = [
-                    self._encode_attachment(p) for p in attachments]
-
-            response = resend.Emails.send(send_params)
-
-            if response and response.get("id"):
-                logger.info(
-                    f"Email sent successfully to {', '.join(to_list)}, ID: {response['id']}")
-                return True
-            else:
-                raise MailSendError(f"Resend error: {response}")
+            message = self._build_message(
+                to_emails, subject, body, html_body, from_email, from_name,
+                cc_emails, bcc_emails, reply_to, attachments, tags)
+
+            message_id = self.transport.send(message)
+
+            logger.info(
+                f"Email sent successfully to {', '.join(message['to'])}, ID: {message_id}")
+            return True
 
         except Exception as e:
             logger.error(f"Failed to send email: {e}")
             raise MailSendError(f"Failed to send email: {e}")
 
+    async def queue_email(
+        self,
+        to_emails: Union[str, List[str]],
+        subject: str,
+        body: str,
+        html_body: Optional[str] = None,
+        from_email: Optional[str] = None,
+        from_name: Optional[str] = None,
+        cc_emails: Optional[Union[str, List[str]]] = None,
+        bcc_emails: Optional[Union[str, List[str]]] = None,
+        reply_to: Optional[Union[str, List[str]]] = None,
+        attachments: Optional[List[str]] = None,
+        tags: Optional[List[Dict[str, str]]] = None
+    ) -> int:
+        """Store an email in the outbox for background delivery. Returns the outbox message ID."""
+        message = self._build_message(
+            to_emails, subject, body, html_body, from_email, from_name,
+            cc_emails, bcc_emails, reply_to, attachments, tags)
+
+        try:
+            return await outbox.enqueue_message(message, self.config.outbox_max_attempts)
+        except Exception as e:
+            logger.error(f"Failed to queue email: {e}")
+            raise MailSendError(f"Failed to queue email: {e}")
+
     def send_template_email(
         self,
         to_emails: Union[str, List[str]],
@@ -128,8 +209,7 @@ class MailService:
         tags: Optional[List[Dict[str, str]]] = None
     ) -> bool:
         html = self._render_template(f"{template_name}.html", context)
-
-        text = re.sub(r'<[^>]+>', '', html)
+        text = self._render_text_template(f"{template_name}.html", context)
         return self.send_email(
             to_emails=to_emails,
             subject=subject,
@@ -143,3 +223,33 @@ class MailService:
             attachments=attachments,
             tags=tags
         )
+
+    async def queue_template_email(
+        self,
+        to_emails: Union[str, List[str]],
+        subject: str,
+        template_name: str,
+        context: Dict[str, Any],
+        from_email: Optional[str] = None,
+        from_name: Optional[str] = None,
+        cc_emails: Optional[Union[str, List[str]]] = None,
+        bcc_emails: Optional[Union[str, List[str]]] = None,
+        reply_to: Optional[Union[str, List[str]]] = None,
+        attachments: Optional[List[str]] = None,
+        tags: Optional[List[Dict[str, str]]] = None
+    ) -> int:
+        html = self._render_template(f"{template_name}.html", context)
+        text = self._render_text_template(f"{template_name}.html", context)
+        return await self.queue_email(
+            to_emails=to_emails,
+            subject=subject,
+            body=text,
+            html_body=html,
+            from_email=from_email,
+            from_name=from_name,
+            cc_emails=cc_emails,
+            bcc_emails=bcc_emails,
+            reply_to=reply_to,
+            attachments=attachments,
+            tags=tags
+        )
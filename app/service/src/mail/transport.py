@@ -0,0 +1,60 @@
+"""Mail transports used to hand messages to a provider."""
+import json
+import logging
+import uuid
+from pathlib import Path
+from typing import Any, Dict
+
+import resend
+
+from .config import MailConfig
+from .exceptions import MailConfigurationError, MailSendError
+
+logger = logging.getLogger(__name__)
+
+
+class MailTransport:
+    """Base class for transports. `send` is blocking and returns the provider message ID."""
+
+    def send(self, message: Dict[str, Any]) -> str:
+        raise NotImplementedError
+
+
+class ResendTransport(MailTransport):
+    """Deliver messages through the Resend HTTP API."""
+
+    def __init__(self, api_key: str):
+        resend.api_key = api_key
+
+    def send(self, message: Dict[str, Any]) -> str:
+        response = resend.Emails.send(message)
+
+        if not response or not response.get("id"):
+            raise MailSendError(f"Resend error: {response}")
+
+        return response["id"]
+
+
+class FileTransport(MailTransport):
+    """Write each message as a JSON file into a local directory. Meant for tests and local development."""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def send(self, message: Dict[str, Any]) -> str:
+        message_id = str(uuid.uuid4())
+        file_path = self.directory / f"{message_id}.json"
+        file_path.write_text(json.dumps(message, indent=2, default=str), encoding="utf-8")
+        logger.info(f"Email written to {file_path}")
+        return message_id
+
+
+def create_transport(config: MailConfig) -> MailTransport:
+    """Build the transport selected by the mail configuration."""
+    if config.transport == "resend":
+        return ResendTransport(config.api_key)
+    if config.transport == "file":
+        return FileTransport(config.file_transport_dir)
+
+    raise MailConfigurationError(f"Unknown mail transport: {config.transport}")
@@ -0,0 +1,78 @@
+"""Background delivery of queued emails."""
+import asyncio
+import logging
+from typing import Any, Dict
+
+from . import outbox
+from .config import MailConfig
+from .transport import MailTransport
+
+logger = logging.getLogger(__name__)
+
+
+class MailOutboxWorker:
+    """Drain the mail outbox with bounded concurrency, retrying failures with exponential backoff."""
+
+    def __init__(self, config: MailConfig, transport: MailTransport):
+        self.config = config
+        self.transport = transport
+        self._semaphore = asyncio.Semaphore(config.outbox_concurrency)
+
+    def retry_delay(self, attempts: int) -> float:
+        """Seconds to wait before the next attempt, given how many attempts were made."""
+        delay = self.config.outbox_backoff_seconds * (2 ** max(attempts - 1, 0))
+        return min(delay, self.config.outbox_max_backoff_seconds)
+
+    async def deliver_pending(self) -> int:
+        """Send every message that is currently due. Returns the number of messages processed."""
+        processed = 0
+
+        while True:
+            messages = await outbox.claim_due_messages(
+                self.config.outbox_batch_size, self.config.outbox_lease_seconds)
+            if not messages:
+                return processed
+
+            await asyncio.gather(*(self._deliver(message) for message in messages))
+            processed += len(messages)
+
+            if len(messages) < self.config.outbox_batch_size:
+                return processed
+
+    async def purge_finished(self) -> int:
+        """Delete sent and failed messages past the retention window in bounded batches."""
+        total_deleted = 0
+
+        while True:
+            deleted = await outbox.delete_finished_messages(
+                self.config.outbox_retention_seconds, self.config.outbox_purge_batch_size)
+            total_deleted += deleted
+
+            if deleted < self.config.outbox_purge_batch_size:
+                break
+
+            # Yield to request handlers between batches
+            await asyncio.sleep(0)
+
+        if total_deleted:
+            logger.info(f"Mail outbox purge removed {total_deleted} messages")
+
+        return total_deleted
+
+    async def _deliver(self, row: Dict[str, Any]) -> None:
+        async with self._semaphore:
+            try:
+                # Provider clients are blocking, keep them off the event loop
+                provider_message_id = await asyncio.to_thread(self.transport.send, row["message"])
+            except Exception as e:
+                if row["attempts"] >= row["max_attempts"]:
+                    logger.error(f"Giving up on outbox message {row['id']} after {row['attempts']} attempts: {e}")
+                    await outbox.mark_message_failed(row["id"], str(e), None)
+                else:
+                    delay = self.retry_delay(row["attempts"])
+                    logger.warning(f"Outbox message {row['id']} failed, retrying in {delay}s: {e}")
+                    await outbox.mark_message_failed(row["id"], str(e), delay)
+                return
+
+        await outbox.mark_message_sent(row["id"], provider_message_id)
+        logger.info(f"Outbox message {row['id']} sent, ID: {provider_message_id}")
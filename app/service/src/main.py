@@ -1,22 +1,87 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from dotenv import load_dotenv
 from loguru import logger
 
 from fastapi import FastAPI, Request, HTTPException, status
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from starlette.middleware.cors import CORSMiddleware
 
 from .logging import log_middleware
+from .monitoring.config import monitoring_config
+from .monitoring.metrics import render_metrics
+from .monitoring.middleware import timing_middleware
 from .exceptions import BadRequest, PermissionDenied, NotAuthenticated
 from .config import app_configs, settings
+from .rate_limit import sweep_rate_limit_buckets
+from .scheduler import register_periodic_job, start_jobs, stop_jobs
+from .auth_user.config import auth_config
+from .auth_user.tasks import sweep_expired_refresh_tokens, purge_stale_verification_codes
+from .mail.dependencies import get_mail_config, get_mail_outbox_worker
 from .auth_user.router import router as auth_user_router
+from .budget.config import budget_config
+from .budget.reclassify import reclassify_entries
+from .budget.service import load_statement_parsers, shutdown_parse_pool
 from .budget.router import router as budget_router
 from .budget_transaction_category.router import router as budget_transaction_category_router
+from .budget_transaction_category.service import load_category_catalogue
+from .fx_rate.router import router as fx_rate_router
 from .mail.router import router as mail_router
+from .monitoring.router import router as monitoring_router
 
 load_dotenv()
 
-app = FastAPI(**app_configs)
+register_periodic_job(
+    "refresh-token-sweeper",
+    sweep_expired_refresh_tokens,
+    auth_config.REFRESH_TOKEN_SWEEP_INTERVAL,
+)
+register_periodic_job(
+    "verification-code-purge",
+    purge_stale_verification_codes,
+    auth_config.VERIFICATION_CODE_PURGE_INTERVAL,
+)
+register_periodic_job(
+    "budget-reclassification",
+    reclassify_entries,
+    budget_config.RECLASSIFY_INTERVAL,
+)
+register_periodic_job(
+    "mail-outbox",
+    get_mail_outbox_worker().deliver_pending,
+    get_mail_config().outbox_poll_interval,
+)
+register_periodic_job(
+    "mail-outbox-purge",
+    get_mail_outbox_worker().purge_finished,
+    get_mail_config().outbox_purge_interval,
+)
+register_periodic_job(
+    "rate-limit-sweep",
+    sweep_rate_limit_buckets,
+    settings.ENV_RATE_LIMIT_SWEEP_INTERVAL,
+)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    prewarm = None
+    if not settings.ENV_ENVIRONMENT.is_testing:
+        await load_category_catalogue()
+        start_jobs()
+        if settings.ENV_PREWARM_PARSERS:
+            # pandas/pdfplumber load off the event loop so the first import request doesn't pay for it
+            prewarm = asyncio.create_task(asyncio.to_thread(load_statement_parsers))
+    yield
+    await stop_jobs()
+    shutdown_parse_pool()
+    if prewarm is not None:
+        await asyncio.gather(prewarm, return_exceptions=True)
+
+
+app = FastAPI(**app_configs, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -26,13 +91,19 @@ app.add_middleware(
     allow_headers=settings.ENV_CORS_HEADERS,
 )
 app.middleware("http")(log_middleware)
+# Added last so it wraps the activity log middleware as well
+app.middleware("http")(timing_middleware)
 
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     logger.error(
         f"HTTP exception occurred: {exc.detail}, Status code: {exc.status_code}")
-    return JSONResponse(status_code=exc.status_code, content={"error": exc.detail})
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"error": exc.detail},
+        headers=getattr(exc, "headers", None)
+    )
 
 
 @app.exception_handler(RequestValidationError)
@@ -94,7 +165,18 @@ async def not_authenticated_exception_handler(request: Request, exc: NotAuthenti
 async def healthcheck():
     return JSONResponse(status_code=200, content={"status": "ok"})
 
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    if monitoring_config.METRICS_TOKEN and \
+            request.headers.get("Authorization") != f"Bearer {monitoring_config.METRICS_TOKEN}":
+        raise NotAuthenticated()
+
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 app.include_router(auth_user_router, prefix="/auth", tags=["Auth"])
 app.include_router(budget_router, prefix="/budget", tags=["Budget"])
 app.include_router(budget_transaction_category_router, prefix="/budget-transaction-category", tags=["Budget Transaction Category"])
+app.include_router(fx_rate_router, prefix="/fx-rate", tags=["FX Rate"])
 app.include_router(mail_router, prefix="/mail", tags=["Mail"])
+app.include_router(monitoring_router, prefix="/monitoring", tags=["Monitoring"])
@@ -0,0 +1,71 @@
+"""
+Money amounts.
+
+Amounts are `Decimal` end to end: parsed from the statement text, stored in
+`budget_entry.amount` (DECIMAL(38, 12)), summed in SQL and written to JSON as
+numbers with the digits they have. Nothing in between goes through float, so
+totals match what the bank printed.
+"""
+from decimal import Decimal, InvalidOperation
+from typing import Annotated, Any, Optional
+
+import orjson
+from pydantic import BeforeValidator, PlainSerializer
+
+ZERO = Decimal(0)
+CENT = Decimal("0.01")
+
+
+def to_money(value: Any) -> Optional[Decimal]:
+    """
+    Convert a parsed cell or request value to Decimal, or None if it isn't a finite amount.
+
+    Floats (numeric spreadsheet cells) go through their shortest repr, so 0.1
+    becomes Decimal("0.1") rather than its binary expansion.
+    """
+    if isinstance(value, Decimal):
+        amount = value
+    elif isinstance(value, bool) or value is None:
+        return None
+    elif isinstance(value, (int, float, str)):
+        try:
+            amount = Decimal(value.strip() if isinstance(value, str) else str(value))
+        except InvalidOperation:
+            return None
+    else:
+        # numpy scalars from pandas columns
+        try:
+            amount = Decimal(str(value.item()))
+        except (AttributeError, InvalidOperation):
+            return None
+
+    return amount if amount.is_finite() else None
+
+
+def parse_decimal(text: str) -> Optional[Decimal]:
+    """`to_money` for text that is already cleaned up (the hot path of statement imports)."""
+    try:
+        amount = Decimal(text)
+    except InvalidOperation:
+        return None
+    return amount if amount.is_finite() else None
+
+
+def json_number(amount: Decimal) -> orjson.Fragment:
+    """An amount as a JSON number literal, without trailing zeros of the column scale."""
+    return orjson.Fragment(format(amount.normalize(), "f"))
+
+
+def _validate_money(value: Any) -> Any:
+    amount = to_money(value)
+    # Leave anything unparseable to the Decimal validator, which reports it
+    return value if amount is None else amount
+
+
+Money = Annotated[
+    Decimal,
+    BeforeValidator(_validate_money),
+    # Pydantic's own JSON mode (model_dump_json, FastAPI response_model) can only
+    # emit numbers from floats; responses encoded by src.serialization keep the digits
+    PlainSerializer(float, return_type=float, when_used="json"),
+]
@@ -0,0 +1,17 @@
+from typing import Optional
+
+from pydantic_settings import BaseSettings
+
+
+class MonitoringConfig(BaseSettings):
+    # Initial state; can be switched at runtime through PUT /monitoring/request-timing
+    REQUEST_TIMING_ENABLED: bool = False
+
+    # Queries slower than this are logged with their statement while timing is enabled
+    SLOW_QUERY_MS: float = 200
+
+    # When set, /metrics requires "Authorization: Bearer <METRICS_TOKEN>"
+    METRICS_TOKEN: Optional[str] = None
+
+
+monitoring_config = MonitoringConfig()
@@ -0,0 +1,207 @@
+"""
+Minimal Prometheus metrics.
+
+Counters, gauges and histograms keep plain dicts keyed by label values and
+render to the Prometheus text exposition format on scrape. Updates happen on
+the event loop thread, so they need no locks; work done in other threads or
+processes should report its numbers back and record them from the loop.
+"""
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Iterator, Sequence
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry: list["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        _registry.append(self)
+
+    def _key(self, labels: dict[str, str]) -> tuple:
+        return tuple(labels[name] for name in self.labelnames)
+
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        # Unlabelled metrics report 0 before their first update
+        self._values: dict[tuple, float] = {} if self.labelnames else {(): 0.0}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> Iterator[str]:
+        for key, value in list(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        # Unlabelled metrics report 0 before their first update
+        self._values: dict[tuple, float] = {} if self.labelnames else {(): 0.0}
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def samples(self) -> Iterator[str]:
+        for key, value in list(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class CallbackGauge(_Metric):
+    """Gauge whose value is read from `callback` at scrape time."""
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], float]):
+        super().__init__(name, documentation)
+        self.callback = callback
+
+    def samples(self) -> Iterator[str]:
+        yield f"{self.name} {_format_value(self.callback())}"
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last one is +Inf), sum]
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+
+    def samples(self) -> Iterator[str]:
+        for key, (counts, total) in list(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+@contextmanager
+def time_histogram(histogram: Histogram, **labels: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - start, **labels)
+
+
+def render_metrics() -> str:
+    return "\n".join(metric.render() for metric in _registry) + "\n"
+
+
+# region Application metrics
+
+HTTP_REQUEST_DURATION = Histogram(
+    "mynab_http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+)
+
+IMPORT_ROWS = Counter(
+    "mynab_import_rows_total",
+    "Bank statement rows by outcome: parsed, ignored, skipped (duplicates) and imported.",
+    ["bank", "outcome"],
+)
+IMPORT_STAGE_DURATION = Histogram(
+    "mynab_import_stage_duration_seconds",
+    "Time spent per bank statement import stage.",
+    ["bank", "stage"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+
+CLASSIFIER_RESULTS = Counter(
+    "mynab_classifier_results_total",
+    "Transaction category classification results (hit: a category was assigned).",
+    ["result"],
+)
+
+RECLASSIFIED_ENTRIES = Counter(
+    "mynab_reclassified_entries_total",
+    "Stored entries whose category was changed by the reclassification job.",
+)
+
+CACHE_REQUESTS = Counter(
+    "mynab_cache_requests_total",
+    "Lookups in the in-process caches of per-user results (hit, or miss: computed again).",
+    ["cache", "result"],
+)
+
+ACTIVITY_LOG_IN_FLIGHT = Gauge(
+    "mynab_activity_log_inserts_in_flight",
+    "Activity log inserts currently waiting on the database.",
+)
+
+
+def register_pool_metrics(pool) -> None:
+    """Expose connection pool utilization of a SQLAlchemy QueuePool."""
+    CallbackGauge("mynab_db_pool_size", "Connections the pool keeps open.", pool.size)
+    CallbackGauge("mynab_db_pool_checked_out", "Connections currently in use.", pool.checkedout)
+    CallbackGauge("mynab_db_pool_checked_in", "Idle connections in the pool.", pool.checkedin)
+    CallbackGauge("mynab_db_pool_overflow", "Connections opened beyond the pool size.", pool.overflow)
+
+# endregion Application metrics
@@ -0,0 +1,36 @@
+import json
+import time
+from typing import Awaitable, Callable
+
+from fastapi import Request, Response
+from loguru import logger
+
+from src.monitoring.metrics import HTTP_REQUEST_DURATION
+from src.monitoring.timing import start_request_timings
+
+
+async def timing_middleware(request: Request, call_next: Callable[[Request], Awaitable[Response]]):
+    start = time.perf_counter()
+    timings = start_request_timings()
+
+    response = await call_next(request)
+
+    # Label by route template (e.g. /budget/entry/{entry_id}), unmatched paths share one label
+    route = request.scope.get("route")
+    HTTP_REQUEST_DURATION.observe(
+        time.perf_counter() - start,
+        method=request.method,
+        route=getattr(route, "path", "unmatched"),
+        status=str(response.status_code),
+    )
+
+    if timings is not None:
+        response.headers["Server-Timing"] = timings.server_timing()
+        logger.info("request timing " + json.dumps({
+            "method": request.method,
+            "path": request.url.path,
+            "status": response.status_code,
+            **timings.as_dict(),
+        }))
+
+    return response
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends
+
+from src.auth_user.dependencies import require_role
+from src.auth_user.schemas import JWTData
+from src.constants import ROLES
+from src.monitoring.schemas import RequestTimingSettings
+from src.monitoring.timing import is_request_timing_enabled, set_request_timing_enabled
+
+
+router = APIRouter()
+
+
+@router.get("/request-timing", response_model=RequestTimingSettings)
+async def get_request_timing(
+    jwt_data: JWTData = Depends(require_role([ROLES.ADMIN]))
+):
+    return RequestTimingSettings(enabled=is_request_timing_enabled())
+
+
+@router.put("/request-timing", response_model=RequestTimingSettings)
+async def put_request_timing(
+    settings: RequestTimingSettings,
+    jwt_data: JWTData = Depends(require_role([ROLES.ADMIN]))
+):
+    """
+    Switch per-request timing (Server-Timing header, timing log line and slow query log) on or off.
+
+    The switch is per process: with several workers, each one must be toggled
+    (or set REQUEST_TIMING_ENABLED and restart).
+    """
+    set_request_timing_enabled(settings.enabled)
+    return RequestTimingSettings(enabled=is_request_timing_enabled())
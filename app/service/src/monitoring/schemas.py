@@ -0,0 +1,5 @@
+from src.models import CustomModel
+
+
+class RequestTimingSettings(CustomModel):
+    enabled: bool
@@ -0,0 +1,114 @@
+"""
+Request-scoped timers.
+
+While a request is being timed, `current_timings()` returns its `RequestTimings`;
+`timed(phase)` adds the elapsed time of a block to that phase and the engine
+cursor hooks count every query and its duration. Outside a timed request (or
+with timing switched off) all of it is a no-op.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.monitoring.config import monitoring_config
+
+_enabled = monitoring_config.REQUEST_TIMING_ENABLED
+_current: ContextVar[Optional["RequestTimings"]] = ContextVar("request_timings", default=None)
+
+
+def is_request_timing_enabled() -> bool:
+    return _enabled
+
+
+def set_request_timing_enabled(enabled: bool) -> None:
+    """Switch timing on or off for this process; requests already in flight are unaffected."""
+    global _enabled
+    _enabled = enabled
+
+
+class RequestTimings:
+    __slots__ = ("started_at", "phases", "query_count", "db_seconds")
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.phases: dict[str, float] = {}
+        self.query_count = 0
+        self.db_seconds = 0.0
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def total_seconds(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def server_timing(self) -> str:
+        """Value for the Server-Timing response header, durations in milliseconds."""
+        metrics = [f'db;dur={self.db_seconds * 1000:.1f};desc="{self.query_count} queries"']
+        metrics += [f"{phase};dur={seconds * 1000:.1f}" for phase, seconds in self.phases.items()]
+        metrics.append(f"total;dur={self.total_seconds() * 1000:.1f}")
+        return ", ".join(metrics)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "total_ms": round(self.total_seconds() * 1000, 2),
+            "db_ms": round(self.db_seconds * 1000, 2),
+            "query_count": self.query_count,
+            "phases_ms": {phase: round(seconds * 1000, 2) for phase, seconds in self.phases.items()},
+        }
+
+
+def start_request_timings() -> Optional[RequestTimings]:
+    """Begin timing the current request if timing is enabled."""
+    if not _enabled:
+        return None
+
+    timings = RequestTimings()
+    _current.set(timings)
+    return timings
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - start)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    timings = _current.get()
+    if timings is None or not conn.info.get("query_start_time"):
+        return
+
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    timings.query_count += 1
+    timings.db_seconds += elapsed
+
+    if elapsed * 1000 >= monitoring_config.SLOW_QUERY_MS:
+        logger.warning(f"Slow query ({elapsed * 1000:.1f} ms): {' '.join(statement.split())[:500]}")
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count and time every query executed through `engine` (the sync engine behind an AsyncEngine)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
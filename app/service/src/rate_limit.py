@@ -0,0 +1,205 @@
+import time
+from datetime import timedelta
+from ipaddress import IPv4Network, IPv6Network, ip_address, ip_network
+from typing import Optional, Sequence, Union
+
+from sqlalchemy import case, delete, extract, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from starlette.requests import Request
+
+from src.config import settings
+from src.database import fetch_all, fetch_one, rate_limit_bucket
+from src.exceptions import TooManyRequests
+
+SWEEP_BATCH_SIZE = 5_000
+
+
+class RateLimitBackend:
+    """
+    Storage for token buckets.
+
+    `consume` atomically refills the bucket for `key`, takes `cost` tokens if
+    available and returns 0, otherwise returns the seconds until enough tokens
+    will be there. `ENV_RATE_LIMIT_BACKEND` picks the backend at startup, and
+    `set_rate_limit_backend` replaces it.
+    """
+
+    async def consume(self, key: str, capacity: float, refill_per_second: float, cost: float = 1.0) -> float:
+        raise NotImplementedError
+
+    async def sweep(self) -> int:
+        """Delete buckets that have refilled completely; returns how many were removed"""
+        return 0
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Per-process buckets. Runs on the event loop thread, so no locking is needed."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        # key -> (tokens, updated_at, refilled_at), times from time.monotonic()
+        self._buckets: dict[str, tuple[float, float, float]] = {}
+
+    async def consume(self, key: str, capacity: float, refill_per_second: float, cost: float = 1.0) -> float:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens = capacity
+        else:
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * refill_per_second)
+
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+
+        if bucket is None and len(self._buckets) >= self.max_keys:
+            self._evict(now)
+
+        self._buckets[key] = (tokens, now, now + (capacity - tokens) / refill_per_second)
+        return 0.0 if allowed else (cost - tokens) / refill_per_second
+
+    def _evict(self, now: float) -> None:
+        # A bucket that has refilled completely behaves exactly like a missing one
+        for key, (_, _, refilled_at) in list(self._buckets.items()):
+            if refilled_at <= now:
+                del self._buckets[key]
+
+        if len(self._buckets) >= self.max_keys:
+            # Still full of active clients: drop the least recently used half rather than grow without bound
+            oldest = sorted(self._buckets.items(), key=lambda item: item[1][1])
+            for key, _ in oldest[: len(oldest) // 2]:
+                del self._buckets[key]
+
+    def reset(self) -> None:
+        self._buckets.clear()
+
+
+class PostgresRateLimitBackend(RateLimitBackend):
+    """
+    Buckets shared by every worker process, in `rate_limit_bucket`.
+
+    One upsert per request refills the bucket, takes the token and returns
+    the outcome; the row lock it takes makes concurrent requests for the
+    same key queue up instead of both taking the last token.
+    """
+
+    async def consume(self, key: str, capacity: float, refill_per_second: float, cost: float = 1.0) -> float:
+        bucket = rate_limit_bucket.c
+        tokens = func.least(
+            capacity, bucket.tokens + extract("epoch", func.now() - bucket.updated_at) * refill_per_second)
+        allowed = tokens >= cost
+
+        stmt = pg_insert(rate_limit_bucket).values(
+            key=key,
+            tokens=capacity - cost,
+            allowed=capacity >= cost,
+            updated_at=func.now(),
+            refilled_at=func.now() + timedelta(seconds=capacity / refill_per_second),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[bucket.key],
+            set_={
+                "tokens": case((allowed, tokens - cost), else_=tokens),
+                "allowed": allowed,
+                "updated_at": func.now(),
+                "refilled_at": stmt.excluded.refilled_at,
+            },
+        ).returning(bucket.tokens, bucket.allowed)
+
+        row = await fetch_one(stmt)
+        return 0.0 if row["allowed"] else (cost - row["tokens"]) / refill_per_second
+
+    async def sweep(self) -> int:
+        refilled = (
+            select(rate_limit_bucket.c.key)
+            .where(rate_limit_bucket.c.refilled_at <= func.now())
+            .limit(SWEEP_BATCH_SIZE)
+            .scalar_subquery()
+        )
+        deleted = await fetch_all(
+            delete(rate_limit_bucket).where(rate_limit_bucket.c.key.in_(refilled)).returning(rate_limit_bucket.c.key)
+        )
+        return len(deleted)
+
+
+def create_rate_limit_backend(name: str) -> RateLimitBackend:
+    """The backend called `name` in ENV_RATE_LIMIT_BACKEND"""
+    if name == "memory":
+        return InMemoryRateLimitBackend()
+    if name == "postgres":
+        return PostgresRateLimitBackend()
+    raise ValueError(f"Unknown rate limit backend: {name}")
+
+
+_backend: RateLimitBackend = create_rate_limit_backend(settings.ENV_RATE_LIMIT_BACKEND)
+
+
+def get_rate_limit_backend() -> RateLimitBackend:
+    return _backend
+
+
+def set_rate_limit_backend(backend: RateLimitBackend) -> None:
+    global _backend
+    _backend = backend
+
+
+async def sweep_rate_limit_buckets() -> int:
+    return await get_rate_limit_backend().sweep()
+
+
+Network = Union[IPv4Network, IPv6Network]
+
+
+def parse_networks(addresses: Sequence[str]) -> list[Network]:
+    """Addresses or CIDR ranges, e.g. ["10.0.0.0/8", "127.0.0.1"]"""
+    return [ip_network(address, strict=False) for address in addresses]
+
+
+def _is_trusted(address: str, trusted_proxies: Sequence[Network]) -> bool:
+    try:
+        parsed = ip_address(address)
+    except ValueError:
+        return False
+    return any(parsed in network for network in trusted_proxies)
+
+
+def client_ip(request: Request, trusted_proxies: Sequence[Network]) -> str:
+    """
+    Address of the client that sent `request`.
+
+    X-Forwarded-For is only believed when the connection comes from one of
+    `trusted_proxies`: its addresses are read from the right, skipping the
+    trusted proxies, and the first other one is the client. Anybody can send
+    the header, so without trusted proxies the peer address is used as is.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if not trusted_proxies or not _is_trusted(peer, trusted_proxies):
+        return peer
+
+    forwarded = [address.strip() for address in request.headers.get("x-forwarded-for", "").split(",")]
+    for address in reversed([address for address in forwarded if address]):
+        if not _is_trusted(address, trusted_proxies):
+            return address
+    return peer
+
+
+class RateLimiter:
+    """Token bucket allowing `burst` requests at once, refilled by one token every `refill_seconds`."""
+
+    def __init__(self, name: str, burst: int, refill_seconds: float, backend: Optional[RateLimitBackend] = None):
+        self.name = name
+        self.burst = burst
+        self.refill_seconds = refill_seconds
+        self._backend = backend
+
+    @property
+    def backend(self) -> RateLimitBackend:
+        return self._backend or get_rate_limit_backend()
+
+    async def hit(self, key: str) -> None:
+        """Take one token for `key` or raise TooManyRequests."""
+        retry_after = await self.backend.consume(
+            f"{self.name}:{key}", self.burst, 1.0 / self.refill_seconds)
+
+        if retry_after > 0:
+            raise TooManyRequests(retry_after=retry_after)
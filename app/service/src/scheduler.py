@@ -0,0 +1,45 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+from loguru import logger
+
+
+Job = Callable[[], Awaitable[Any]]
+
+_jobs: dict[str, tuple[Job, float]] = {}
+_tasks: dict[str, asyncio.Task] = {}
+
+
+def register_periodic_job(name: str, job: Job, interval_seconds: float) -> None:
+    """Register a coroutine function to be run every `interval_seconds` once the app starts."""
+    _jobs[name] = (job, interval_seconds)
+
+
+async def _run_periodically(name: str, job: Job, interval_seconds: float) -> None:
+    while True:
+        try:
+            await job()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.error(f"Background job {name} failed: {exc}")
+
+        await asyncio.sleep(interval_seconds)
+
+
+def start_jobs() -> None:
+    for name, (job, interval_seconds) in _jobs.items():
+        if name not in _tasks:
+            _tasks[name] = asyncio.create_task(
+                _run_periodically(name, job, interval_seconds), name=name)
+            logger.info(f"Background job {name} started (every {interval_seconds}s)")
+
+
+async def stop_jobs() -> None:
+    tasks = list(_tasks.values())
+    _tasks.clear()
+
+    for task in tasks:
+        task.cancel()
+
+    await asyncio.gather(*tasks, return_exceptions=True)